@@ -0,0 +1,61 @@
+"""
+Training Backend Benchmark:
+- Loads configuration
+- Prepares the full-history training features with the pandas pipelines and the polars backend
+- Checks that both produce identical model inputs and prints their timings
+"""
+
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(project_root))
+sys.path.append(str(project_root / 'app-ml' / 'src'))
+os.chdir(project_root)
+
+import pandas as pd
+
+from common.utils import read_config
+from common.data_manager import DataManager
+from pipelines.preprocessing import PreprocessingPipeline
+from pipelines.feature_engineering import FeatureEngineeringPipeline
+from pipelines.training import TrainingPipeline
+from pipelines.polars_backend import PolarsFeaturePipeline
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the pandas and polars training data preparation.")
+    parser.add_argument("--path", help="Parquet file or dataset folder to prepare (defaults to the production database, "
+                                       "e.g. data/synthetic_data/prod_data/database_prod for multi-station data)")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per backend (the best one is reported)")
+    args = parser.parse_args()
+
+    # Load config file
+    config_path = project_root / 'config' / 'config.yaml'
+    config = read_config(config_path)
+    path = args.path or os.path.join(
+        config['data_manager']['prod_data_folder'], config['data_manager']['prod_database_name']
+    )
+    lag_params = TrainingPipeline(config).get_feature_lag_params()
+
+    def prepare_pandas() -> pd.DataFrame:
+        df = PreprocessingPipeline(config).run(DataManager.load_data(path))
+        return FeatureEngineeringPipeline(config).run(df, lag_params=lag_params)
+
+    def prepare_polars() -> pd.DataFrame:
+        return PolarsFeaturePipeline(config).run(path, lag_params)
+
+    results = {}
+    for name, prepare in (('pandas', prepare_pandas), ('polars', prepare_polars)):
+        timings = []
+        for _ in range(args.repeats):
+            start = time.perf_counter()
+            results[name] = prepare()
+            timings.append(time.perf_counter() - start)
+        print(f"{name:<8}{min(timings):8.3f} s  ({len(results[name])} rows, {results[name].shape[1]} columns)")
+
+    pd.testing.assert_frame_equal(results['pandas'], results['polars'], check_exact=True)
+    print("Both backends produce identical training features")
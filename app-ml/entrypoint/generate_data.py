@@ -0,0 +1,54 @@
+"""
+Synthetic Data Generation:
+- Loads configuration
+- Generates hourly bike rental data with the raw data schema, chunk by chunk
+- Writes the raw database and the real-time production data under the configured data root
+
+Set 'data_manager.data_root' to the generated data root to run training, inference and
+the UI on the synthetic data. Several stations ('--n-stations') require the per-series
+training ('training.per_series.enabled'), the only consumer of multi-station data.
+"""
+
+import os
+import sys
+import argparse
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(project_root))
+sys.path.append(str(project_root / 'app-ml' / 'src'))
+os.chdir(project_root)  # Change directory to write the files to ./data folder
+
+from common.utils import read_config
+from common.data_manager import DataManager
+from common.data_generator import SyntheticDataGenerator
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic bike rental data.")
+    parser.add_argument("--data-root", help="Output folder (defaults to data_generator.data_root)")
+    parser.add_argument("--n-stations", type=int, help="Number of stations to generate")
+    parser.add_argument("--start", help="First generated timestamp")
+    parser.add_argument("--end", help="Last generated timestamp")
+    args = parser.parse_args()
+
+    # Load config file
+    config_path = project_root / 'config' / 'config.yaml'
+    config = read_config(config_path)
+
+    # Apply command line overrides
+    if args.n_stations is not None:
+        config['data_generator']['n_stations'] = args.n_stations
+    if args.start is not None:
+        config['data_generator']['start_timestamp'] = args.start
+    if args.end is not None:
+        config['data_generator']['end_timestamp'] = args.end
+    data_root = args.data_root or config['data_generator']['data_root']
+
+    # Write the generated data with the same file layout as the bundled data
+    output_config = DataManager.relocate_config(config, data_root)
+    generator = SyntheticDataGenerator(config)
+    rows = generator.run(output_config)
+
+    for path, n_rows in rows.items():
+        print(f"Wrote {n_rows} rows to {path}")
@@ -35,8 +35,8 @@ if __name__ == "__main__":
     current_timestamp = pd.to_datetime(config['pipeline_runner']['first_timestamp'])
     time_increment = pd.Timedelta(config['pipeline_runner']['time_increment'])
 
-    # Prepare production database
-    data_manager.initialize_prod_database()
+    # Prepare production database from scratch, the loop starts at the first timestamp
+    data_manager.prepare_prod_database(mode='reset')
 
     # Initialize Pipeline Runner
     pipeline_runner = PipelineRunner(config=config, data_manager=data_manager)
@@ -59,6 +59,11 @@ if __name__ == "__main__":
         current_timestamp += time_increment
     
     print("Inference completed for all timestamps!")
+
+    # Wait for the shadow models and report their online comparison against the actual values
+    pipeline_runner.shadow_scorer.close()
+    for name, scores in pipeline_runner.shadow_scorer.get_metrics().items():
+        print(f"{name}: MAE {scores['mae']:.2f}, RMSE {scores['rmse']:.2f} over {scores['n']} predictions")
     
     # Load predictions and actual data for plotting
     print("Loading data for plotting...")
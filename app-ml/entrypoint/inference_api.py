@@ -1,7 +1,11 @@
 import sys
 import os
-from flask import Flask, jsonify
+import atexit
+import threading
+from contextlib import contextmanager
+from flask import Flask, Response, jsonify, request
 from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
 import pandas as pd
 
 project_root = Path(__file__).resolve().parents[2]
@@ -10,48 +14,214 @@ sys.path.append(os.path.join(project_root, 'src'))
 sys.path.append(os.path.join(project_root, 'app-ml', 'src'))
 os.chdir(project_root)
 
-from common.utils import read_config
+from common.utils import read_config, format_prometheus_metrics, setup_logger
+from common.tracing import configure_tracing, get_tracer
 from pipelines.pipeline_runner import PipelineRunner
+from pipelines.retraining import RetrainingScheduler
 from common.data_manager import DataManager
+from common.model_registry import ModelRegistry
+from pipelines.tenant_pool import TenantPool
+
+logger = setup_logger(__name__)
 
 app = Flask(__name__)
 
+# Module state, set up by init_app()
+config = None
+data_manager = None
+pipeline_runner = None
+model_registry = None
+retraining_scheduler = None
+tenant_pool = None
+
+# The pipeline runner keeps the production database in memory,
+# so inference requests are processed one at a time
+inference_lock = threading.Lock()
+
+
+def init_app(app_config: dict) -> Flask:
+    """
+    Initialize the data manager, the production database and the pipeline runner
+    used by the API routes.
+
+    Args:
+        app_config (dict): Application configuration.
+
+    Returns:
+        Flask: The configured Flask application.
+    """
+    global config, data_manager, pipeline_runner, model_registry, retraining_scheduler, tenant_pool
+    config = app_config
+    configure_tracing(config, service_name='inference-api')
+
+    # Initialize the modules
+    data_manager = DataManager(config)
+    # Resume the production database (or initialize it), only one process does the work
+    startup = data_manager.prepare_prod_database()
+    logger.info(f"Production database {startup['action']} (mode: {startup['mode']})")
+
+    pipeline_runner = PipelineRunner(config, data_manager)
+    state = startup['state'] or {}
+    if state.get('model_version') and state['model_version'] != pipeline_runner.model_version:
+        logger.warning(f"Checkpoint was written with model {state['model_version']}, "
+                       f"serving model {pipeline_runner.model_version}")
+
+    # Retrain in a background process and hot-swap the new models between requests
+    model_registry = ModelRegistry(config)
+    retraining_scheduler = RetrainingScheduler(config, on_new_version=activate_model_version)
+    if config['inference_api'].get('retraining', {}).get('enabled', False):
+        retraining_scheduler.start()
+    # Other tenants (cities) are loaded on their first request, see TenantPool
+    tenant_pool = TenantPool(config)
+
+    # Write the buffered shadow predictions on shutdown
+    atexit.register(pipeline_runner.shadow_scorer.close)
+    atexit.register(tenant_pool.close)
+    return app
+
+
+def swap_to_version(version: str, install: Callable[[], Any]) -> None:
+    """
+    Serve a registry version: its model is loaded off the request path from the version
+    folder, then its files are installed as the production model and the model swapped
+    in as one step between two requests, so no request loads the model itself.
+
+    Args:
+        version (str): Version to serve.
+        install (Callable[[], Any]): Installs the version's files (registry activation or rollback).
+    """
+    inference_pipeline = pipeline_runner.inference_pipeline
+    model, model_version, metadata = inference_pipeline.load_model_files(model_registry.version_model_path(version))
+    with inference_lock:
+        install()
+        pipeline_runner.set_model(model, model_version, inference_pipeline.get_model_file_key(), metadata)
+
+
+def activate_model_version(version: str, metadata: dict) -> None:
+    """Make a newly trained version the production model and serve it."""
+    swap_to_version(version, install=lambda: model_registry.activate(version))
+    logger.info(f"Activated model version {version} ({metadata.get('mode')} training)")
+
+
+def get_tenant() -> Optional[str]:
+    """Tenant of the request (X-Tenant header or 'tenant' query parameter), None for the default one."""
+    return request.headers.get('X-Tenant') or request.args.get('tenant')
+
+
+@contextmanager
+def use_runner(tenant: Optional[str]) -> Iterator[PipelineRunner]:
+    """Pipeline runner of a tenant (the default one if None), reserved for the caller within the context."""
+    if tenant is not None:
+        with tenant_pool.use(tenant) as runner:
+            yield runner
+        return
+    with get_tracer().span('api.wait_for_lock'):
+        inference_lock.acquire()
+    try:
+        yield pipeline_runner
+    finally:
+        inference_lock.release()
+
+
+def run_next_inference(runner: PipelineRunner) -> pd.Timestamp:
+    """Run inference for the timestamp following the latest one of the runner's production database."""
+    latest_timestamp = runner.get_latest_timestamp()
+    time_increment = pd.Timedelta(runner.config['pipeline_runner']['time_increment'])
+    current_timestamp = latest_timestamp + time_increment
+    runner.run_inference(current_timestamp)
+    return current_timestamp
+
+
 @app.route('/run-inference', methods=['POST'])
 def run_inference():
+    tracer = get_tracer()
+    tenant = get_tenant()
+    if tenant is not None and tenant not in tenant_pool.tenants:
+        return jsonify({"status": "error", "message": f"Unknown tenant {tenant}"}), 404
     try:
-        # Load the dataset to run inference on
-        dataset_path = os.path.join(
-            config['data_manager']['prod_data_folder'],
-            config['data_manager']['prod_database_name']
-        )
-        df_prod = data_manager.load_data(dataset_path)
-        df_prod['datetime'] = pd.to_datetime(df_prod['datetime'])
-
-        # Increment the timestamp
-        latest_timestamp = df_prod['datetime'].max()
-        time_increment = pd.Timedelta(config['pipeline_runner']['time_increment'])
-        current_timestamp = latest_timestamp + time_increment
-
-        pipeline_runner.run_inference(current_timestamp)
-        return jsonify({"status": "success", "timestamp": str(current_timestamp)})
+        # Continue the trace started by the caller (e.g. the UI), if any
+        with tracer.span('api.run_inference', {'tenant': tenant} if tenant else None, traceparent=request.headers.get('traceparent')):
+            with use_runner(tenant) as runner:
+                current_timestamp = run_next_inference(runner)
+        return jsonify({"status": "success", "timestamp": str(current_timestamp), "tenant": tenant})
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
 
+@app.route('/what-if', methods=['POST'])
+def what_if():
+    tenant = get_tenant()
+    if tenant is not None and tenant not in tenant_pool.tenants:
+        return jsonify({"status": "error", "message": f"Unknown tenant {tenant}"}), 404
+    scenarios = (request.get_json(silent=True) or {}).get('scenarios')
+    if not isinstance(scenarios, list) or not all(isinstance(scenario, dict) for scenario in scenarios):
+        return jsonify({"status": "error", "message": "Expected a JSON body {\"scenarios\": [{column: value, ...}, ...]}"}), 400
+    try:
+        with get_tracer().span('api.what_if', {'tenant': tenant} if tenant else None,
+                               traceparent=request.headers.get('traceparent')):
+            with use_runner(tenant) as runner:
+                result = runner.run_what_if(scenarios)
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+    return jsonify({"status": "success", "tenant": tenant, **result})
+
 @app.route('/health', methods=['GET'])
 def health():
-    return jsonify({"status": "ok"})
+    return jsonify({"status": "ok", "ready": data_manager.is_prod_ready()})
 
-if __name__ == "__main__":
-    # Load configuration using utils function
-    config_path = project_root / 'config' / 'config.yaml'
-    config = read_config(config_path)
+@app.route('/retrain', methods=['POST'])
+def retrain():
+    body = request.get_json(silent=True) or {}
+    if not retraining_scheduler.trigger(incremental=body.get('incremental')):
+        return jsonify({"status": "error", "message": "A training is already running",
+                        "retraining": retraining_scheduler.status}), 409
+    return jsonify({"status": "started", "retraining": retraining_scheduler.status}), 202
 
-    # Initialize the modules
-    data_manager = DataManager(config)
-    # Prepare production database every time the script starts
-    data_manager.initialize_prod_database()
+@app.route('/rollback', methods=['POST'])
+def rollback():
+    try:
+        version = model_registry.previous_version()
+        swap_to_version(version, install=model_registry.rollback)
+    except (ValueError, FileNotFoundError) as e:
+        return jsonify({"status": "error", "message": str(e)}), 409
+    return jsonify({"status": "success", "active_version": version})
 
-    pipeline_runner = PipelineRunner(config, data_manager)
+@app.route('/model', methods=['GET'])
+def model_info():
+    return jsonify({
+        "model_version": pipeline_runner.model_version,
+        "active_version": model_registry.load_history()['active'],
+        "retraining": retraining_scheduler.status,
+    })
+
+@app.route('/shadow', methods=['GET'])
+def shadow():
+    return jsonify({
+        "enabled": pipeline_runner.shadow_scorer.enabled,
+        "models": pipeline_runner.shadow_scorer.model_paths,
+        "metrics": pipeline_runner.shadow_scorer.get_metrics(),
+    })
+
+@app.route('/tenants', methods=['GET'])
+def tenants():
+    return jsonify({
+        "tenants": tenant_pool.tenants,
+        "loaded": tenant_pool.loaded_tenants(),
+        "stats": tenant_pool.stats(),
+    })
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    return Response(
+        format_prometheus_metrics({**pipeline_runner.get_memory_stats(), **tenant_pool.stats()}),
+        mimetype='text/plain'
+    )
+
+if __name__ == "__main__":
+    # Load configuration using utils function
+    config_path = os.environ.get('CONFIG_PATH', project_root / 'config' / 'config.yaml')
+    init_app(read_config(config_path))
 
     # Start the app
     app.run(host="0.0.0.0", port=5001) 
\ No newline at end of file
@@ -0,0 +1,47 @@
+"""
+Serving Latency Budget:
+- Loads configuration and the production model
+- Measures the prediction latency and test RMSE of the model truncated to fewer trees
+  (and refit at smaller depths, 'latency_budget.depths')
+- Saves the most accurate serving model within 'latency_budget.target_ms' next to the
+  production model, which the inference service then serves
+"""
+
+import os
+import sys
+import argparse
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(project_root))
+sys.path.append(str(project_root / 'app-ml' / 'src'))
+os.chdir(project_root)  # Change directory to read the files from ./data folder
+
+from common.utils import read_config
+from common.data_manager import DataManager
+from pipelines.pipeline_runner import PipelineRunner
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the serving model for a prediction latency target.")
+    parser.add_argument("--target-ms", type=float, help="Latency target (defaults to latency_budget.target_ms)")
+    args = parser.parse_args()
+
+    # Load config file
+    config_path = project_root / 'config' / 'config.yaml'
+    config = read_config(config_path)
+    if args.target_ms is not None:
+        config['latency_budget']['target_ms'] = args.target_ms
+
+    data_manager = DataManager(config)
+    data_manager.prepare_prod_database()
+    pipeline_runner = PipelineRunner(config=config, data_manager=data_manager)
+
+    report = pipeline_runner.run_latency_budget()
+    print(f"{'depth':>5} {'trees':>6} {'latency ms':>11} {'test RMSE':>10} {'RMSE cost':>10}")
+    for candidate in report['candidates']:
+        print(f"{candidate['depth']:>5} {candidate['n_trees']:>6} {candidate['latency_ms']:>11.3f} "
+              f"{candidate['rmse']:>10.3f} {candidate['rmse_increase']:>+10.1%}")
+    status = 'met' if report['met_target'] else 'NOT met'
+    print(f"Target {report['target_ms']} ms {status}: serving depth {report['selected']['depth']}, "
+          f"{report['selected']['n_trees']} trees")
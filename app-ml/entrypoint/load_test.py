@@ -0,0 +1,83 @@
+"""
+Load Testing:
+- Loads configuration
+- Starts the inference API and the Dash UI in-process against a temporary copy of the data
+  (or targets already running apps with --api-url / --ui-url)
+- Sends a weighted mix of '/run-inference', '/health' and Dash 'update_graphs' requests
+  from concurrent workers
+- Reports throughput, latency percentiles and error rates per endpoint
+"""
+
+import os
+import sys
+import json
+import shutil
+import argparse
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(project_root))
+sys.path.append(str(project_root / 'app-ml' / 'src'))
+os.chdir(project_root)
+
+from common.utils import read_config
+from common.data_manager import DataManager
+from common.load_testing import LoadGenerator, build_requests, start_apps_in_process, format_report
+
+
+def parse_mix(value: str) -> dict:
+    """Parse a request mix such as 'run_inference=1,health=5'."""
+    mix = {}
+    for item in value.split(','):
+        name, weight = item.split('=')
+        mix[name.strip()] = float(weight)
+    return mix
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the inference API and the dashboard.")
+    parser.add_argument("--concurrency", type=int, help="Number of concurrent workers")
+    parser.add_argument("--duration", type=float, help="Test duration in seconds")
+    parser.add_argument("--requests", type=int, help="Total number of requests (instead of a duration)")
+    parser.add_argument("--mix", type=parse_mix, help="Request mix, e.g. run_inference=1,health=5,update_graphs=4")
+    parser.add_argument("--api-url", help="Target a running inference API instead of starting one")
+    parser.add_argument("--ui-url", help="Target a running UI instead of starting one")
+    parser.add_argument("--data-root", help="Source data folder (e.g. synthetic data) copied for the in-process apps")
+    parser.add_argument("--output", help="Write the summary as JSON to this file")
+    args = parser.parse_args()
+
+    # Load config file
+    config_path = project_root / 'config' / 'config.yaml'
+    config = read_config(config_path)
+    load_test_config = config['load_test']
+    if args.data_root:
+        config = DataManager.relocate_config(config, args.data_root)
+
+    api_server, ui_server, data_root = None, None, None
+    api_url, ui_url = args.api_url, args.ui_url
+    if not api_url and not ui_url:
+        print("Starting the inference API and the UI in-process...")
+        api_server, ui_server, data_root = start_apps_in_process(config)
+        api_url, ui_url = api_server.url, ui_server.url
+
+    try:
+        duration = args.duration if args.duration is not None else load_test_config['duration_s']
+        generator = LoadGenerator(
+            requests=build_requests(api_url, ui_url, config),
+            request_mix=args.mix or load_test_config['request_mix'],
+            concurrency=args.concurrency or load_test_config['concurrency'],
+            duration_s=None if args.requests else duration,
+            n_requests=args.requests,
+            timeout_s=load_test_config.get('timeout_s', 30),
+        )
+        summary = generator.run()
+        print(format_report(summary))
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(summary, f, indent=2)
+    finally:
+        for server in (api_server, ui_server):
+            if server is not None:
+                server.stop()
+        if data_root is not None:
+            shutil.rmtree(data_root, ignore_errors=True)
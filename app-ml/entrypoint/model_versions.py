@@ -0,0 +1,45 @@
+"""
+Model Versions:
+- Lists the trained model versions and their metadata
+- Activates a version or rolls back to the previously active one
+
+A running inference API serves the new production model from its next request on.
+"""
+
+import os
+import sys
+import json
+import argparse
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(project_root))
+sys.path.append(str(project_root / 'app-ml' / 'src'))
+os.chdir(project_root)  # Change directory to read the files from ./models folder
+
+from common.utils import read_config
+from common.model_registry import ModelRegistry
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the production model versions.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("list", help="List the model versions")
+    activate_parser = subparsers.add_parser("activate", help="Make a version the production model")
+    activate_parser.add_argument("version")
+    subparsers.add_parser("rollback", help="Reactivate the previously active version")
+    args = parser.parse_args()
+
+    # Load config file
+    config_path = os.environ.get('CONFIG_PATH', project_root / 'config' / 'config.yaml')
+    registry = ModelRegistry(read_config(config_path))
+
+    if args.command == "list":
+        for entry in registry.list_versions():
+            marker = '*' if entry['active'] else ' '
+            print(f"{marker} {entry['version']}  {json.dumps(entry['metadata'])}")
+    elif args.command == "activate":
+        registry.activate(args.version)
+        print(f"Activated model version {args.version}")
+    elif args.command == "rollback":
+        print(f"Rolled back to model version {registry.rollback()}")
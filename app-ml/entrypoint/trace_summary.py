@@ -0,0 +1,53 @@
+"""
+Trace Summary:
+- Loads configuration
+- Reads the spans exported by the UI and the inference API
+- Prints the slowest traces with their critical path, and duration statistics per span
+"""
+
+import os
+import sys
+import argparse
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(project_root))
+sys.path.append(str(project_root / 'app-ml' / 'src'))
+os.chdir(project_root)
+
+from common.utils import read_config
+from common.tracing import load_spans, summarize_traces, span_statistics
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Summarize the slowest traces and their critical path.")
+    parser.add_argument("--file", action="append", help="Trace file(s) (defaults to tracing.trace_file and its rotation)")
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest traces to show")
+    parser.add_argument("--root", help="Only consider traces whose root span has this name, e.g. ui.trigger_inference")
+    args = parser.parse_args()
+
+    # Load config file
+    config_path = project_root / 'config' / 'config.yaml'
+    config = read_config(config_path)
+    trace_file = config['tracing']['trace_file']
+    paths = args.file or [f"{trace_file}.1", trace_file]
+
+    spans = load_spans(paths)
+    if not spans:
+        print(f"No spans found in {paths}")
+        sys.exit(0)
+
+    traces = summarize_traces(spans, top=len(spans))
+    if args.root:
+        traces = [trace for trace in traces if trace['root'] == args.root]
+
+    print(f"Slowest {min(args.top, len(traces))} of {len(traces)} traces")
+    for trace in traces[:args.top]:
+        print(f"\n{trace['duration_ms']:9.1f} ms  {trace['root']}  trace={trace['trace_id']}  services={','.join(trace['services'])}")
+        for depth, (name, service, duration_ms, self_ms) in enumerate(trace['critical_path']):
+            print(f"{'':12}{'  ' * depth}{name} [{service}] {duration_ms:.1f} ms (self {self_ms:.1f} ms)")
+
+    print(f"\n{'span':<32}{'count':>8}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+    statistics = span_statistics(spans)
+    for name, s in sorted(statistics.items(), key=lambda item: item[1]['mean_ms'], reverse=True):
+        print(f"{name:<32}{s['count']:>8}{s['mean_ms']:>10.1f}{s['p50_ms']:>10.1f}{s['p95_ms']:>10.1f}{s['max_ms']:>10.1f}")
@@ -1,13 +1,15 @@
 """
 Training Pipeline:
 - Loads configuration
-- Initializes production database
-- Runs the full training pipeline (preprocessing, feature engineering, training, postprocessing)
+- Initializes production database from the raw data, dropping the state of previous runs
+- Runs the full training pipeline (preprocessing, feature engineering, training, postprocessing),
+  or continues the production model on the new rows with --incremental
 - Saves the trained model to the models folder
 """
 
 import os
 import sys
+import argparse
 from pathlib import Path
 
 project_root = Path(__file__).resolve().parent.parent.parent
@@ -22,6 +24,12 @@ from common.data_manager import DataManager
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the bike rental model.")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--incremental", action="store_true", default=None,
+                      help="Continue the production model on the new rows, fall back to full training")
+    mode.add_argument("--full", dest="incremental", action="store_false", default=None, help="Full training")
+    args = parser.parse_args()
 
     # Load config file
     config_path = project_root / 'config' / 'config.yaml'
@@ -29,10 +37,10 @@ if __name__ == "__main__":
 
     # Initialize production database with historical raw data
     data_manager = DataManager(config)
-    data_manager.initialize_prod_database()
+    data_manager.prepare_prod_database(mode='reset')
 
     # Initialize Pipeline Runner
     pipeline_runner = PipelineRunner(config=config, data_manager=data_manager)
 
     # Run the training pipeline
-    pipeline_runner.run_training()
\ No newline at end of file
+    pipeline_runner.run_training(incremental=args.incremental)
\ No newline at end of file
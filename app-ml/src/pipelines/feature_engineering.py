@@ -1,5 +1,6 @@
+import numpy as np
 import pandas as pd
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 class FeatureEngineeringPipeline:
     """
@@ -7,13 +8,26 @@ class FeatureEngineeringPipeline:
 
     This class handles feature engineering steps including:
     - Creating lag features for time series data
+    - Creating rolling window statistics and exponentially weighted means ('window_params')
+
+    The window features of a row cover the row itself and the rows before it. At inference
+    they are maintained online by `OnlineWindowFeatures` instead of being recomputed.
 
     Args:
         config (Dict[str, Any]): Configuration dictionary containing feature engineering parameters
     """
+    ROLLING_STATS = ('mean', 'std', 'min', 'max')
+    # An EWM of span s is computed from the last EWM_HISTORY_SPANS * s rows (weights below e^-20 are dropped)
+    EWM_HISTORY_SPANS = 10
+
     def __init__(self, config: Dict[str, Any]):
         self.config = config['feature_engineering']
 
+    @staticmethod
+    def lag_column(feat: str, lag: int) -> str:
+        """Name of the lag feature of `feat` with lag `lag`."""
+        return f'{feat}_lag_{lag}'
+
     @staticmethod
     def add_lag_feats(df: pd.DataFrame, params: Dict[str, List[int]]) -> pd.DataFrame:
         """
@@ -33,18 +47,135 @@ class FeatureEngineeringPipeline:
         """
         for feat, lags in params.items():
             for lag in lags:
-                df[f'{feat}_lag_{lag}'] = df[feat].shift(lag).bfill()
+                df[FeatureEngineeringPipeline.lag_column(feat, lag)] = df[feat].shift(lag).bfill()
         return df 
 
-    def run(self, df: pd.DataFrame) -> pd.DataFrame:
+    @staticmethod
+    def rolling_column(feat: str, window: int, stat: str) -> str:
+        """Name of the rolling statistic `stat` of `feat` over `window` rows."""
+        return f'{feat}_roll_{window}_{stat}'
+
+    @staticmethod
+    def ewm_column(feat: str, span: int) -> str:
+        """Name of the exponentially weighted mean of `feat` with span `span`."""
+        return f'{feat}_ewm_{span}'
+
+    @staticmethod
+    def window_columns(params: Optional[Dict[str, Dict[str, Any]]]) -> List[str]:
+        """
+        Names of the window features, in the order they are added.
+
+        Args:
+            params (Optional[Dict[str, Dict[str, Any]]]): Window feature parameters (see `add_window_feats`).
+
+        Returns:
+            List[str]: Column names.
+        """
+        columns = []
+        for feat, spec in (params or {}).items():
+            for window in spec.get('windows', []):
+                for stat in spec.get('stats', ['mean']):
+                    if stat not in FeatureEngineeringPipeline.ROLLING_STATS:
+                        raise ValueError(f"Unknown rolling statistic {stat}, expected one of "
+                                         f"{FeatureEngineeringPipeline.ROLLING_STATS}")
+                    columns.append(FeatureEngineeringPipeline.rolling_column(feat, window, stat))
+            columns.extend(FeatureEngineeringPipeline.ewm_column(feat, span) for span in spec.get('ewm_spans', []))
+        return columns
+
+    @staticmethod
+    def add_window_feats(df: pd.DataFrame, params: Optional[Dict[str, Dict[str, Any]]]) -> pd.DataFrame:
+        """
+        Add rolling window statistics and exponentially weighted means to the DataFrame.
+
+        Args:
+            df (pd.DataFrame): Input DataFrame
+            params (Optional[Dict[str, Dict[str, Any]]]): Window features per feature.
+                Example: {
+                    'col1': {'windows': [24, 168], 'stats': ['mean', 'std', 'min', 'max'], 'ewm_spans': [24]},
+                    ...
+                }
+
+        Returns:
+            pd.DataFrame: DataFrame with added window features
+        """
+        columns = {}
+        for feat, spec in (params or {}).items():
+            for window in spec.get('windows', []):
+                rolling = df[feat].rolling(window, min_periods=1)
+                for stat in spec.get('stats', ['mean']):
+                    values = rolling.std(ddof=0) if stat == 'std' else getattr(rolling, stat)()
+                    columns[FeatureEngineeringPipeline.rolling_column(feat, window, stat)] = values
+            for span in spec.get('ewm_spans', []):
+                columns[FeatureEngineeringPipeline.ewm_column(feat, span)] = df[feat].ewm(span=span, adjust=False).mean()
+        if not columns:
+            return df
+        # Added at once, inserting the columns one by one would fragment the frame
+        return pd.concat([df, pd.DataFrame(columns, index=df.index)], axis=1)
+
+    @staticmethod
+    def get_history_rows(
+        lag_params: Dict[str, List[int]],
+        window_params: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> int:
+        """
+        Rows of history a feature row depends on: the largest lag, rolling window
+        (minus the row itself) and EWM history.
+
+        Args:
+            lag_params (Dict[str, List[int]]): Lag features.
+            window_params (Optional[Dict[str, Dict[str, Any]]]): Window features.
+
+        Returns:
+            int: Number of rows.
+        """
+        rows = [max(lags) for lags in lag_params.values() if lags]
+        for spec in (window_params or {}).values():
+            rows.extend(window - 1 for window in spec.get('windows', []))
+            rows.extend(FeatureEngineeringPipeline.EWM_HISTORY_SPANS * span for span in spec.get('ewm_spans', []))
+        return max(rows, default=0)
+
+    @staticmethod
+    def merge_lag_params(*params: Optional[Dict[str, List[int]]]) -> Dict[str, List[int]]:
+        """
+        Union of several lag configurations, e.g. the configured lags and the lag search candidates.
+
+        Args:
+            *params (Optional[Dict[str, List[int]]]): Lag configurations (None entries are skipped).
+
+        Returns:
+            Dict[str, List[int]]: Feature -> sorted lags appearing in any of the configurations.
+        """
+        merged: Dict[str, List[int]] = {}
+        for lag_params in params:
+            for feat, lags in (lag_params or {}).items():
+                merged[feat] = sorted(set(merged.get(feat, [])) | set(lags))
+        return merged
+
+    def run(
+        self,
+        df: pd.DataFrame,
+        lag_params: Optional[Dict[str, List[int]]] = None,
+        window_values: Optional[np.ndarray] = None
+    ) -> pd.DataFrame:
         """
         Execute the complete feature engineering pipeline on the input DataFrame.
 
         Args:
             df (pd.DataFrame): Input DataFrame to be processed
+            lag_params (Optional[Dict[str, List[int]]]): Lags to create instead of the configured ones,
+                e.g. the lags selected for the served model
+            window_values (Optional[np.ndarray]): Window features of the rows maintained online
+                (rows x `window_columns`), used instead of computing them from the rows
 
         Returns:
-            pd.DataFrame: DataFrame with engineered features including lag features
+            pd.DataFrame: DataFrame with engineered features including lag and window features
         """
-        df = self.add_lag_feats(df, self.config['lag_params'])
+        df = self.add_lag_feats(df, lag_params if lag_params is not None else self.config['lag_params'])
+        window_params = self.config.get('window_params')
+        if window_values is None:
+            df = self.add_window_feats(df, window_params)
+        elif window_params:
+            df = pd.concat(
+                [df, pd.DataFrame(window_values, columns=self.window_columns(window_params), index=df.index)], axis=1
+            )
         return df 
\ No newline at end of file
@@ -0,0 +1,183 @@
+import math
+import time
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List, Tuple
+from sklearn.metrics import mean_squared_error
+from catboost import CatBoostRegressor
+
+from common.utils import setup_logger
+from pipelines.feature_engineering import FeatureEngineeringPipeline
+from pipelines.training import TrainingPipeline
+
+logger = setup_logger(__name__)
+
+
+class FeaturePruningPipeline:
+    """
+    Post-training step trading a negligible accuracy loss for a leaner serving path.
+
+    The features of the trained model are ranked by importance, and models keeping
+    only the most important features ('keep_fractions' of them) are retrained with
+    the tuned parameters on the training split and evaluated on the test split. Each
+    candidate is also timed on the serving path: building the lag features it uses
+    for an inference batch and predicting. The fastest candidate whose test RMSE is
+    at most 'max_rmse_increase' (relative) above the full feature set is refit on the
+    training and test data and replaces the model; feature engineering then only
+    generates the lag columns it uses.
+
+    Args:
+        config (Dict[str, Any]): Application configuration with a 'training.feature_pruning' section.
+
+    Attributes:
+        pruning_config (Dict[str, Any]): Settings of the feature pruning.
+        batch_size (int): Rows of an inference batch, used to time the serving path.
+        training_pipeline (TrainingPipeline): Provides the dataset split and sample weights.
+    """
+    def __init__(self, config: Dict[str, Any]):
+        self.pruning_config: Dict[str, Any] = config['training'].get('feature_pruning', {})
+        self.batch_size: int = config['pipeline_runner']['batch_size']
+        self.training_pipeline = TrainingPipeline(config=config)
+
+    @staticmethod
+    def rank_features(model: CatBoostRegressor) -> List[str]:
+        """
+        Features of a model, most important first.
+
+        Args:
+            model (CatBoostRegressor): Trained model.
+
+        Returns:
+            List[str]: Feature names sorted by decreasing importance.
+        """
+        importances = model.get_feature_importance()
+        order = np.argsort(-importances, kind='stable')
+        return [model.feature_names_[i] for i in order]
+
+    @staticmethod
+    def kept_lag_params(lag_params: Dict[str, List[int]], features: List[str]) -> Dict[str, List[int]]:
+        """
+        Lags whose columns are among the features.
+
+        Args:
+            lag_params (Dict[str, List[int]]): Lags the features were generated with.
+            features (List[str]): Kept features.
+
+        Returns:
+            Dict[str, List[int]]: Feature -> kept lags.
+        """
+        kept = set(features)
+        selected = {
+            feat: [lag for lag in lags if FeatureEngineeringPipeline.lag_column(feat, lag) in kept]
+            for feat, lags in lag_params.items()
+        }
+        return {feat: lags for feat, lags in selected.items() if lags}
+
+    def measure_latency(
+        self,
+        model: CatBoostRegressor,
+        base_batch: pd.DataFrame,
+        lag_params: Dict[str, List[int]]
+    ) -> float:
+        """
+        Median time of the serving path of a model: lag features of an inference batch and prediction.
+
+        Args:
+            model (CatBoostRegressor): Model to time.
+            base_batch (pd.DataFrame): Preprocessed inference batch (without lag features).
+            lag_params (Dict[str, List[int]]): Lags the model uses.
+
+        Returns:
+            float: Median latency in milliseconds.
+        """
+        features = list(model.feature_names_)
+        timings = []
+        for _ in range(self.pruning_config.get('latency_repeats', 50)):
+            start = time.perf_counter()
+            x = FeatureEngineeringPipeline.add_lag_feats(base_batch.copy(), lag_params)
+            model.predict(x[features])
+            timings.append(time.perf_counter() - start)
+        return float(np.median(timings) * 1000)
+
+    def run(
+        self,
+        model: CatBoostRegressor,
+        df: pd.DataFrame,
+        lag_params: Dict[str, List[int]]
+    ) -> Tuple[CatBoostRegressor, Dict[str, List[int]], Dict[str, Any]]:
+        """
+        Evaluate the feature subsets and return the selected model.
+
+        Args:
+            model (CatBoostRegressor): Model trained on all features.
+            df (pd.DataFrame): Feature-engineered training data the model was trained on.
+            lag_params (Dict[str, List[int]]): Lags of the model.
+
+        Returns:
+            Tuple containing:
+                - The selected model (the input model if no subset qualifies)
+                - Lags of the selected model
+                - Report with the accuracy-vs-latency frontier and the selected candidate
+        """
+        x_train, x_test, y_train, y_test = self.training_pipeline.prepare_dataset(df)
+        ranked = self.rank_features(model)
+        all_lag_params = FeatureEngineeringPipeline.merge_lag_params(
+            lag_params, self.training_pipeline.get_feature_lag_params()
+        )
+        lag_columns = {
+            FeatureEngineeringPipeline.lag_column(feat, lag) for feat, lags in all_lag_params.items() for lag in lags
+        }
+        base_batch = x_test[[column for column in x_test.columns if column not in lag_columns]].tail(self.batch_size)
+
+        params = {
+            name: value for name, value in model.get_params().items()
+            if name not in ('ignored_features', 'random_seed', 'allow_writing_files')
+        }
+        weights = self.training_pipeline.get_sample_weights(len(x_train) + len(x_test))
+        w_train = weights[:len(x_train)] if weights is not None else None
+
+        candidates = []
+        n_features = sorted({
+            max(1, math.ceil(fraction * len(ranked))) for fraction in self.pruning_config.get('keep_fractions', [1.0])
+        } | {len(ranked)}, reverse=True)
+        for n in n_features:
+            top_features = set(ranked[:n])
+            features = [column for column in x_train.columns if column in top_features]
+            candidate = CatBoostRegressor(**params, random_seed=42, allow_writing_files=False)
+            candidate.fit(x_train[features], y_train, sample_weight=w_train, verbose=False)
+            kept_lags = self.kept_lag_params(lag_params, features)
+            candidates.append({
+                'n_features': n,
+                'features': features,
+                'lag_params': kept_lags,
+                'rmse': float(np.sqrt(mean_squared_error(y_test, candidate.predict(x_test[features])))),
+                'latency_ms': self.measure_latency(candidate, base_batch, kept_lags),
+            })
+            logger.info(f"Feature pruning: {n} features, test RMSE {candidates[-1]['rmse']:.3f}, "
+                        f"serving latency {candidates[-1]['latency_ms']:.2f} ms")
+
+        # Accuracy-vs-latency frontier: candidates no other candidate beats on both
+        for candidate in candidates:
+            candidate['pareto_optimal'] = not any(
+                other['rmse'] <= candidate['rmse'] and other['latency_ms'] < candidate['latency_ms']
+                for other in candidates
+            )
+        full_rmse = candidates[0]['rmse']
+        max_rmse = full_rmse * (1 + self.pruning_config.get('max_rmse_increase', 0.0))
+        selected = min(
+            (candidate for candidate in candidates if candidate['rmse'] <= max_rmse),
+            key=lambda candidate: (candidate['latency_ms'], candidate['n_features'])
+        )
+        report = {
+            'frontier': [{key: value for key, value in candidate.items() if key != 'features'} for candidate in candidates],
+            'selected_n_features': selected['n_features'],
+        }
+        if selected['n_features'] == len(ranked):
+            return model, lag_params, report
+
+        logger.info(f"Feature pruning: keeping {selected['n_features']} of {len(ranked)} features")
+        x_train_test = pd.concat([x_train, x_test], axis=0)[selected['features']]
+        y_train_test = pd.concat([y_train, y_test], axis=0)
+        pruned_model = CatBoostRegressor(**params, random_seed=42, allow_writing_files=False)
+        pruned_model.fit(x_train_test, y_train_test, sample_weight=weights, verbose=False)
+        return pruned_model, selected['lag_params'], report
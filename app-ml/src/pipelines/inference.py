@@ -1,6 +1,10 @@
+import os
+import numpy as np
 import pandas as pd
-from typing import Dict, Any
-from common.utils import load_model
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+from common.utils import load_model, load_model_metadata, get_model_version, get_serving_model_path, serving_model_path
+from pipelines.transform_plan import TransformPlan
 
 class InferencePipeline:
     """
@@ -12,6 +16,13 @@ class InferencePipeline:
     - Making predictions
     - Post-processing predictions
 
+    The model is kept in memory and only reloaded when the model file changes, e.g.
+    after a training run, an activation or a rollback. `set_model` swaps in a model
+    that was loaded off the request path. `run_raw` predicts from raw rows with the
+    transform plan compiled for the current model. With 'latency_budget.serve', the
+    latency budget serving model saved next to the model file is served instead when it
+    was derived from the current model (see `LatencyBudgetPipeline`).
+
     Args:
         config (Dict[str, Any]): Configuration dictionary containing inference parameters
     """
@@ -23,6 +34,119 @@ class InferencePipeline:
             config (Dict[str, Any]): Configuration dictionary containing inference parameters
         """
         self.config = config
+        self.serve_latency_budget: bool = config.get('latency_budget', {}).get('serve', False)
+        # (model, content hash of the model file, model file identity when loaded, model metadata)
+        self._active: Tuple[Any, Optional[str], Optional[Tuple], Optional[Dict[str, Any]]] = (None, None, None, None)
+        # (model the plan was compiled for, plan)
+        self._plan: Tuple[Any, Optional[TransformPlan]] = (None, None)
+
+    def get_model_file_key(self) -> Optional[Tuple]:
+        """
+        Identity of the saved model file (path, inode, size, modification time),
+        which changes whenever the file is replaced. With 'latency_budget.serve', the
+        identity of the serving model file is appended.
+
+        Returns:
+            Optional[Tuple]: File identity, None if no model is saved.
+        """
+        base_path = self.config['pipeline_runner']['model_path']
+        file_key = self._file_key(base_path)
+        if file_key is not None and self.serve_latency_budget:
+            file_key += self._file_key(serving_model_path(base_path)) or ()
+        return file_key
+
+    @staticmethod
+    def _file_key(base_path: str) -> Optional[Tuple]:
+        base_path = Path(base_path)
+        for path in (base_path.with_suffix(".cbm"), base_path.with_suffix(".pkl")):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            return (str(path), stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        return None
+
+    def set_model(
+        self,
+        model: Any,
+        version: Optional[str],
+        file_key: Optional[Tuple] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Swap the model used for predictions. A prediction in progress keeps using
+        the model it started with.
+
+        Args:
+            model (Any): Loaded model.
+            version (Optional[str]): Content hash of the model file.
+            file_key (Optional[Tuple]): Identity of the model file the model was loaded from.
+            metadata (Optional[Dict[str, Any]]): Metadata saved with the model.
+
+        Returns:
+            None
+        """
+        self._active = (model, version, file_key, metadata)
+
+    def load_model_files(self, base_path: str) -> Tuple[Any, Optional[str], Optional[Dict[str, Any]]]:
+        """
+        Load a saved model, e.g. a registry version before it is installed as the
+        production model, without activating it. With 'latency_budget.serve', the serving
+        model saved next to the production model is loaded instead when it was derived
+        from this model.
+
+        Args:
+            base_path (str): Model path without extension.
+
+        Returns:
+            Tuple of (model, content hash of the model file, metadata of the loaded model).
+        """
+        version = get_model_version(base_path)
+        model_path = base_path
+        if self.serve_latency_budget:
+            model_path = get_serving_model_path(
+                base_path, serving_path=serving_model_path(self.config['pipeline_runner']['model_path'])
+            )
+        return load_model(base_path=model_path), version, load_model_metadata(model_path)
+
+    def load_current_model(self) -> Tuple[Any, Optional[str], Optional[Tuple], Optional[Dict[str, Any]]]:
+        """
+        Load the saved model, without activating it.
+
+        Returns:
+            Tuple of (model, content hash, file identity, metadata). The content hash is
+            the one of the model file, also when its serving model is loaded.
+        """
+        file_key = self.get_model_file_key()
+        model, version, metadata = self.load_model_files(self.config['pipeline_runner']['model_path'])
+        return model, version, file_key, metadata
+
+    def get_model(self) -> Any:
+        """
+        Return the in-memory model, reloading it if the model file changed.
+
+        Returns:
+            Any: The model.
+        """
+        model, _, file_key, _ = self._active
+        if model is None or self.get_model_file_key() != file_key:
+            self.set_model(*self.load_current_model())
+            model = self._active[0]
+        return model
+
+    @property
+    def model_version(self) -> Optional[str]:
+        """Content hash of the in-memory model (None before the first prediction)."""
+        return self._active[1]
+
+    @property
+    def lag_params(self) -> Optional[Dict[str, List[int]]]:
+        """
+        Lags the current model was trained with (saved in its metadata), None if the
+        model uses the configured lags.
+        """
+        self.get_model()
+        return (self._active[3] or {}).get('lag_params')
 
     def run(self, x: pd.DataFrame) -> pd.DataFrame:
         """
@@ -39,10 +163,50 @@ class InferencePipeline:
         Returns:
             pd.DataFrame: The last prediction value from the model
         """
-        # Load the model
-        model = load_model(base_path=self.config['pipeline_runner']['model_path'])
-        # Make prediction
-        y_pred = model.predict(x)
+        # Get the model (loaded from disk only when it changed)
+        model = self.get_model()
+        # Make prediction on the model's features, in training order
+        feature_names = getattr(model, 'feature_names_', None)
+        y_pred = model.predict(x[feature_names] if feature_names else x)
         # Take the last point prediction only
         y_pred = y_pred[-1]
-        return y_pred
\ No newline at end of file
+        return y_pred
+
+    def get_transform_plan(self, model: Any, metadata: Optional[Dict[str, Any]]) -> Optional[TransformPlan]:
+        """
+        Transform plan of a model, compiled on its first use.
+
+        Args:
+            model (Any): The model.
+            metadata (Optional[Dict[str, Any]]): Metadata saved with the model (its lags).
+
+        Returns:
+            Optional[TransformPlan]: The plan, None if the model does not expose its feature names.
+        """
+        plan_model, plan = self._plan
+        if plan_model is not model:
+            feature_names = getattr(model, 'feature_names_', None)
+            plan = TransformPlan(self.config, feature_names, (metadata or {}).get('lag_params')) if feature_names else None
+            self._plan = (model, plan)
+        return plan
+
+    def run_raw(self, df: pd.DataFrame, window_values: Optional[np.ndarray] = None) -> Optional[float]:
+        """
+        Predict the last point of a raw batch with the fused transform plan, skipping the
+        preprocessing and feature engineering DataFrames.
+
+        Args:
+            df (pd.DataFrame): Raw rows of the latest batch, in time order.
+            window_values (Optional[np.ndarray]): Window features of the rows, maintained online.
+
+        Returns:
+            Optional[float]: The last point prediction, None if the plan cannot transform the
+            batch (the caller then runs the pipelines).
+        """
+        self.get_model()
+        model, _, _, metadata = self._active
+        plan = self.get_transform_plan(model, metadata)
+        x = plan.transform(df, window_values=window_values) if plan is not None else None
+        if x is None:
+            return None
+        return model.predict(x[-1:])[0]
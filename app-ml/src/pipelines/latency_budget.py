@@ -0,0 +1,166 @@
+import math
+import time
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List, Tuple
+from sklearn.metrics import mean_squared_error
+from catboost import CatBoostRegressor
+
+from common.utils import setup_logger
+from pipelines.training import TrainingPipeline
+
+logger = setup_logger(__name__)
+
+
+class LatencyBudgetPipeline:
+    """
+    Serving model of a trained model meeting a per-prediction latency target.
+
+    The prediction cost of a CatBoost model grows with its number of trees and their
+    depth. Candidates are profiled on this grid: the trained model's parameters are
+    refit on the training split at the trained depth and at each configured smaller
+    'depths', and every refit is truncated to fractions of its trees ('tree_fractions',
+    CatBoost `shrink`). Each candidate is timed predicting an inference batch of
+    'batch_rows' rows and evaluated on the test split. The most accurate candidate
+    within 'target_ms' is selected (the fastest one if none is): at the trained depth,
+    the trained model itself is truncated to its number of trees, otherwise the
+    candidate is refit on the training and test data.
+
+    Args:
+        config (Dict[str, Any]): Application configuration with a 'latency_budget' section.
+
+    Attributes:
+        budget_config (Dict[str, Any]): Settings of the latency budget.
+        training_pipeline (TrainingPipeline): Provides the dataset split and sample weights.
+    """
+    def __init__(self, config: Dict[str, Any]):
+        self.budget_config: Dict[str, Any] = config.get('latency_budget', {})
+        self.training_pipeline = TrainingPipeline(config=config)
+
+    def measure_latency(self, model: CatBoostRegressor, batch: np.ndarray) -> float:
+        """
+        Median time of one prediction call of a model.
+
+        Args:
+            model (CatBoostRegressor): Model to time.
+            batch (np.ndarray): Feature matrix of an inference batch, in the model's feature order.
+
+        Returns:
+            float: Median latency in milliseconds.
+        """
+        model.predict(batch)
+        timings = []
+        for _ in range(self.budget_config.get('repeats', 200)):
+            start = time.perf_counter()
+            model.predict(batch)
+            timings.append(time.perf_counter() - start)
+        return float(np.median(timings) * 1000)
+
+    def get_tree_counts(self, n_trees: int) -> List[int]:
+        """
+        Numbers of trees profiled for a model, most first.
+
+        Args:
+            n_trees (int): Trees of the model.
+
+        Returns:
+            List[int]: 'tree_fractions' of `n_trees` (and `n_trees` itself).
+        """
+        fractions = self.budget_config.get('tree_fractions', [1.0])
+        return sorted({max(1, math.ceil(fraction * n_trees)) for fraction in fractions} | {n_trees}, reverse=True)
+
+    @staticmethod
+    def truncate(model: CatBoostRegressor, n_trees: int) -> CatBoostRegressor:
+        """
+        Copy of a model keeping its first `n_trees` trees.
+
+        Args:
+            model (CatBoostRegressor): Trained model.
+            n_trees (int): Trees to keep.
+
+        Returns:
+            CatBoostRegressor: Truncated copy (the model itself is left unchanged).
+        """
+        truncated = model.copy()
+        if n_trees < model.tree_count_:
+            truncated.shrink(ntree_end=n_trees)
+        return truncated
+
+    def run(self, model: CatBoostRegressor, df: pd.DataFrame) -> Tuple[CatBoostRegressor, Dict[str, Any]]:
+        """
+        Profile the candidates and build the serving model.
+
+        Args:
+            model (CatBoostRegressor): Trained (production) model.
+            df (pd.DataFrame): Feature-engineered training data (with the model's features).
+
+        Returns:
+            Tuple containing:
+                - The serving model
+                - Report with the latency and test RMSE of every candidate and the selected one
+        """
+        target_ms = self.budget_config.get('target_ms')
+        x_train, x_test, y_train, y_test = self.training_pipeline.prepare_dataset(df)
+        features = list(model.feature_names_)
+        x_train, x_test = x_train[features], x_test[features]
+        batch = x_test.tail(self.budget_config.get('batch_rows', 1)).to_numpy(dtype=np.float64)
+        weights = self.training_pipeline.get_sample_weights(len(x_train) + len(x_test))
+        w_train = weights[:len(x_train)] if weights is not None else None
+
+        params = {
+            name: value for name, value in model.get_params().items()
+            if name not in ('random_seed', 'allow_writing_files')
+        }
+        trained_depth = params.get('depth', 6)
+        depths = sorted({trained_depth} | {depth for depth in self.budget_config.get('depths', []) if depth < trained_depth},
+                        reverse=True)
+
+        candidates = []
+        for depth in depths:
+            # Candidates are evaluated as refits on the training split, the model has seen the test rows
+            refit = CatBoostRegressor(**{**params, 'depth': depth}, random_seed=42, allow_writing_files=False)
+            refit.fit(x_train, y_train, sample_weight=w_train, verbose=False)
+            for n_trees in self.get_tree_counts(refit.tree_count_):
+                candidate = self.truncate(refit, n_trees)
+                candidates.append({
+                    'depth': depth,
+                    'n_trees': n_trees,
+                    'rmse': float(np.sqrt(mean_squared_error(y_test, candidate.predict(x_test)))),
+                    'latency_ms': self.measure_latency(candidate, batch),
+                })
+                logger.info(f"Latency budget: depth {depth}, {n_trees} trees, test RMSE {candidates[-1]['rmse']:.3f}, "
+                            f"latency {candidates[-1]['latency_ms']:.3f} ms")
+
+        full_rmse = candidates[0]['rmse']
+        for candidate in candidates:
+            candidate['rmse_increase'] = candidate['rmse'] / full_rmse - 1 if full_rmse else 0.0
+        within_budget = [
+            candidate for candidate in candidates if target_ms is None or candidate['latency_ms'] <= target_ms
+        ]
+        if within_budget:
+            selected = min(within_budget, key=lambda candidate: (candidate['rmse'], candidate['latency_ms']))
+        else:
+            selected = min(candidates, key=lambda candidate: candidate['latency_ms'])
+            logger.warning(f"Latency budget: no candidate meets {target_ms} ms, serving the fastest one")
+        report = {
+            'target_ms': target_ms,
+            'met_target': bool(within_budget),
+            'selected': {key: selected[key] for key in ('depth', 'n_trees', 'rmse', 'latency_ms', 'rmse_increase')},
+            'candidates': candidates,
+        }
+
+        if selected['depth'] == trained_depth:
+            serving_model = self.truncate(model, min(selected['n_trees'], model.tree_count_))
+        else:
+            serving_model = CatBoostRegressor(
+                **{**params, 'depth': selected['depth'], 'iterations': selected['n_trees']},
+                random_seed=42, allow_writing_files=False
+            )
+            serving_model.fit(
+                pd.concat([x_train, x_test], axis=0), pd.concat([y_train, y_test], axis=0),
+                sample_weight=weights, verbose=False
+            )
+        logger.info(f"Latency budget: serving depth {selected['depth']} with {serving_model.tree_count_} trees "
+                    f"({selected['latency_ms']:.3f} ms, test RMSE {selected['rmse']:.3f}, "
+                    f"{selected['rmse_increase']:+.1%} over the full model)")
+        return serving_model, report
@@ -0,0 +1,178 @@
+import math
+from collections import deque
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from pipelines.feature_engineering import FeatureEngineeringPipeline
+
+
+class RollingWindow:
+    """
+    Rolling mean, standard deviation, minimum and maximum of the last `size` values,
+    updated in constant (amortized) time per value.
+
+    Missing (NaN) values take a place in the window but are skipped by the statistics,
+    like pandas `rolling(size, min_periods=1)`: a window without any value gives NaN.
+    The mean and standard deviation are updated with Welford's algorithm over the
+    values of the window; the minimum and maximum come from monotonic deques of
+    (position, value).
+
+    Args:
+        size (int): Number of values in the window.
+    """
+    def __init__(self, size: int):
+        self.size = size
+        self.values: deque = deque()
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min_candidates: deque = deque()
+        self.max_candidates: deque = deque()
+        self.position = 0
+
+    def push(self, value: float) -> None:
+        """Add a value, dropping the oldest value once the window is full."""
+        self.values.append(value)
+        if not math.isnan(value):
+            self.count += 1
+            delta = value - self.mean
+            self.mean += delta / self.count
+            self.m2 += delta * (value - self.mean)
+        if len(self.values) > self.size:
+            oldest = self.values.popleft()
+            if not math.isnan(oldest):
+                self.count -= 1
+                if self.count == 0:
+                    self.mean, self.m2 = 0.0, 0.0
+                else:
+                    delta = oldest - self.mean
+                    self.mean -= delta / self.count
+                    # Rounding leftovers must not give a spread to a single value
+                    self.m2 = max(self.m2 - delta * (oldest - self.mean), 0.0) if self.count > 1 else 0.0
+
+        if not math.isnan(value):
+            while self.min_candidates and self.min_candidates[-1][1] >= value:
+                self.min_candidates.pop()
+            self.min_candidates.append((self.position, value))
+            while self.max_candidates and self.max_candidates[-1][1] <= value:
+                self.max_candidates.pop()
+            self.max_candidates.append((self.position, value))
+        oldest_position = self.position - self.size + 1
+        if self.min_candidates and self.min_candidates[0][0] < oldest_position:
+            self.min_candidates.popleft()
+        if self.max_candidates and self.max_candidates[0][0] < oldest_position:
+            self.max_candidates.popleft()
+        self.position += 1
+
+    def stat(self, name: str) -> float:
+        """Current value of a statistic ('mean', 'std', 'min' or 'max'), NaN without values."""
+        if self.count == 0:
+            return math.nan
+        if name == 'min':
+            return self.min_candidates[0][1]
+        if name == 'max':
+            return self.max_candidates[0][1]
+        if name == 'mean':
+            return self.mean
+        return math.sqrt(self.m2 / self.count)
+
+
+class OnlineWindowFeatures:
+    """
+    Online version of the window features of `FeatureEngineeringPipeline` for inference.
+
+    Every new raw row updates the rolling windows and EWMs in constant time, instead
+    of recomputing the windows from the history on every tick. The window features of
+    the last `n_recent` rows are kept, aligned with the rows of the inference batch.
+
+    Args:
+        config (Dict[str, Any]): Application configuration ('feature_engineering.window_params'
+            and the preprocessing column mapping to read the raw columns).
+        n_recent (int): Number of recent rows whose window features are kept.
+
+    Attributes:
+        columns (List[str]): Window feature names, in the order of `FeatureEngineeringPipeline`.
+    """
+    def __init__(self, config: Dict[str, Any], n_recent: int):
+        window_params = config['feature_engineering'].get('window_params') or {}
+        raw_names = {new: old for old, new in config['preprocessing']['column_mapping'].items()}
+        self.columns: List[str] = FeatureEngineeringPipeline.window_columns(window_params)
+
+        # Per output column, in order: (raw column, window or None, statistic or EWM smoothing factor)
+        self._outputs: List[Tuple[str, Optional[RollingWindow], Any]] = []
+        # EWM and weight of its previous value per (raw column, span), as in pandas `ewm(adjust=False)`
+        self._ewms: Dict[Tuple[str, int], Tuple[float, float]] = {}
+        for feat, spec in window_params.items():
+            raw_column = raw_names.get(feat, feat)
+            for size in spec.get('windows', []):
+                window = RollingWindow(size)
+                for stat in spec.get('stats', ['mean']):
+                    self._outputs.append((raw_column, window, stat))
+            for span in spec.get('ewm_spans', []):
+                self._ewms[(raw_column, span)] = (math.nan, 1.0)
+                self._outputs.append((raw_column, None, span))
+        self._windows = list({id(window): (column, window) for column, window, _ in self._outputs if window}.values())
+        self._recent: deque = deque(maxlen=n_recent)
+
+    def update(self, df: pd.DataFrame) -> None:
+        """
+        Add new raw rows, in time order.
+
+        Args:
+            df (pd.DataFrame): New raw rows.
+
+        Returns:
+            None
+        """
+        columns = {column: df[column].to_numpy(dtype=np.float64) for column, _, _ in self._outputs}
+        for i in range(len(df)):
+            for column, window in self._windows:
+                window.push(columns[column][i])
+            for (column, span), (previous, weight) in self._ewms.items():
+                self._ewms[(column, span)] = self.update_ewm(previous, weight, columns[column][i], 2.0 / (span + 1.0))
+            self._recent.append([
+                window.stat(stat) if window is not None else self._ewms[(column, stat)][0]
+                for column, window, stat in self._outputs
+            ])
+
+    @staticmethod
+    def update_ewm(previous: float, weight: float, value: float, alpha: float) -> Tuple[float, float]:
+        """
+        Update an EWM with a new value like pandas `ewm(adjust=False)`: a missing value
+        keeps the EWM and decays the weight of the previous value, so the next value
+        weighs more after a gap.
+
+        Args:
+            previous (float): Current EWM, NaN before the first value.
+            weight (float): Weight of the current EWM.
+            value (float): New value, possibly NaN.
+            alpha (float): Smoothing factor.
+
+        Returns:
+            Tuple[float, float]: Updated EWM and weight.
+        """
+        if math.isnan(previous):
+            return value, 1.0
+        weight *= 1 - alpha
+        if math.isnan(value):
+            return previous, weight
+        return (weight * previous + alpha * value) / (weight + alpha), 1.0
+
+    def recent(self, n: int) -> np.ndarray:
+        """
+        Window features of the last `n` rows.
+
+        Args:
+            n (int): Number of rows.
+
+        Returns:
+            np.ndarray: Matrix of shape (n, len(columns)), oldest row first; rows older than
+            the kept ones are NaN.
+        """
+        values = np.full((n, len(self.columns)), np.nan)
+        recent = list(self._recent)[-n:]
+        if recent:
+            values[n - len(recent):] = recent
+        return values
@@ -0,0 +1,233 @@
+import os
+import hashlib
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from typing import Dict, Any, Iterator, List, Tuple
+from catboost import CatBoostRegressor, Pool
+from catboost.utils import create_cd, quantize
+
+from common.data_manager import DataManager
+from common.utils import setup_logger
+from pipelines.preprocessing import PreprocessingPipeline
+from pipelines.feature_engineering import FeatureEngineeringPipeline
+from pipelines.training import TrainingPipeline
+
+logger = setup_logger(__name__)
+
+
+class OutOfCoreTrainingPipeline:
+    """
+    Training on a production database larger than the memory, streamed in chunks.
+
+    The parquet file is read in chunks of rows, each preprocessed and feature-engineered
+    with the last raw rows of the previous chunk prepended, so that the lag and window
+    features of its first rows see the same history as in a single pass (EWMs see the
+    last `EWM_HISTORY_SPANS` spans, as at inference). The target of the last rows of a
+    chunk is the target column of the next chunk's first rows, so these rows are held
+    back until it is read. The feature rows are appended to a text file on disk, which
+    CatBoost quantizes into a pool without loading the raw values; only the quantized
+    pool (one byte per feature and row) is held in memory for training.
+
+    The chunk size is derived from 'training.out_of_core.memory_budget_mb', which also
+    limits the RAM used by CatBoost to quantize the file. The time-based splits,
+    Optuna study, lag search and final refit are those of `TrainingPipeline`; the
+    final model keeps all the computed lag columns (unselected ones are ignored).
+
+    Args:
+        config (Dict[str, Any]): Application configuration.
+    """
+    # A chunk is held about this many times in memory: raw rows, preprocessed rows, features and their text
+    CHUNK_COPIES = 4
+
+    def __init__(self, config: Dict[str, Any]):
+        self.out_of_core_config: Dict[str, Any] = config['training'].get('out_of_core', {})
+        self.target_params: Dict[str, Any] = config['training']['target_params']
+        self.train_fraction: float = config['training']['train_fraction']
+        self.border_count = config['training'].get('pool', {}).get('border_count')
+        self.folder: str = self.out_of_core_config.get('folder', './data/out_of_core/')
+        self.memory_budget_mb: int = self.out_of_core_config.get('memory_budget_mb', 512)
+
+        self.preprocessing_pipeline = PreprocessingPipeline(config)
+        self.feature_eng_pipeline = FeatureEngineeringPipeline(config)
+        self.training_pipeline = TrainingPipeline(config)
+        self.lag_params: Dict[str, List[int]] = self.training_pipeline.get_feature_lag_params()
+        self.window_params = config['feature_engineering'].get('window_params')
+        self.n_history: int = FeatureEngineeringPipeline.get_history_rows(self.lag_params, self.window_params)
+
+    def get_chunk_rows(self, schema: pa.Schema) -> int:
+        """
+        Rows read per chunk: 'training.out_of_core.chunk_rows', or as many rows as fit in
+        the memory budget. A chunk has more rows than the history of a feature row.
+
+        Args:
+            schema (pa.Schema): Schema of the production database.
+
+        Returns:
+            int: Rows per chunk.
+        """
+        chunk_rows = self.out_of_core_config.get('chunk_rows')
+        if not chunk_rows:
+            n_columns = (
+                len(schema) + sum(len(lags) for lags in self.lag_params.values())
+                + len(FeatureEngineeringPipeline.window_columns(self.window_params)) + 1
+            )
+            bytes_per_row = n_columns * np.dtype(np.float64).itemsize * self.CHUNK_COPIES
+            chunk_rows = self.memory_budget_mb * 2 ** 20 // bytes_per_row
+        return max(int(chunk_rows), self.n_history + 1)
+
+    def iter_feature_chunks(self, path: str) -> Iterator[pd.DataFrame]:
+        """
+        Stream the feature rows of the production database with their target.
+
+        Args:
+            path (str): Production database (parquet dataset folder or file).
+
+        Yields:
+            pd.DataFrame: Consecutive feature rows with the target column, in row order.
+        """
+        chunk_rows = self.get_chunk_rows(DataManager.read_schema(path))
+        shift_period = self.target_params['shift_period']
+        target_column, new_target_name = self.target_params['target_column'], self.target_params['new_target_name']
+        history = None  # last raw rows, prepended to the next chunk
+        pending = None  # last feature rows, waiting for their target in the next chunk
+
+        batches = (
+            batch for part in DataManager.list_parts(path)
+            for batch in pq.ParquetFile(part).iter_batches(batch_size=chunk_rows)
+        )
+        for batch in batches:
+            chunk = batch.to_pandas()
+            n_history = 0
+            if history is not None:
+                n_history = len(history)
+                chunk = pd.concat([history, chunk], ignore_index=True)
+            history = chunk.iloc[max(0, len(chunk) - self.n_history):].copy()
+
+            features = self.preprocessing_pipeline.run(chunk)
+            features = self.feature_eng_pipeline.run(features, lag_params=self.lag_params).iloc[n_history:]
+            if pending is not None:
+                features = pd.concat([pending, features], ignore_index=True)
+            features[new_target_name] = features[target_column].shift(-shift_period)
+            n_ready = max(0, len(features) - shift_period)
+            pending = features.iloc[n_ready:].drop(columns=[new_target_name])
+            if n_ready:
+                yield features.iloc[:n_ready].reset_index(drop=True)
+
+        # As `TrainingPipeline.make_target`: the last rows without a next row are forward-filled
+        if pending is not None and len(pending):
+            pending[new_target_name] = pending[target_column].iloc[-1]
+            yield pending.reset_index(drop=True)
+
+    def write_dataset(self, path: str) -> Dict[str, Any]:
+        """
+        Write the feature rows of the production database to a tab-separated file with
+        its CatBoost column description (target, optional recency weight, features).
+
+        Args:
+            path (str): Production database (parquet dataset folder or file).
+
+        Returns:
+            Dict[str, Any]: 'data_path', 'cd_path', 'n_rows', 'feature_names' and
+            'data_version' (hash of the written rows).
+        """
+        os.makedirs(self.folder, exist_ok=True)
+        data_path = os.path.join(self.folder, 'features.tsv')
+        cd_path = os.path.join(self.folder, 'features.cd')
+        new_target_name = self.target_params['new_target_name']
+        half_life = self.training_pipeline.window_config.get('recency_half_life_rows')
+        n_total = DataManager.count_rows(path)
+
+        n_rows = 0
+        feature_names: List[str] = []
+        data_hash = hashlib.sha256()
+        with open(data_path, 'w') as file:
+            for rows in self.iter_feature_chunks(path):
+                if not feature_names:
+                    feature_names = [column for column in rows.columns if column != new_target_name]
+                columns = {new_target_name: rows[new_target_name]}
+                if half_life:
+                    # Recency weights of `TrainingPipeline.get_sample_weights` over all rows
+                    ages = n_total - 1 - np.arange(n_rows, n_rows + len(rows), dtype=np.float64)
+                    columns['weight'] = np.power(0.5, ages / half_life)
+                rows = pd.concat([pd.DataFrame(columns, index=rows.index), rows[feature_names]], axis=1)
+                data_hash.update(pd.util.hash_pandas_object(rows, index=False).to_numpy().tobytes())
+                rows.to_csv(file, sep='\t', header=False, index=False)
+                n_rows += len(rows)
+
+        n_meta = 2 if half_life else 1
+        create_cd(
+            label=0, weight=1 if half_life else None,
+            feature_names={n_meta + i: name for i, name in enumerate(feature_names)}, output_path=cd_path
+        )
+        return {
+            'data_path': data_path,
+            'cd_path': cd_path,
+            'n_rows': n_rows,
+            'feature_names': feature_names,
+            'data_version': data_hash.hexdigest()[:12],
+        }
+
+    def load_pool(self, dataset: Dict[str, Any]) -> Pool:
+        """
+        Quantize the written dataset into a pool, within the memory budget.
+
+        Args:
+            dataset (Dict[str, Any]): Output of `write_dataset`.
+
+        Returns:
+            Pool: Quantized pool of all the rows.
+        """
+        return quantize(
+            dataset['data_path'], column_description=dataset['cd_path'], delimiter='\t',
+            border_count=self.border_count, used_ram_limit=f"{self.memory_budget_mb}MB",
+            thread_count=self.training_pipeline.cpu_budget
+        )
+
+    def run(self, path: str) -> Tuple[CatBoostRegressor, Dict[str, List[int]]]:
+        """
+        Tune and train a model on the production database without loading it in memory.
+
+        Args:
+            path (str): Production database (parquet dataset folder or file).
+
+        Returns:
+            Tuple[CatBoostRegressor, Dict[str, List[int]]]: Final model (refit on the train
+            and test rows) and the lags of its features.
+        """
+        dataset = self.write_dataset(path)
+        try:
+            pool = self.load_pool(dataset)
+        finally:
+            os.remove(dataset['data_path'])
+
+        # Time-based splits of `TrainingPipeline.prepare_dataset` and `tune_hyperparams`
+        train_size = int(self.train_fraction * dataset['n_rows'])
+        train_idx = int(self.train_fraction * train_size)
+        pools = {'train': pool.slice(list(range(train_idx))), 'val': pool.slice(list(range(train_idx, train_size)))}
+
+        training_pipeline = self.training_pipeline
+        study = training_pipeline.load_or_create_study(
+            training_pipeline.get_config_version(pd.DataFrame(columns=dataset['feature_names'])),
+            dataset['data_version']
+        )
+        n_trials = training_pipeline.get_remaining_trials(study)
+        if n_trials == 0:
+            logger.info(f"All trials of study {study.study_name} are already finished")
+        else:
+            study.optimize(training_pipeline.make_objective(pools), n_trials=n_trials)
+        del pools
+
+        # The pool keeps all the lag columns, the unselected ones are ignored by the final model
+        best_params = training_pipeline.get_best_params(study)
+        training_pipeline.selected_lag_params = training_pipeline.get_selected_lag_params(study.best_params)
+        ignored_features = [
+            column for name, column in training_pipeline.get_lag_choices().items()
+            if not study.best_params.get(name, True)
+        ]
+        if ignored_features:
+            best_params['ignored_features'] = ignored_features
+        final_model = CatBoostRegressor(**best_params, random_seed=42, allow_writing_files=False)
+        final_model.fit(pool, verbose=False)
+        return final_model, self.lag_params
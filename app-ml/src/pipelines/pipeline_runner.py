@@ -9,13 +9,28 @@ sys.path.append(str(project_root))
 sys.path.append(str(project_root / 'app-ml' /'src'))
 
 import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
+from catboost import CatBoostRegressor
 from common.data_manager import DataManager
+from common.utils import get_process_rss_bytes, get_model_version, load_model, load_model_metadata, setup_logger
+from common.tracing import get_tracer
+from common.stage_cache import StageCache
+from common.feature_store import FeatureStore
 from pipelines.preprocessing import PreprocessingPipeline
 from pipelines.feature_engineering import FeatureEngineeringPipeline
 from pipelines.training import TrainingPipeline
 from pipelines.inference import InferencePipeline
 from pipelines.postprocessing import PostprocessingPipeline
+from pipelines.feature_pruning import FeaturePruningPipeline
+from pipelines.online_features import OnlineWindowFeatures
+from pipelines.polars_backend import PolarsFeaturePipeline
+from pipelines.out_of_core import OutOfCoreTrainingPipeline
+from pipelines.latency_budget import LatencyBudgetPipeline
+from pipelines.shadow import ShadowScorer
+from pipelines.what_if import WhatIfPipeline
+from pipelines.series_training import SeriesTrainer
+
+logger = setup_logger(__name__)
 
 
 class PipelineRunner:
@@ -33,13 +48,27 @@ class PipelineRunner:
         config (Dict[str, Any]): Configuration dictionary.
         data_manager (DataManager): Manages loading/saving and transformation of data.
         real_time_data (pd.DataFrame): Cached real-time production data for inference.
-        current_database_data (pd.DataFrame): Cached production database data for inference.
-        prod_data_path (str): Path to the production database file.
+        current_database_data (pd.DataFrame): Cached production database data for inference
+            (only the last `retention_rows` rows when the retention window is enabled).
+        retention_rows (Optional[int]): Number of rows kept in memory, None keeps the full history.
+        model_version (Optional[str]): Content hash of the model used for inference, saved in checkpoints.
+        prod_data_path (str): Path to the production database (parquet dataset folder).
         preprocessing_pipeline (PreprocessingPipeline): Handles data preprocessing steps.
         feature_eng_pipeline (FeatureEngineeringPipeline): Handles feature engineering steps.
         training_pipeline (TrainingPipeline): Handles model training steps.
         inference_pipeline (InferencePipeline): Handles inference steps.
         postprocessing_pipeline (PostprocessingPipeline): Handles postprocessing steps.
+        stage_cache (StageCache): Memoizes the preprocessing and feature engineering outputs of training.
+        window_features (Optional[OnlineWindowFeatures]): Window features of the latest rows, updated
+            online on every append (None without window features).
+        feature_store (FeatureStore): Materialized features of the production database.
+        feature_store_synced (bool): Whether the feature store covered the production rows at the
+            last append, so that the features of the new rows were appended to it.
+        latest_features (Optional[pd.DataFrame]): Features of the rows appended last (with the feature store).
+        n_database_rows (int): Number of rows of the production database.
+        database_id (Optional[str]): Identity of the production database, recorded by the feature store.
+        shadow_scorer (ShadowScorer): Scores the shadow models on every tick in the background.
+        what_if_pipeline (WhatIfPipeline): Scores scenarios of changed conditions of the latest row.
     """
 
     def __init__(self, config: Dict[str, Any], data_manager: DataManager):
@@ -59,6 +88,7 @@ class PipelineRunner:
         self.training_pipeline = TrainingPipeline(config=config)
         self.inference_pipeline = InferencePipeline(config=config)
         self.postprocessing_pipeline = PostprocessingPipeline(config=config)
+        self.stage_cache = StageCache(config=config)
 
         # Load real-time data
         self.real_time_data = self.data_manager.load_data(
@@ -74,10 +104,158 @@ class PipelineRunner:
             self.config['data_manager']['prod_database_name']
         )
 
-        # Load existing production database
-        self.current_database_data = self.data_manager.load_data(self.prod_data_path)
+        # Load existing production database (only the rows inference needs if retention is enabled)
+        self.retention_rows = self.get_retention_rows()
+        if self.retention_rows is None:
+            self.current_database_data = self.data_manager.load_data(self.prod_data_path)
+        else:
+            self.current_database_data = self.data_manager.load_last_rows(self.prod_data_path, self.retention_rows)
+
+        # Window features are maintained online from the latest rows
+        self.window_features = None
+        if self.config['feature_engineering'].get('window_params'):
+            self.window_features = OnlineWindowFeatures(config, n_recent=self.config['pipeline_runner']['batch_size'])
+            self.window_features.update(self.data_manager.get_n_last_points(
+                data=self.current_database_data, n=self.get_max_lag() + self.config['pipeline_runner']['batch_size']
+            ))
+
+        # Features of the production rows, extended on every append
+        self.feature_store = FeatureStore(config, feature_config=self.get_feature_config())
+        self.n_database_rows = self.data_manager.count_rows(self.prod_data_path)
+        self.database_id = self.data_manager.get_dataset_id(self.prod_data_path)
+        self.feature_store_synced = self.feature_store.is_synced(
+            self.n_database_rows, self.current_database_data['datetime'].iloc[-1], self.database_id
+        )
+        self.latest_features: Optional[pd.DataFrame] = None
+
+        # Candidate models scored next to the production model, off the response path
+        self.shadow_scorer = ShadowScorer(config)
+        self.what_if_pipeline = WhatIfPipeline(config)
+
+        # Checkpointing of the production state
+        self.model_version = get_model_version(self.config['pipeline_runner']['model_path'])
+        self.steps_since_checkpoint = 0
+
+    def get_max_lag(self) -> int:
+        """
+        Rows of history a feature row depends on: the largest lag (including the candidate
+        lags of the lag search) or window of the window features.
+        """
+        return FeatureEngineeringPipeline.get_history_rows(
+            self.training_pipeline.get_feature_lag_params(), self.config['feature_engineering'].get('window_params')
+        )
+
+    def get_feature_config(self) -> Dict[str, Any]:
+        """
+        Settings the features of a production row depend on (versions the feature store).
+
+        Returns:
+            Dict[str, Any]: Preprocessing and feature engineering settings, with the lags computed for training.
+        """
+        return {
+            'preprocessing': self.config['preprocessing'],
+            'feature_engineering': {
+                **self.config['feature_engineering'],
+                'lag_params': self.training_pipeline.get_feature_lag_params(),
+            },
+        }
+
+    def get_retention_rows(self) -> Optional[int]:
+        """
+        Number of production rows to keep in memory for inference.
+
+        Inference only uses the last `batch_size` rows, and lag features need at least
+        `max_lag + 1` rows, so older rows are only kept on disk.
+
+        Returns:
+            Optional[int]: Rows to keep in memory, or None if the retention window is disabled.
+        """
+        retention_config = self.config['pipeline_runner'].get('retention', {})
+        if not retention_config.get('enabled', False):
+            return None
+        needed_rows = max(self.config['pipeline_runner']['batch_size'], self.get_max_lag() + 1)
+        return needed_rows + retention_config.get('extra_rows', 0)
+
+    def checkpoint(self, current_timestamp: pd.Timestamp, force: bool = False) -> None:
+        """
+        Checkpoint the production state every 'data_manager.startup.checkpoint_every_n_steps'
+        inference steps, so that a restart can resume from it.
+
+        Args:
+            current_timestamp (pd.Timestamp): Last processed timestamp (the inference cursor).
+            force (bool): Checkpoint regardless of the number of steps since the last one.
+
+        Returns:
+            None
+        """
+        self.steps_since_checkpoint += 1
+        every_n_steps = self.config['data_manager'].get('startup', {}).get('checkpoint_every_n_steps', 0)
+        if force or (every_n_steps and self.steps_since_checkpoint >= every_n_steps):
+            self.data_manager.save_checkpoint({
+                'cursor': str(current_timestamp),
+                'model_version': self.model_version,
+            })
+            self.steps_since_checkpoint = 0
+
+    def close(self) -> None:
+        """
+        Finish the background work and checkpoint the steps run since the last checkpoint,
+        e.g. before the runner is dropped.
+
+        Returns:
+            None
+        """
+        self.shadow_scorer.close()
+        if self.steps_since_checkpoint and self.config['data_manager'].get('startup', {}).get('checkpoint_every_n_steps'):
+            self.checkpoint(self.get_latest_timestamp(), force=True)
+
+    def get_latest_timestamp(self) -> pd.Timestamp:
+        """
+        Return the latest timestamp of the production database.
+
+        Returns:
+            pd.Timestamp: Latest 'datetime' value.
+        """
+        return pd.to_datetime(self.current_database_data['datetime']).max()
+
+    def set_model(
+        self,
+        model: Any,
+        version: Optional[str],
+        file_key: Optional[tuple] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Swap the model used by inference (see `InferencePipeline.set_model`).
+
+        Args:
+            model (Any): Loaded model.
+            version (Optional[str]): Content hash of the model file.
+            file_key (Optional[tuple]): Identity of the model file the model was loaded from.
+            metadata (Optional[Dict[str, Any]]): Metadata saved with the model.
+
+        Returns:
+            None
+        """
+        self.inference_pipeline.set_model(model, version, file_key, metadata)
+        self.model_version = version
+
+    def get_memory_stats(self) -> Dict[str, float]:
+        """
+        Memory gauges of the in-memory data and of the process.
+
+        Returns:
+            Dict[str, float]: Rows and bytes of the cached frames and the process RSS.
+        """
+        return {
+            'database_rows': len(self.current_database_data),
+            'database_bytes': int(self.current_database_data.memory_usage(deep=True).sum()),
+            'real_time_rows': len(self.real_time_data),
+            'real_time_bytes': int(self.real_time_data.memory_usage(deep=True).sum()),
+            'process_rss_bytes': get_process_rss_bytes(),
+        }
 
-    def run_training(self) -> None:
+    def run_training(self, incremental: Optional[bool] = None) -> None:
         """
         Run the full training pipeline:
         1. Load and preprocess data
@@ -85,16 +263,342 @@ class PipelineRunner:
         3. Train the model
         4. Save the trained model
 
+        Steps 1 and 2 are served from the stage cache when neither the production
+        database nor their config sections changed since a previous run; the cache
+        hits and misses of the runner are logged at the end.
+
+        With 'training.per_series.enabled', one model per series is trained instead
+        (see `run_series_training`).
+
+        With 'training.out_of_core.enabled', the production database is streamed in
+        chunks into a pool on disk instead of being loaded (see `OutOfCoreTrainingPipeline`).
+
+        With 'training.feature_pruning.enabled', the trained model is replaced by a
+        model on its most important features if that barely changes its accuracy
+        (see `FeaturePruningPipeline`).
+
+        In incremental mode the production model is first continued on the rows added
+        since its training (see `run_incremental_training`); the full training only
+        runs if that is not possible or the continued model is rejected.
+
+        Args:
+            incremental (Optional[bool]): Try incremental training first
+                (defaults to 'training.incremental.enabled').
+
         Returns:
             None
         """
-        df = self.data_manager.load_data(self.prod_data_path)
-        df = self.preprocessing_pipeline.run(df=df)
-        df = self.feature_eng_pipeline.run(df=df)
+        if self.config['training'].get('per_series', {}).get('enabled', False):
+            self.run_series_training()
+            return
+
+        if incremental is None:
+            incremental = self.config['training'].get('incremental', {}).get('enabled', False)
+        if incremental and self.run_incremental_training():
+            return
+
+        metadata = self.get_training_metadata(mode='full')
+        if self.config['training'].get('out_of_core', {}).get('enabled', False):
+            model, metadata['lag_params'] = OutOfCoreTrainingPipeline(config=self.config).run(self.prod_data_path)
+            self.postprocessing_pipeline.run_train(model=model, metadata=metadata)
+            return
+
+        df = self.get_training_features()
         model = self.training_pipeline.run(df)
-        self.postprocessing_pipeline.run_train(model=model)
+        metadata['lag_params'] = self.training_pipeline.selected_lag_params
+        if self.config['training'].get('feature_pruning', {}).get('enabled', False):
+            model, metadata['lag_params'], metadata['feature_pruning'] = FeaturePruningPipeline(config=self.config).run(
+                model, df, lag_params=metadata['lag_params']
+            )
+        self.postprocessing_pipeline.run_train(model=model, metadata=metadata)
+        if self.stage_cache.enabled:
+            stats = self.stage_cache.stats
+            logger.info(f"Stage cache: {stats['hits']} hits, {stats['misses']} misses, {stats['evictions']} evictions")
         return
 
+    def run_latency_budget(self) -> Dict[str, Any]:
+        """
+        Build the serving model of the production model for the 'latency_budget' target
+        (see `LatencyBudgetPipeline`) and save it next to the production model.
+
+        Returns:
+            Dict[str, Any]: Latency budget report.
+        """
+        model_path = self.config['pipeline_runner']['model_path']
+        model = load_model(model_path)
+        if not isinstance(model, CatBoostRegressor):
+            raise ValueError(f"The latency budget needs a CatBoost production model, got {type(model).__name__}")
+        metadata = load_model_metadata(model_path) or {}
+
+        serving_model, report = LatencyBudgetPipeline(config=self.config).run(model, self.get_training_features())
+        self.postprocessing_pipeline.run_serving(serving_model, metadata={
+            **metadata,
+            'full_model_version': get_model_version(model_path),
+            'latency_budget': report,
+        })
+        return report
+
+    def run_what_if(self, scenarios: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Predict the next point for scenarios of the latest conditions, e.g. "what if it
+        rains / is a holiday", without changing the production state (see `WhatIfPipeline`).
+
+        Args:
+            scenarios (List[Dict[str, Any]]): Overrides per scenario of the latest row's
+                'what_if.columns', e.g. [{'weather': 3}, {'working_day': 0}].
+
+        Returns:
+            Dict[str, Any]: Time of the predicted point, baseline prediction and the
+            prediction of every scenario.
+        """
+        with get_tracer().span('pipeline.run_what_if', {'scenarios': len(scenarios)}):
+            batch_size = self.config['pipeline_runner']['batch_size']
+            df = self.data_manager.get_n_last_points(
+                data=self.current_database_data, n=max(batch_size, self.what_if_pipeline.get_history_rows() + 1)
+            )
+            prediction_time = self.get_latest_timestamp() + pd.Timedelta(self.config['pipeline_runner']['time_increment'])
+            history = self.preprocessing_pipeline.run(df=df.copy())
+
+            # Features of the latest batch, as computed for inference
+            batch = history.tail(batch_size).reset_index(drop=True)
+            window_values = self.window_features.recent(len(batch)) if self.window_features is not None else None
+            features = self.feature_eng_pipeline.run(
+                df=batch, lag_params=self.inference_pipeline.lag_params, window_values=window_values
+            )
+            result = self.what_if_pipeline.run(self.inference_pipeline.get_model(), features, history, scenarios)
+        return {'datetime': str(prediction_time), **result}
+
+    def run_series_training(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Train one model per series (e.g. per station) of the production database in
+        parallel worker processes, see `SeriesTrainer`.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Training summary per series or cluster.
+        """
+        df = self.data_manager.load_data(self.prod_data_path)
+        results = SeriesTrainer(config=self.config).run(df)
+        n_failed = sum(1 for result in results.values() if result['status'] != 'succeeded')
+        logger.info(f"Trained {len(results) - n_failed} series models, {n_failed} failed")
+        return results
+
+    def get_training_metadata(self, mode: str) -> Dict[str, Any]:
+        """
+        Metadata saved with a trained model: the production rows it was trained on.
+
+        Args:
+            mode (str): 'full' or 'incremental'.
+
+        Returns:
+            Dict[str, Any]: Number of production rows and last timestamp at training time.
+        """
+        last_row = self.data_manager.load_last_rows(self.prod_data_path, 1)
+        return {
+            'mode': mode,
+            'n_rows': self.data_manager.count_rows(self.prod_data_path),
+            'trained_until': str(last_row['datetime'].iloc[-1]),
+            'trained_at': str(pd.Timestamp.now()),
+        }
+
+    def run_incremental_training(self) -> bool:
+        """
+        Continue the production model on the production rows added since it was trained.
+
+        Only the new rows, plus the `max_lag` rows before them for the lag features,
+        are read from the production database, so the cost scales with the new data.
+
+        Returns:
+            bool: True if the production model is up to date (continued, or too few new
+            rows to train on), False if a full training is needed.
+        """
+        incremental_config = self.config['training'].get('incremental', {})
+        model_path = self.config['pipeline_runner']['model_path']
+        metadata = load_model_metadata(model_path)
+        init_model = load_model(model_path) if metadata is not None else None
+        if not isinstance(init_model, CatBoostRegressor):
+            logger.info("Incremental training: no CatBoost production model with metadata, running full training")
+            return False
+
+        # The production database only grows by appends, the rows after the trained ones are new
+        n_new = self.data_manager.count_rows(self.prod_data_path) - metadata['n_rows']
+        if n_new < 0:
+            logger.warning("Incremental training: the production database was reset, running full training")
+            return False
+        if n_new < incremental_config.get('min_new_rows', 1):
+            logger.info(f"Incremental training: {n_new} new rows, keeping the production model")
+            return True
+
+        n_context = min(self.get_max_lag(), metadata['n_rows'])
+        df = self.data_manager.load_last_rows(self.prod_data_path, n_new + n_context)
+        datetimes = pd.to_datetime(df['datetime'])
+        trained_until = pd.Timestamp(metadata['trained_until'])
+        n_old = int((datetimes <= trained_until).sum())
+        if n_old == 0 or datetimes.iloc[n_old - 1] != trained_until:
+            logger.warning("Incremental training: the trained rows are not found before the new rows, running full training")
+            return False
+
+        # Features of the new rows, with the lags computed from the rows before them
+        new_metadata = {
+            'mode': 'incremental',
+            'n_rows': metadata['n_rows'] + len(df) - n_old,
+            'trained_until': str(df['datetime'].iloc[-1]),
+            'trained_at': str(pd.Timestamp.now()),
+            'lag_params': metadata.get('lag_params'),
+        }
+        df = self.preprocessing_pipeline.run(df=df)
+        df = self.feature_eng_pipeline.run(df=df, lag_params=metadata.get('lag_params'))
+        df = df.iloc[n_old:].reset_index(drop=True)
+
+        model, scores = self.training_pipeline.run_incremental(df, init_model=init_model)
+        if model is None:
+            logger.warning(f"Incremental training rejected ({scores['reason']}: {scores}), running full training")
+            return False
+        logger.info(f"Incremental training on {scores['n_new_rows']} new rows: validation RMSE "
+                    f"{scores['prod_rmse']:.2f} (production) -> {scores['incremental_rmse']:.2f}")
+        self.postprocessing_pipeline.run_train(model=model, metadata={**new_metadata, **scores})
+        return True
+
+    def get_training_window(self) -> Optional[Tuple[int, int]]:
+        """
+        Size of the training window ('training.window') in production rows. Only the
+        'datetime' column of the recent rows is read to find the window start.
+
+        Returns:
+            Optional[Tuple[int, int]]: (rows to load, rows of the window); the rows loaded
+            before the window provide the lag features of its first rows. None if the
+            window is disabled.
+        """
+        window_config = self.config['training'].get('window', {})
+        if not window_config.get('enabled', False):
+            return None
+        n_total = self.data_manager.count_rows(self.prod_data_path)
+        n_window = min(window_config.get('max_rows') or n_total, n_total)
+        if window_config.get('max_span'):
+            last_timestamp = pd.Timestamp(self.data_manager.load_last_rows(self.prod_data_path, 1)['datetime'].iloc[-1])
+            datetimes = pd.to_datetime(self.data_manager.load_column(
+                self.prod_data_path, 'datetime', since=last_timestamp - pd.Timedelta(window_config['max_span'])
+            ))
+            n_window = min(n_window, len(datetimes))
+        return min(n_window + self.get_max_lag(), n_total), n_window
+
+    def get_training_features(self) -> pd.DataFrame:
+        """
+        Load, preprocess and feature-engineer the production database.
+
+        With a training window, only the rows of the window (and the rows its lag
+        features need) are read from the production database. With the lag search,
+        the lag features of all candidate lags are computed once.
+
+        The features are read from the feature store instead when it covers the rows
+        of the production database, and the store is materialized otherwise. They are
+        computed by the pandas pipelines (see `compute_training_features`) or, with
+        'pipeline_runner.training_backend: polars', by `PolarsFeaturePipeline`.
+
+        Returns:
+            pd.DataFrame: Feature-engineered training data.
+        """
+        window = self.get_training_window()
+        if self.feature_store.enabled:
+            with self.feature_store.lock():
+                n_rows = self.data_manager.count_rows(self.prod_data_path)
+                last_key = self.data_manager.load_last_rows(self.prod_data_path, 1)['datetime'].iloc[-1]
+                if self.feature_store.is_synced(n_rows, last_key, self.database_id):
+                    logger.info(f"Reading the training features from the feature store {self.feature_store.path}")
+                    return self.feature_store.read(n_last=window[1] if window is not None else None)
+
+        lag_params = self.training_pipeline.get_feature_lag_params()
+        if self.config['pipeline_runner'].get('training_backend', 'pandas') == 'polars':
+            df = PolarsFeaturePipeline(self.config).run(
+                self.prod_data_path, lag_params, n_last=window[0] if window is not None else None
+            )
+        else:
+            df = self.compute_training_features(window, lag_params)
+        if window is not None:
+            df = df.iloc[len(df) - window[1]:].reset_index(drop=True)
+        elif self.feature_store.enabled:
+            with self.feature_store.lock():
+                keys = self.data_manager.load_column(self.prod_data_path, 'datetime')
+                # Rows appended since the features were computed would be missing from the store
+                if len(keys) == len(df):
+                    self.feature_store.write(df, keys=keys, database_id=self.database_id)
+        return df
+
+    def compute_training_features(
+        self,
+        window: Optional[Tuple[int, int]],
+        lag_params: Dict[str, List[int]]
+    ) -> pd.DataFrame:
+        """
+        Run the pandas preprocessing and feature engineering on the production database,
+        memoizing each stage output in the stage cache.
+
+        Args:
+            window (Optional[Tuple[int, int]]): Training window (see `get_training_window`).
+            lag_params (Dict[str, List[int]]): Lags to compute.
+
+        Returns:
+            pd.DataFrame: Feature-engineered rows (all the rows loaded for the window).
+        """
+        cache = self.stage_cache
+        database_fingerprint = cache.file_fingerprint(self.prod_data_path)
+        if window is not None:
+            database_fingerprint = f"{database_fingerprint}:window:{window[0]}"
+
+        def load_database() -> pd.DataFrame:
+            if window is None:
+                return self.data_manager.load_data(self.prod_data_path)
+            return self.data_manager.load_last_rows(self.prod_data_path, window[0])
+
+        preprocessing_key = cache.stage_key(
+            self.preprocessing_pipeline, database_fingerprint, self.config['preprocessing']
+        )
+
+        def preprocess() -> pd.DataFrame:
+            df, _ = cache.run_stage(
+                self.preprocessing_pipeline, self.config['preprocessing'], database_fingerprint,
+                load_input=load_database
+            )
+            return df
+
+        df, _ = cache.run_stage(
+            self.feature_eng_pipeline, {**self.config['feature_engineering'], 'lag_params': lag_params},
+            preprocessing_key, load_input=preprocess, run_kwargs={'lag_params': lag_params}
+        )
+        return df
+
+    def update_features(self, new_data: pd.DataFrame) -> None:
+        """
+        Compute the features of the rows just appended to the production database,
+        from the rows before them and the online window features, and append them to
+        the feature store.
+
+        Args:
+            new_data (pd.DataFrame): Appended raw rows.
+
+        Returns:
+            None
+        """
+        n_new = len(new_data)
+        lag_params = self.training_pipeline.get_feature_lag_params()
+        df = self.data_manager.get_n_last_points(
+            data=self.current_database_data, n=FeatureEngineeringPipeline.get_history_rows(lag_params) + n_new
+        )
+        keys = df['datetime'].iloc[-n_new:]
+        previous_key = df['datetime'].iloc[-n_new - 1] if len(df) > n_new else None
+        window_values = self.window_features.recent(len(df)) if self.window_features is not None else None
+        df = self.feature_eng_pipeline.run(
+            df=self.preprocessing_pipeline.run(df=df), lag_params=lag_params, window_values=window_values
+        )
+        self.latest_features = df.iloc[-n_new:].reset_index(drop=True)
+
+        # A training (e.g. in another process) may have replaced the store since the last append
+        with self.feature_store.lock():
+            self.feature_store_synced = self.feature_store.is_synced(
+                self.n_database_rows - n_new, previous_key, self.database_id
+            )
+            if self.feature_store_synced:
+                self.feature_store.append(self.latest_features, keys=keys)
+
     def run_inference(self, current_timestamp: pd.Timestamp) -> None:
         """
         Run the full inference pipeline:
@@ -102,8 +606,9 @@ class PipelineRunner:
         2. Append to the production database
         3. Prepare the latest batch
         4. Preprocess, transform, and predict
-        5. Postprocess and store the prediction
+        5. Postprocess and store the prediction (and queue the shadow models' scoring)
         6. Update the production database
+        7. Checkpoint the production state
 
         Args:
             current_timestamp (pd.Timestamp): The timestamp for which to run inference.
@@ -112,37 +617,89 @@ class PipelineRunner:
             None
         """
 
-        # Step 1: Retrieve real-time data for the current timestamp
-        current_real_time_data = self.data_manager.get_timestamp_data(
-            data=self.real_time_data,
-            timestamp=current_timestamp
-        )
+        tracer = get_tracer()
+        with tracer.span('pipeline.run_inference', {'timestamp': str(current_timestamp)}):
+            # Step 1: Retrieve real-time data for the current timestamp
+            with tracer.span('pipeline.get_real_time_data'):
+                current_real_time_data = self.data_manager.get_timestamp_data(
+                    data=self.real_time_data,
+                    timestamp=current_timestamp
+                )
 
-        # Step 2: Append new data to production database
-        self.current_database_data = self.data_manager.append_data(
-            current_data=self.current_database_data,
-            new_data=current_real_time_data
-        )
+            # Step 2: Append new data to production database (keeping only the retention window in memory)
+            with tracer.span('pipeline.append_data'):
+                self.current_database_data = self.data_manager.append_data(
+                    current_data=self.current_database_data,
+                    new_data=current_real_time_data
+                )
+                if self.retention_rows is not None:
+                    self.current_database_data = self.data_manager.get_n_last_points(
+                        data=self.current_database_data,
+                        n=self.retention_rows
+                    ).reset_index(drop=True)
+                self.n_database_rows += len(current_real_time_data)
+                if self.window_features is not None:
+                    self.window_features.update(current_real_time_data)
 
-        # Step 3: Get the last N rows as the latest batch
-        df = self.data_manager.get_n_last_points(
-            data=self.current_database_data,
-            n=self.config['pipeline_runner']['batch_size']
-        )
+            # Step 2b: Extend the feature store with the features of the new rows
+            if self.feature_store.enabled:
+                with tracer.span('pipeline.update_features'):
+                    self.update_features(current_real_time_data)
 
-        # Step 4: Run preprocessing and feature engineering
-        df = self.preprocessing_pipeline.run(df=df)
-        df = self.feature_eng_pipeline.run(df=df)
+            # Step 3: Get the last N rows as the latest batch (and their window features)
+            df = self.data_manager.get_n_last_points(
+                data=self.current_database_data,
+                n=self.config['pipeline_runner']['batch_size']
+            )
+            window_values = self.window_features.recent(len(df)) if self.window_features is not None else None
+            raw_batch = df.copy() if self.shadow_scorer.enabled else None
 
-        # Step 5: Run inference
-        y_pred = self.inference_pipeline.run(x=df)
+            # Steps 4 and 5: Predict from the precomputed features of the new row, or transform
+            # the raw batch into the model features with the fused plan and predict
+            y_pred = None
+            if self.latest_features is not None:
+                with tracer.span('pipeline.inference'):
+                    try:
+                        y_pred = self.inference_pipeline.run(x=self.latest_features)
+                    except KeyError:
+                        # The model uses features the store does not have, e.g. after a config change
+                        y_pred = None
+            if y_pred is None and self.config['pipeline_runner'].get('fused_transform', False):
+                with tracer.span('pipeline.fused_inference'):
+                    y_pred = self.inference_pipeline.run_raw(df, window_values=window_values)
 
-        # Step 6: Postprocessing and saving the prediction
-        df_pred = self.postprocessing_pipeline.run_inference(
-            y_pred=y_pred,
-            current_timestamp=current_timestamp
-        )
-        # Step 7: Save the prediction and updated database to access in the UI application
-        self.data_manager.save_predictions(df_pred, current_timestamp)
-        self.data_manager.save_data(data=self.current_database_data, path=self.prod_data_path)
-        return
\ No newline at end of file
+            if y_pred is None:
+                # Step 4: Run preprocessing and feature engineering
+                with tracer.span('pipeline.preprocessing'):
+                    df = self.preprocessing_pipeline.run(df=df)
+                with tracer.span('pipeline.feature_engineering'):
+                    df = self.feature_eng_pipeline.run(
+                        df=df, lag_params=self.inference_pipeline.lag_params, window_values=window_values
+                    )
+
+                # Step 5: Run inference
+                with tracer.span('pipeline.inference'):
+                    y_pred = self.inference_pipeline.run(x=df)
+            self.model_version = self.inference_pipeline.model_version
+
+            # Step 6: Postprocessing and saving the prediction
+            with tracer.span('pipeline.postprocessing'):
+                df_pred = self.postprocessing_pipeline.run_inference(
+                    y_pred=y_pred,
+                    current_timestamp=current_timestamp
+                )
+            # Shadow models are scored on the same batch in the background
+            self.shadow_scorer.submit(
+                prediction_time=df_pred['datetime'].iloc[0], raw_batch=raw_batch, new_rows=current_real_time_data,
+                production_prediction=y_pred, window_values=window_values, features=self.latest_features
+            )
+            # Step 7: Save the prediction and updated database to access in the UI application
+            with tracer.span('pipeline.save_data'):
+                self.data_manager.save_predictions(df_pred, current_timestamp)
+                # Appended to the last part of the database, without rewriting the history
+                self.data_manager.append_to_parquet(data=current_real_time_data, path=self.prod_data_path)
+
+            # Step 8: Checkpoint the production state
+            with tracer.span('pipeline.checkpoint'):
+                self.checkpoint(current_timestamp)
+        return
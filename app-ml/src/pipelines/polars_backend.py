@@ -0,0 +1,138 @@
+from typing import Dict, Any, Callable, List, Optional
+
+import pandas as pd
+
+try:
+    import polars as pl
+except ImportError:  # optional dependency, only needed with pipeline_runner.training_backend: polars
+    pl = None
+
+from common.data_manager import DataManager
+from pipelines.feature_engineering import FeatureEngineeringPipeline
+
+
+class PolarsFeaturePipeline:
+    """
+    Polars implementation of the preprocessing and feature engineering of the training data.
+
+    The production database is scanned lazily, so that only the needed rows and columns
+    are read from the parquet file, and preprocessing, lag features and window features
+    run as one multi-threaded query. The output has the columns, dtypes and values of
+    `PreprocessingPipeline` followed by `FeatureEngineeringPipeline` on pandas (for data
+    without missing values). Rolling sums round differently in polars, so rolling means,
+    standard deviations and EWMs are computed by the pandas functions within the query.
+
+    Args:
+        config (Dict[str, Any]): Application configuration.
+
+    Raises:
+        ImportError: If polars is not installed.
+    """
+    def __init__(self, config: Dict[str, Any]):
+        if pl is None:
+            raise ImportError("The polars training backend requires the polars package (pip install polars)")
+        self.preprocessing_config = config['preprocessing']
+        self.feature_engineering_config = config['feature_engineering']
+
+    def preprocess(self, lf: 'pl.LazyFrame') -> 'pl.LazyFrame':
+        """
+        Rename and drop columns (see `PreprocessingPipeline`).
+
+        Args:
+            lf (pl.LazyFrame): Raw rows.
+
+        Returns:
+            pl.LazyFrame: Preprocessed rows.
+        """
+        lf = lf.rename(self.preprocessing_config['column_mapping'], strict=False)
+        return lf.drop(self.preprocessing_config['drop_columns'])
+
+    @staticmethod
+    def lag_expressions(lag_params: Dict[str, List[int]]) -> List['pl.Expr']:
+        """
+        Lag features (see `FeatureEngineeringPipeline.add_lag_feats`): shifted and back-filled,
+        as float64 like the NaN-filled pandas columns.
+
+        Args:
+            lag_params (Dict[str, List[int]]): Feature -> lags.
+
+        Returns:
+            List[pl.Expr]: One expression per lag column.
+        """
+        return [
+            pl.col(feat).shift(lag).fill_null(strategy='backward').cast(pl.Float64)
+            .alias(FeatureEngineeringPipeline.lag_column(feat, lag))
+            for feat, lags in lag_params.items() for lag in lags
+        ]
+
+    @staticmethod
+    def window_expressions(window_params: Optional[Dict[str, Dict[str, Any]]]) -> List['pl.Expr']:
+        """
+        Window features (see `FeatureEngineeringPipeline.add_window_feats`). Rolling minimums
+        and maximums are native; means, standard deviations and EWMs call the pandas
+        implementation on the column, for bit-identical values.
+
+        Args:
+            window_params (Optional[Dict[str, Dict[str, Any]]]): Window features per feature.
+
+        Returns:
+            List[pl.Expr]: One expression per window column, in the pandas column order.
+        """
+        expressions = []
+        for feat, spec in (window_params or {}).items():
+            column = pl.col(feat).cast(pl.Float64)
+            for window in spec.get('windows', []):
+                for stat in spec.get('stats', ['mean']):
+                    if stat in ('min', 'max'):
+                        expression = getattr(column, f'rolling_{stat}')(window, min_samples=1)
+                    else:
+                        expression = PolarsFeaturePipeline.pandas_expression(
+                            column, lambda values, window=window, stat=stat: (
+                                values.rolling(window, min_periods=1).std(ddof=0) if stat == 'std'
+                                else getattr(values.rolling(window, min_periods=1), stat)()
+                            )
+                        )
+                    expressions.append(expression.alias(FeatureEngineeringPipeline.rolling_column(feat, window, stat)))
+            for span in spec.get('ewm_spans', []):
+                expression = PolarsFeaturePipeline.pandas_expression(
+                    column, lambda values, span=span: values.ewm(span=span, adjust=False).mean()
+                )
+                expressions.append(expression.alias(FeatureEngineeringPipeline.ewm_column(feat, span)))
+        return expressions
+
+    @staticmethod
+    def pandas_expression(column: 'pl.Expr', function: Callable[[pd.Series], pd.Series]) -> 'pl.Expr':
+        """
+        Expression applying a pandas function to a whole float64 column.
+
+        Args:
+            column (pl.Expr): Input column.
+            function (Callable[[pd.Series], pd.Series]): Pandas function.
+
+        Returns:
+            pl.Expr: Output column.
+        """
+        return column.map_batches(
+            lambda series: pl.Series(function(pd.Series(series.to_numpy())).to_numpy()),
+            return_dtype=pl.Float64
+        )
+
+    def run(self, path: str, lag_params: Dict[str, List[int]], n_last: Optional[int] = None) -> pd.DataFrame:
+        """
+        Read, preprocess and feature-engineer the production database.
+
+        Args:
+            path (str): Production database (parquet dataset folder or file).
+            lag_params (Dict[str, List[int]]): Lags to compute.
+            n_last (Optional[int]): Only use the last `n_last` rows.
+
+        Returns:
+            pd.DataFrame: Feature-engineered rows.
+        """
+        lf = pl.scan_parquet(DataManager.list_parts(path))
+        if n_last is not None:
+            lf = lf.tail(n_last)
+        lf = self.preprocess(lf)
+        lf = lf.with_columns(self.lag_expressions(lag_params))
+        lf = lf.with_columns(self.window_expressions(self.feature_engineering_config.get('window_params')))
+        return lf.collect().to_pandas()
@@ -1,6 +1,6 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import pandas as pd
-from common.utils import save_model
+from common.utils import save_model, save_model_metadata, serving_model_path
 
 
 class PostprocessingPipeline:
@@ -21,18 +21,38 @@ class PostprocessingPipeline:
         """
         self.config = config
 
-    def run_train(self, model: Any) -> None:
+    def run_train(self, model: Any, metadata: Optional[Dict[str, Any]] = None) -> None:
         """
         Save the trained model to the file path specified in the config.
 
         Args:
             model (Any): Trained machine learning model.
+            metadata (Optional[Dict[str, Any]]): Metadata saved next to the model,
+                e.g. the last training timestamp used by incremental training.
 
         Returns:
             None
         """
         model_path = self.config['pipeline_runner']['model_path']
         save_model(model, base_path=model_path)
+        if metadata is not None:
+            save_model_metadata(metadata, base_path=model_path)
+
+    def run_serving(self, model: Any, metadata: Dict[str, Any]) -> None:
+        """
+        Save the latency budget serving model next to the model file specified in the config.
+
+        Args:
+            model (Any): Serving model.
+            metadata (Dict[str, Any]): Metadata of the serving model, with the content hash
+                of the model it was derived from ('full_model_version').
+
+        Returns:
+            None
+        """
+        model_path = serving_model_path(self.config['pipeline_runner']['model_path'])
+        save_model(model, base_path=model_path)
+        save_model_metadata(metadata, base_path=model_path)
 
     def run_inference(self, y_pred: float, current_timestamp: pd.Timestamp) -> pd.DataFrame:
         """
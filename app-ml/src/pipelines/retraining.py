@@ -0,0 +1,156 @@
+import os
+import copy
+import shutil
+import threading
+import multiprocessing as mp
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, Future
+from typing import Dict, Any, Callable, Optional
+
+import pandas as pd
+
+from common.data_manager import DataManager
+from common.model_registry import ModelRegistry
+from common.utils import load_model_metadata, get_model_version, setup_logger
+
+logger = setup_logger(__name__)
+
+
+def _lower_priority(niceness: int) -> None:
+    # Training shares the machine with the inference service, let the service run first
+    try:
+        os.nice(niceness)
+    except OSError:
+        pass
+
+
+def train_model_version(config: Dict[str, Any], version: str, incremental: bool) -> Optional[Dict[str, Any]]:
+    """
+    Train a model into its version folder, without touching the production model.
+    Runs in the retraining worker process.
+
+    Args:
+        config (Dict[str, Any]): Application configuration.
+        version (str): Version the model is saved as.
+        incremental (bool): Continue the production model on the new rows (falls back to full training).
+
+    Returns:
+        Optional[Dict[str, Any]]: Metadata of the trained model, None if the production
+        model is kept (too few new rows for incremental training).
+    """
+    from pipelines.pipeline_runner import PipelineRunner
+
+    registry = ModelRegistry(config)
+    version_path = registry.version_model_path(version)
+    Path(version_path).parent.mkdir(parents=True, exist_ok=True)
+
+    # Incremental training starts from a copy of the production model and its metadata
+    for suffix in ModelRegistry.MODEL_SUFFIXES:
+        source = registry.model_path.with_suffix(suffix)
+        if incremental and source.exists():
+            shutil.copyfile(source, Path(version_path).with_suffix(suffix))
+
+    version_config = copy.deepcopy(config)
+    version_config['pipeline_runner']['model_path'] = version_path
+    try:
+        pipeline_runner = PipelineRunner(config=version_config, data_manager=DataManager(version_config))
+        pipeline_runner.run_training(incremental=incremental)
+    except Exception:
+        shutil.rmtree(Path(version_path).parent, ignore_errors=True)
+        raise
+
+    if get_model_version(version_path) == get_model_version(str(registry.model_path)):
+        shutil.rmtree(Path(version_path).parent)
+        return None
+    registry.tag(version, {'version': version})
+    return load_model_metadata(version_path)
+
+
+class RetrainingScheduler:
+    """
+    Retrains the model in a background process, periodically or on demand, and hands
+    each new version to a callback (e.g. to activate it and swap it into the service).
+
+    At most one training runs at a time. The worker process runs at a lower CPU
+    priority, so that serving latency is not affected by the training.
+
+    Args:
+        config (Dict[str, Any]): Application configuration with an 'inference_api.retraining' section.
+        on_new_version (Callable[[str, Dict[str, Any]], None]): Called with the version and
+            its metadata when a training produced a new model.
+
+    Attributes:
+        status (Dict[str, Any]): State of the last training ('idle', 'running', 'succeeded',
+            'up_to_date' if the production model was kept, 'failed'),
+            its version, start and end time, and error.
+    """
+    def __init__(self, config: Dict[str, Any], on_new_version: Callable[[str, Dict[str, Any]], None]):
+        self.config = config
+        self.retraining_config = config.get('inference_api', {}).get('retraining', {})
+        self.on_new_version = on_new_version
+        self.status: Dict[str, Any] = {'state': 'idle'}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._future: Optional[Future] = None
+        self._executor = ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=mp.get_context('spawn'),
+            initializer=_lower_priority,
+            initargs=(self.retraining_config.get('niceness', 10),)
+        )
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'RetrainingScheduler':
+        """Start the periodic retraining thread (every 'interval_s' seconds)."""
+        self._thread = threading.Thread(target=self._run_periodically, daemon=True)
+        self._thread.start()
+        return self
+
+    def _run_periodically(self) -> None:
+        while not self._stop.wait(self.retraining_config.get('interval_s', 86400)):
+            self.trigger()
+
+    def trigger(self, incremental: Optional[bool] = None) -> bool:
+        """
+        Start a training in the background process.
+
+        Args:
+            incremental (Optional[bool]): Incremental training (defaults to 'retraining.incremental').
+
+        Returns:
+            bool: False if a training is already running.
+        """
+        if incremental is None:
+            incremental = self.retraining_config.get('incremental', True)
+        with self._lock:
+            if self._future is not None and not self._future.done():
+                return False
+            version = ModelRegistry.new_version()
+            self.status = {
+                'state': 'running',
+                'version': version,
+                'incremental': incremental,
+                'started_at': str(pd.Timestamp.now()),
+            }
+            self._future = self._executor.submit(train_model_version, self.config, version, incremental)
+            self._future.add_done_callback(lambda future: self._on_done(version, future))
+        return True
+
+    def _on_done(self, version: str, future: Future) -> None:
+        status = {**self.status, 'finished_at': str(pd.Timestamp.now())}
+        try:
+            metadata = future.result()
+            if metadata is None:
+                status['state'] = 'up_to_date'
+            else:
+                self.on_new_version(version, metadata)
+                status['state'] = 'succeeded'
+        except Exception as e:
+            logger.exception(f"Retraining failed: {e}")
+            status.update({'state': 'failed', 'error': str(e)})
+        self.status = status
+
+    def stop(self) -> None:
+        """Stop the periodic thread and the background process."""
+        self._stop.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,248 @@
+import os
+import copy
+import json
+import time
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, List
+
+import pandas as pd
+
+from common.utils import save_model, save_model_metadata, setup_logger
+from pipelines.preprocessing import PreprocessingPipeline
+from pipelines.feature_engineering import FeatureEngineeringPipeline
+from pipelines.training import TrainingPipeline
+
+logger = setup_logger(__name__)
+
+
+def _limit_threads(n_threads: int) -> None:
+    # Native libraries of the worker must not use more than its share of the cores
+    for variable in ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS'):
+        os.environ[variable] = str(n_threads)
+
+
+def train_series_model(config: Dict[str, Any], name: str, frames: List[pd.DataFrame], model_path: str) -> Dict[str, Any]:
+    """
+    Train and save the model of one series (or cluster of series). Runs in a worker process.
+
+    Each series is preprocessed and feature-engineered on its own, so that lag features
+    never mix rows of different series, and the series of a cluster are then concatenated.
+    The validation split and the recency weights are taken per series, so every member
+    of a cluster is validated on its latest rows and weighted from its own latest row.
+
+    Args:
+        config (Dict[str, Any]): Configuration of the worker (thread limits applied).
+        name (str): Series or cluster name.
+        frames (List[pd.DataFrame]): Raw rows of each series of the cluster, in time order.
+        model_path (str): Path (without extension) the model is saved to.
+
+    Returns:
+        Dict[str, Any]: Training summary of the series.
+    """
+    start = time.perf_counter()
+    preprocessing_pipeline = PreprocessingPipeline(config=config)
+    feature_eng_pipeline = FeatureEngineeringPipeline(config=config)
+    training_pipeline = TrainingPipeline(config=config)
+
+    x_trains, x_tests, y_trains, y_tests = [], [], [], []
+    for df in frames:
+        df = feature_eng_pipeline.run(
+            df=preprocessing_pipeline.run(df=df.reset_index(drop=True)),
+            lag_params=training_pipeline.get_feature_lag_params()
+        )
+        x_train, x_test, y_train, y_test = training_pipeline.prepare_dataset(df)
+        x_trains.append(x_train)
+        x_tests.append(x_test)
+        y_trains.append(y_train)
+        y_tests.append(y_test)
+
+    # Validation rows and recency weights are taken per series, not from the last series only
+    model, study = training_pipeline.tune_hyperparams(
+        pd.concat(x_trains, ignore_index=True), pd.concat(y_trains, ignore_index=True),
+        pd.concat(x_tests, ignore_index=True), pd.concat(y_tests, ignore_index=True),
+        series_sizes=[(len(x_train), len(x_test)) for x_train, x_test in zip(x_trains, x_tests)]
+    )
+    os.makedirs(os.path.dirname(model_path), exist_ok=True)
+    save_model(model, base_path=model_path)
+
+    summary = {
+        'series': name,
+        'status': 'succeeded',
+        'n_series': len(frames),
+        'n_rows': int(sum(len(df) for df in frames)),
+        'validation_rmse': float(study.best_value),
+        'lag_params': training_pipeline.selected_lag_params,
+        'model_path': model_path,
+        'duration_s': time.perf_counter() - start,
+    }
+    save_model_metadata(summary, base_path=model_path)
+    return summary
+
+
+class SeriesTrainer:
+    """
+    Trains one model per series (e.g. per station), or per configured cluster of series,
+    in parallel worker processes.
+
+    Each worker trains one series at a time with at most `threads_per_worker` CatBoost
+    threads. A failing series is reported and does not stop the others; series lost with
+    a crashed worker process are retried one at a time in new single-worker pools.
+
+    Args:
+        config (Dict[str, Any]): Application configuration with a 'training.per_series' section.
+
+    Attributes:
+        series_key (str): Column identifying the series in the production database.
+        models_folder (str): Folder of the series models ('<models_folder>/<series>/latest_model').
+        n_workers (int): Number of worker processes.
+        threads_per_worker (int): CatBoost threads per worker.
+        clusters (Dict[str, List[Any]]): Cluster name -> series trained together in one model.
+    """
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        series_config = config['training'].get('per_series', {})
+        self.series_key: str = series_config.get('series_key', 'station_id')
+        self.models_folder: str = series_config.get('models_folder', 'models/prod/series/')
+        self.n_workers: int = max(1, series_config.get('n_workers') or os.cpu_count() or 1)
+        self.threads_per_worker: int = max(1, series_config.get('threads_per_worker', 1))
+        self.clusters: Dict[str, List[Any]] = series_config.get('clusters') or {}
+        self.max_attempts: int = series_config.get('max_attempts', 2)
+
+    def worker_config(self) -> Dict[str, Any]:
+        """
+        Configuration used in the workers: sequential Optuna trials limited to the
+        worker's threads, and in-memory studies (many workers would contend for the
+        SQLite study storage).
+
+        Returns:
+            Dict[str, Any]: Worker configuration.
+        """
+        config = copy.deepcopy(self.config)
+        optuna_config = config['training'].setdefault('optuna', {})
+        optuna_config['parallel'] = {'n_workers': 1, 'cpu_budget': self.threads_per_worker}
+        optuna_config.setdefault('storage', {})['enabled'] = False
+        config['training'].setdefault('pool', {})['save_quantized'] = False
+        return config
+
+    def partition(self, df: pd.DataFrame) -> Dict[str, List[pd.DataFrame]]:
+        """
+        Split the data into the training tasks: one per cluster, and one per series
+        not assigned to a cluster.
+
+        Args:
+            df (pd.DataFrame): Raw data of all series.
+
+        Returns:
+            Dict[str, List[pd.DataFrame]]: Task name -> rows of each series of the task.
+        """
+        series = {key: rows.drop(columns=[self.series_key]) for key, rows in df.groupby(self.series_key, sort=True)}
+        tasks: Dict[str, List[pd.DataFrame]] = {}
+        clustered = set()
+        for cluster, members in self.clusters.items():
+            frames = [series[member] for member in members if member in series]
+            if frames:
+                tasks[f"cluster_{cluster}"] = frames
+            clustered.update(members)
+        for key, rows in series.items():
+            if key not in clustered:
+                tasks[f"{self.series_key}_{key}"] = [rows]
+        return tasks
+
+    def model_path(self, name: str) -> str:
+        """Model path (without extension) of a series or cluster."""
+        return os.path.join(self.models_folder, name, 'latest_model')
+
+    def run(self, df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+        """
+        Train all the series models.
+
+        Args:
+            df (pd.DataFrame): Raw data of all series.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Task name -> training summary ('status' is 'succeeded' or 'failed').
+        """
+        tasks = self.partition(df)
+        results: Dict[str, Dict[str, Any]] = {}
+        start = time.perf_counter()
+        logger.info(f"Training {len(tasks)} series models with {self.n_workers} workers "
+                    f"({self.threads_per_worker} threads each)")
+
+        crashed = self.train_in_pool(tasks, list(tasks), self.n_workers, results, start)
+        # A crashed pool loses all its unfinished series: retry them one at a time, so that
+        # only a series which crashes its own worker fails
+        if crashed:
+            logger.warning(f"A worker process crashed, retrying {len(crashed)} series one at a time")
+        for name in crashed:
+            for _ in range(1, self.max_attempts):
+                if not self.train_in_pool(tasks, [name], 1, results, start):
+                    break
+            else:
+                results[name] = {'series': name, 'status': 'failed', 'error': 'the worker process crashed'}
+                logger.warning(f"[{len(results)}/{len(tasks)}] {name}: failed (the worker process crashed)")
+        self.save_summary(results)
+        return results
+
+    def train_in_pool(
+        self,
+        tasks: Dict[str, List[pd.DataFrame]],
+        names: List[str],
+        n_workers: int,
+        results: Dict[str, Dict[str, Any]],
+        start: float
+    ) -> List[str]:
+        """
+        Train series models in a new pool of worker processes.
+
+        Args:
+            tasks (Dict[str, List[pd.DataFrame]]): Output of `partition`.
+            names (List[str]): Tasks to train.
+            n_workers (int): Maximum number of worker processes.
+            results (Dict[str, Dict[str, Any]]): Summaries of the finished tasks, filled in place.
+            start (float): Start time of the training of all series, for progress messages.
+
+        Returns:
+            List[str]: Tasks lost with a crashed worker process (none if the pool did not crash).
+        """
+        worker_config = self.worker_config()
+        crashed = []
+        with ProcessPoolExecutor(
+            max_workers=min(n_workers, len(names)) or 1,
+            mp_context=mp.get_context('spawn'),
+            initializer=_limit_threads,
+            initargs=(self.threads_per_worker,)
+        ) as executor:
+            futures = {
+                executor.submit(train_series_model, worker_config, name, tasks[name], self.model_path(name)): name
+                for name in names
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    results[name] = future.result()
+                except BrokenProcessPool:
+                    crashed.append(name)
+                    continue
+                except Exception as e:
+                    results[name] = {'series': name, 'status': 'failed', 'error': f"{type(e).__name__}: {e}"}
+                    logger.exception(f"Training of series {name} failed")
+                status = results[name]['status']
+                logger.info(f"[{len(results)}/{len(tasks)}] {name}: {status} "
+                            f"({time.perf_counter() - start:.1f}s elapsed)")
+        return crashed
+
+    def save_summary(self, results: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Write the training summary of all series to '<models_folder>/summary.json'.
+
+        Args:
+            results (Dict[str, Dict[str, Any]]): Output of `run`.
+
+        Returns:
+            None
+        """
+        os.makedirs(self.models_folder, exist_ok=True)
+        with open(os.path.join(self.models_folder, 'summary.json'), 'w') as f:
+            json.dump(results, f, indent=2, default=str)
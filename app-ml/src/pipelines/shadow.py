@@ -0,0 +1,244 @@
+import os
+import threading
+import numpy as np
+import pandas as pd
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+
+from common.data_manager import DataManager
+from common.utils import load_model, load_model_metadata, setup_logger
+from pipelines.preprocessing import PreprocessingPipeline
+from pipelines.feature_engineering import FeatureEngineeringPipeline
+
+logger = setup_logger(__name__)
+
+
+class ShadowScorer:
+    """
+    Candidate models scored on live traffic next to the production model.
+
+    Every inference tick hands its batch to a background thread, off the response path.
+    There the features of the batch are built once for all shadow models: the
+    precomputed feature store row if it has their features, otherwise one run of the
+    preprocessing and feature engineering with the union of their lags. Each shadow
+    model predicts the next point from its columns of that matrix. The predictions
+    (and the production one) are buffered and appended to a parquet file, and compared
+    online against the actual value when its row is appended at a later tick.
+
+    Args:
+        config (Dict[str, Any]): Application configuration with a 'shadow' section.
+
+    Attributes:
+        enabled (bool): Whether shadow models are configured and scored.
+        model_paths (Dict[str, str]): Shadow model name -> model path without extension.
+        predictions_path (str): Parquet dataset the predictions are appended to.
+    """
+    PRODUCTION = 'production'
+
+    def __init__(self, config: Dict[str, Any]):
+        shadow_config = config.get('shadow', {})
+        self.model_paths: Dict[str, str] = dict(shadow_config.get('models') or {})
+        self.enabled: bool = shadow_config.get('enabled', False) and bool(self.model_paths)
+        self.predictions_path: str = shadow_config.get('predictions_path', './data/shadow/predictions.parquet')
+        self.flush_every: int = max(1, shadow_config.get('flush_every_n_ticks', 24))
+        target_column = config['training']['target_params']['target_column']
+        self.actual_column: str = {
+            new: old for old, new in config['preprocessing']['column_mapping'].items()
+        }.get(target_column, target_column)
+
+        self.preprocessing_pipeline = PreprocessingPipeline(config=config)
+        self.feature_eng_pipeline = FeatureEngineeringPipeline(config=config)
+        self._models: Optional[Dict[str, Tuple[Any, Optional[Dict[str, Any]]]]] = None
+        # Prediction time -> model -> prediction, until the actual value is appended
+        self._pending: Dict[pd.Timestamp, Dict[str, float]] = {}
+        # Model -> [number of compared predictions, sum of absolute errors, sum of squared errors]
+        self._errors: Dict[str, List[float]] = {}
+        self._buffer: List[Dict[str, Any]] = []
+        self._n_buffered_ticks = 0
+        self._incompatible = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='shadow') if self.enabled else None
+
+    def load_models(self) -> Dict[str, Tuple[Any, Optional[Dict[str, Any]]]]:
+        """
+        Shadow models and their metadata, loaded on first use.
+
+        Returns:
+            Dict[str, Tuple[Any, Optional[Dict[str, Any]]]]: Name -> (model, metadata).
+        """
+        if self._models is None:
+            self._models = {
+                name: (load_model(path), load_model_metadata(path)) for name, path in self.model_paths.items()
+            }
+        return self._models
+
+    def submit(
+        self,
+        prediction_time: pd.Timestamp,
+        raw_batch: pd.DataFrame,
+        new_rows: pd.DataFrame,
+        production_prediction: float,
+        window_values: Optional[np.ndarray] = None,
+        features: Optional[pd.DataFrame] = None
+    ) -> Optional[Future]:
+        """
+        Queue the scoring of a tick; returns immediately.
+
+        Args:
+            prediction_time (pd.Timestamp): Time of the predicted point.
+            raw_batch (pd.DataFrame): Raw rows of the latest batch (not modified afterwards).
+            new_rows (pd.DataFrame): Raw rows appended at this tick, with the actual values.
+            production_prediction (float): Prediction of the production model.
+            window_values (Optional[np.ndarray]): Window features of the batch rows.
+            features (Optional[pd.DataFrame]): Precomputed features of the latest rows (feature store).
+
+        Returns:
+            Optional[Future]: Future of the predictions per model, None if shadow scoring is disabled.
+        """
+        if not self.enabled:
+            return None
+        return self._executor.submit(
+            self._score_safely, prediction_time, raw_batch, new_rows, production_prediction, window_values, features
+        )
+
+    def _score_safely(self, *args: Any) -> Optional[Dict[str, float]]:
+        # Shadow models must never disturb production, failures are only reported
+        try:
+            return self.score(*args)
+        except Exception as e:
+            logger.warning(f"Shadow scoring failed: {e!r}")
+            return None
+
+    def get_features(
+        self,
+        raw_batch: pd.DataFrame,
+        window_values: Optional[np.ndarray],
+        features: Optional[pd.DataFrame]
+    ) -> pd.DataFrame:
+        """
+        Feature matrix shared by the shadow models.
+
+        Args:
+            raw_batch (pd.DataFrame): Raw rows of the latest batch.
+            window_values (Optional[np.ndarray]): Window features of the batch rows.
+            features (Optional[pd.DataFrame]): Precomputed features of the latest rows.
+
+        Returns:
+            pd.DataFrame: Features with the columns of all shadow models.
+        """
+        models = self.load_models()
+        needed = {
+            feature for name, (model, _) in models.items() if name not in self._incompatible
+            for feature in model.feature_names_
+        }
+        if features is not None and needed.issubset(features.columns):
+            return features
+        lag_params = FeatureEngineeringPipeline.merge_lag_params(
+            *[(metadata or {}).get('lag_params') or self.feature_eng_pipeline.config['lag_params']
+              for _, metadata in models.values()]
+        )
+        df = self.preprocessing_pipeline.run(df=raw_batch.copy())
+        return self.feature_eng_pipeline.run(df=df, lag_params=lag_params, window_values=window_values)
+
+    def score(
+        self,
+        prediction_time: pd.Timestamp,
+        raw_batch: pd.DataFrame,
+        new_rows: pd.DataFrame,
+        production_prediction: float,
+        window_values: Optional[np.ndarray] = None,
+        features: Optional[pd.DataFrame] = None
+    ) -> Dict[str, float]:
+        """
+        Compare the pending predictions with the new actual values, then score the shadow
+        models on the features of the batch (see `submit` for the arguments).
+
+        Returns:
+            Dict[str, float]: Prediction per model, including the production model.
+        """
+        self.update_actuals(new_rows)
+        x = self.get_features(raw_batch, window_values, features)
+        predictions = {self.PRODUCTION: float(production_prediction)}
+        for name, (model, _) in self.load_models().items():
+            missing = [feature for feature in model.feature_names_ if feature not in x.columns]
+            if missing:
+                # E.g. a model trained on other features than the configured ones
+                if name not in self._incompatible:
+                    logger.warning(f"Shadow model {name} is not scored, missing features: {missing}")
+                    self._incompatible.add(name)
+                continue
+            predictions[name] = float(model.predict(x[model.feature_names_].iloc[-1:])[0])
+
+        with self._lock:
+            self._pending[pd.Timestamp(prediction_time)] = predictions
+            self._buffer.extend(
+                {'datetime': str(prediction_time), 'model': name, 'prediction': prediction}
+                for name, prediction in predictions.items()
+            )
+            self._n_buffered_ticks += 1
+            flush = self._n_buffered_ticks >= self.flush_every
+        if flush:
+            self.flush()
+        return predictions
+
+    def update_actuals(self, new_rows: pd.DataFrame) -> None:
+        """
+        Update the online errors of the pending predictions of the appended rows.
+
+        Args:
+            new_rows (pd.DataFrame): Raw appended rows ('datetime' and the target column).
+
+        Returns:
+            None
+        """
+        with self._lock:
+            for timestamp, actual in zip(pd.to_datetime(new_rows['datetime']), new_rows[self.actual_column]):
+                for name, prediction in self._pending.pop(timestamp, {}).items():
+                    errors = self._errors.setdefault(name, [0, 0.0, 0.0])
+                    errors[0] += 1
+                    errors[1] += abs(prediction - actual)
+                    errors[2] += (prediction - actual) ** 2
+            # Predictions whose actual value was skipped are not compared
+            if len(new_rows):
+                last_timestamp = pd.to_datetime(new_rows['datetime']).max()
+                self._pending = {timestamp: p for timestamp, p in self._pending.items() if timestamp > last_timestamp}
+
+    def get_metrics(self) -> Dict[str, Dict[str, float]]:
+        """
+        Online comparison against the actual values.
+
+        Returns:
+            Dict[str, Dict[str, float]]: Model -> number of compared predictions, MAE and RMSE.
+        """
+        with self._lock:
+            return {
+                name: {'n': n, 'mae': abs_sum / n, 'rmse': float(np.sqrt(squared_sum / n))}
+                for name, (n, abs_sum, squared_sum) in self._errors.items() if n
+            }
+
+    def flush(self) -> None:
+        """
+        Append the buffered predictions to the predictions file.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            rows, self._buffer, self._n_buffered_ticks = self._buffer, [], 0
+        if not rows:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.predictions_path)), exist_ok=True)
+        DataManager.append_to_parquet(pd.DataFrame(rows), self.predictions_path)
+
+    def close(self) -> None:
+        """
+        Wait for the queued ticks and flush their predictions. No tick is scored afterwards.
+
+        Returns:
+            None
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+            self.enabled = False
+            self.flush()
@@ -0,0 +1,246 @@
+import os
+import copy
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Tuple
+
+from common.utils import read_config, setup_logger
+from common.data_manager import DataManager
+from pipelines.pipeline_runner import PipelineRunner
+
+logger = setup_logger(__name__)
+
+
+def merge_config(base: Dict[str, Any], overrides: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Copy of a configuration with nested overrides applied.
+
+    Args:
+        base (Dict[str, Any]): Configuration.
+        overrides (Dict[str, Any]): Values replacing the ones of `base`; nested sections are merged.
+
+    Returns:
+        Dict[str, Any]: Merged configuration (`base` is left unchanged).
+    """
+    merged = copy.deepcopy(base)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_config(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+class _Tenant:
+    """Loaded tenant: its pipeline runner, the lock serializing its requests and its memory estimate."""
+    def __init__(self, runner: PipelineRunner, n_bytes: int):
+        self.runner = runner
+        self.n_bytes = n_bytes
+        self.lock = threading.Lock()
+        self.closed = False
+
+
+class TenantPool:
+    """
+    Pipeline runners of several tenants (e.g. cities) served by one process.
+
+    Each tenant has its own configuration: the base configuration with the tenant's
+    overrides from 'tenants.cities' (inline, or the path of a YAML file of overrides).
+    Every tenant needs its own 'data_root' override, which relocates its data folders
+    (with the feature store kept in the production folder) and shadow predictions under
+    that folder, so tenants never share production files. A tenant's `PipelineRunner`
+    (production data, model, online state) is created on its first request, and the
+    loaded tenants are kept in least recently used order: when their estimated memory
+    exceeds 'tenants.memory_budget_mb', the least recently used ones are closed and
+    dropped, to be reloaded from their production files on their next request. The
+    requests of a tenant are processed one at a time, requests of different tenants
+    run concurrently.
+
+    Args:
+        config (Dict[str, Any]): Base application configuration with a 'tenants' section.
+
+    Attributes:
+        tenant_overrides (Dict[str, Any]): Tenant key -> configuration overrides (or their file).
+        memory_budget_bytes (int): Memory budget of the loaded tenants.
+    """
+    def __init__(self, config: Dict[str, Any]):
+        tenants_config = config.get('tenants', {})
+        self.config = config
+        self.tenant_overrides: Dict[str, Any] = dict(tenants_config.get('cities') or {})
+        self.memory_budget_bytes: int = int(tenants_config.get('memory_budget_mb', 1024) * 2 ** 20)
+
+        self._tenants: 'OrderedDict[str, _Tenant]' = OrderedDict()
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.n_loads = 0
+        self.n_evictions = 0
+
+    @property
+    def tenants(self) -> List[str]:
+        """Configured tenant keys."""
+        return list(self.tenant_overrides)
+
+    def get_tenant_config(self, tenant: str) -> Dict[str, Any]:
+        """
+        Configuration of a tenant.
+
+        Args:
+            tenant (str): Tenant key.
+
+        Returns:
+            Dict[str, Any]: Base configuration with the tenant's overrides.
+
+        Raises:
+            KeyError: If the tenant is not configured.
+            ValueError: If the tenant has no 'data_root', or its production folder is the
+                one of the default tenant (their production state would be shared).
+        """
+        overrides = self.tenant_overrides[tenant]
+        if isinstance(overrides, str):
+            overrides = read_config(overrides)
+        overrides = dict(overrides or {})
+        data_root = overrides.pop('data_root', None)
+        if data_root is None:
+            raise ValueError(f"Tenant {tenant} has no 'data_root' override")
+        config = merge_config(self.config, overrides)
+        config.pop('tenants', None)
+        config = DataManager.relocate_config(config, data_root)
+        prod_folder = self.config['data_manager']['prod_data_folder']
+        if os.path.abspath(config['data_manager']['prod_data_folder']) == os.path.abspath(prod_folder):
+            raise ValueError(f"The data_root of tenant {tenant} is the data folder of the default tenant")
+        config.setdefault('shadow', {})['predictions_path'] = os.path.join(data_root, 'shadow', 'predictions.parquet')
+        return config
+
+    def load(self, tenant: str) -> PipelineRunner:
+        """
+        Create the pipeline runner of a tenant, resuming its production state.
+
+        Args:
+            tenant (str): Tenant key.
+
+        Returns:
+            PipelineRunner: Runner of the tenant.
+        """
+        config = self.get_tenant_config(tenant)
+        data_manager = DataManager(config)
+        data_manager.prepare_prod_database()
+        return PipelineRunner(config=config, data_manager=data_manager)
+
+    @staticmethod
+    def estimate_bytes(runner: PipelineRunner) -> int:
+        """
+        Memory estimate of a loaded tenant: its in-memory data and its model file size.
+
+        Args:
+            runner (PipelineRunner): Runner of the tenant.
+
+        Returns:
+            int: Estimated bytes.
+        """
+        stats = runner.get_memory_stats()
+        model_path = runner.config['pipeline_runner']['model_path']
+        model_bytes = sum(
+            os.path.getsize(f"{model_path}{suffix}") for suffix in ('.cbm', '.pkl') if os.path.exists(f"{model_path}{suffix}")
+        )
+        return int(stats['database_bytes'] + stats['real_time_bytes'] + model_bytes)
+
+    def _acquire(self, tenant: str) -> _Tenant:
+        with self._lock:
+            if tenant not in self.tenant_overrides:
+                raise KeyError(f"Unknown tenant {tenant}")
+            if tenant in self._tenants:
+                self._tenants.move_to_end(tenant)
+                return self._tenants[tenant]
+            load_lock = self._load_locks.setdefault(tenant, threading.Lock())
+
+        # Tenants are loaded outside the pool lock, a tenant is loaded by one request only
+        with load_lock:
+            with self._lock:
+                if tenant in self._tenants:
+                    self._tenants.move_to_end(tenant)
+                    return self._tenants[tenant]
+            runner = self.load(tenant)
+            entry = _Tenant(runner, self.estimate_bytes(runner))
+            with self._lock:
+                self._tenants[tenant] = entry
+                self.n_loads += 1
+                evicted = self._select_evictions()
+        for name, evicted_entry in evicted:
+            self._close(name, evicted_entry)
+        return entry
+
+    def _select_evictions(self) -> List[Tuple[str, _Tenant]]:
+        # Least recently used first, the tenant loaded last is always kept
+        evicted = []
+        while len(self._tenants) > 1 and sum(entry.n_bytes for entry in self._tenants.values()) > self.memory_budget_bytes:
+            evicted.append(self._tenants.popitem(last=False))
+            self.n_evictions += 1
+        return evicted
+
+    @staticmethod
+    def _close(tenant: str, entry: _Tenant) -> None:
+        # Waits for the request of the tenant in progress, if any
+        with entry.lock:
+            entry.closed = True
+            entry.runner.close()
+        logger.info(f"Evicted tenant {tenant} ({entry.n_bytes / 2 ** 20:.1f} MB)")
+
+    @contextmanager
+    def use(self, tenant: str) -> Iterator[PipelineRunner]:
+        """
+        Runner of a tenant, loaded if needed, reserved for the caller within the context.
+
+        Args:
+            tenant (str): Tenant key.
+
+        Yields:
+            PipelineRunner: Runner of the tenant.
+
+        Raises:
+            KeyError: If the tenant is not configured.
+        """
+        while True:
+            entry = self._acquire(tenant)
+            with entry.lock:
+                # The tenant may have been evicted while waiting for its lock
+                if entry.closed:
+                    continue
+                yield entry.runner
+                entry.n_bytes = self.estimate_bytes(entry.runner)
+                return
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Gauges of the pool.
+
+        Returns:
+            Dict[str, float]: Loaded tenants, their estimated bytes, the memory budget, loads and evictions.
+        """
+        with self._lock:
+            return {
+                'tenants_loaded': len(self._tenants),
+                'tenants_bytes': sum(entry.n_bytes for entry in self._tenants.values()),
+                'tenants_budget_bytes': self.memory_budget_bytes,
+                'tenants_loads': self.n_loads,
+                'tenants_evictions': self.n_evictions,
+            }
+
+    def loaded_tenants(self) -> List[str]:
+        """Loaded tenant keys, least recently used first."""
+        with self._lock:
+            return list(self._tenants)
+
+    def close(self) -> None:
+        """
+        Close all loaded tenants.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            tenants, self._tenants = list(self._tenants.items()), OrderedDict()
+        for _, entry in tenants:
+            with entry.lock:
+                entry.closed = True
+                entry.runner.close()
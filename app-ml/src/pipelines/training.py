@@ -1,9 +1,266 @@
+import os
+import hashlib
+import json
 import pandas as pd
 import numpy as np
 import optuna
-from typing import Dict, Tuple, Any
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from multiprocessing import shared_memory
+from typing import Callable, Dict, Tuple, Any, List, Optional
 from sklearn.metrics import mean_squared_error
-from catboost import CatBoostRegressor
+from catboost import CatBoostRegressor, Pool
+from common.utils import setup_logger
+from pipelines.feature_engineering import FeatureEngineeringPipeline
+
+logger = setup_logger(__name__)
+
+
+def build_pool(
+    x: pd.DataFrame,
+    y: pd.Series,
+    weight: Optional[Any] = None,
+    quantize: bool = False,
+    border_count: Optional[int] = None,
+    cache_path: Optional[str] = None
+) -> Pool:
+    """
+    Build a CatBoost Pool, optionally quantized once so that several fits on it
+    do not repeat the data conversion and feature quantization.
+
+    Args:
+        x (pd.DataFrame): Features.
+        y (pd.Series): Targets.
+        weight (Optional[Any]): Sample weights.
+        quantize (bool): Whether to quantize the pool.
+        border_count (Optional[int]): Number of borders per feature (CatBoost default if None).
+        cache_path (Optional[str]): File the quantized pool is saved to and loaded from, if given.
+
+    Returns:
+        Pool: The (quantized) pool.
+    """
+    if quantize and cache_path is not None and os.path.exists(cache_path):
+        return Pool(f"quantized://{cache_path}")
+
+    pool = Pool(x, y, weight=weight)
+    if quantize:
+        pool.quantize(**({'border_count': border_count} if border_count else {}))
+        if cache_path is not None:
+            os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            pool.save(tmp_path)
+            os.replace(tmp_path, cache_path)
+    return pool
+
+
+def fit_and_evaluate(
+    params: Dict[str, Any],
+    train_pool: Pool,
+    val_pool: Pool,
+    early_stopping_rounds: int,
+    callbacks: Optional[List[Any]] = None
+) -> Tuple[float, int]:
+    """
+    Train a CatBoost model with early stopping on the validation set and evaluate it.
+
+    Args:
+        params (Dict[str, Any]): CatBoost parameters.
+        train_pool (Pool): Training data, possibly quantized.
+        val_pool (Pool): Validation data (not quantized, or quantized with the training borders).
+        early_stopping_rounds (int): Early stopping patience.
+        callbacks (Optional[List[Any]]): CatBoost callbacks, e.g. a `CatBoostPruningCallback`.
+
+    Returns:
+        Tuple containing:
+            - Validation RMSE
+            - Best iteration
+
+    Raises:
+        optuna.TrialPruned: If a pruning callback stopped the training.
+    """
+    model = CatBoostRegressor(**params, random_seed=42, allow_writing_files=False)
+    model.fit(
+        train_pool,
+        eval_set=val_pool,
+        early_stopping_rounds=early_stopping_rounds,
+        use_best_model=True,
+        verbose=False,
+        callbacks=callbacks
+    )
+    for callback in callbacks or []:
+        if getattr(callback, 'pruned', False):
+            raise optuna.TrialPruned(f"Trial pruned at iteration {callback.pruned_iteration}")
+    preds = model.predict(val_pool)
+    # Labels of a pool loaded from a file are returned as strings
+    rmse = np.sqrt(mean_squared_error(np.asarray(val_pool.get_label(), dtype=np.float64), preds))
+    return rmse, model.get_best_iteration()
+
+
+class CatBoostPruningCallback:
+    """
+    CatBoost callback reporting the validation loss to an Optuna trial during
+    training, and stopping the training when the trial's pruner decides to prune it.
+
+    The boosting iteration is the trial's resource (step): a pruned trial only
+    spends the iterations it trained before the pruner stopped it.
+
+    Args:
+        trial (optuna.Trial): Trial the intermediate values are reported to.
+        metric (str): Validation metric to report, e.g. 'RMSE'.
+        report_every (int): Report (and check for pruning) every `report_every` iterations.
+    """
+    def __init__(self, trial: optuna.Trial, metric: str = 'RMSE', report_every: int = 1):
+        self.trial = trial
+        self.metric = metric
+        self.report_every = max(1, report_every)
+        self.pruned = False
+        self.pruned_iteration: Optional[int] = None
+
+    def after_iteration(self, info: Any) -> bool:
+        step = info.iteration
+        if step % self.report_every != 0:
+            return True
+        validation = info.metrics.get('validation', {})
+        values = validation.get(self.metric) or next(iter(validation.values()), None)
+        if not values:
+            return True
+        self.trial.report(values[-1], step=step)
+        if self.trial.should_prune():
+            self.pruned = True
+            self.pruned_iteration = step
+            return False
+        return True
+
+
+def make_pruner(pruner_config: Dict[str, Any], max_iterations: int) -> optuna.pruners.BasePruner:
+    """
+    Create the Optuna pruner selected in the 'training.optuna.pruner' config.
+
+    Args:
+        pruner_config (Dict[str, Any]): Pruner settings with 'type' in
+            {'none', 'median', 'successive_halving', 'hyperband'}.
+        max_iterations (int): Maximum number of boosting iterations of a trial.
+
+    Returns:
+        optuna.pruners.BasePruner: The pruner.
+    """
+    pruner_type = pruner_config.get('type', 'none')
+    if pruner_type == 'none':
+        return optuna.pruners.NopPruner()
+    if pruner_type == 'median':
+        return optuna.pruners.MedianPruner(
+            n_startup_trials=pruner_config.get('n_startup_trials', 5),
+            n_warmup_steps=pruner_config.get('n_warmup_steps', 0),
+            interval_steps=pruner_config.get('report_every', 1)
+        )
+    if pruner_type == 'successive_halving':
+        return optuna.pruners.SuccessiveHalvingPruner(
+            min_resource=pruner_config.get('min_resource', 'auto'),
+            reduction_factor=pruner_config.get('reduction_factor', 3)
+        )
+    if pruner_type == 'hyperband':
+        return optuna.pruners.HyperbandPruner(
+            min_resource=pruner_config.get('min_resource', 1),
+            max_resource=max_iterations,
+            reduction_factor=pruner_config.get('reduction_factor', 3)
+        )
+    raise ValueError(f"Unknown pruner type: {pruner_type}")
+
+
+class SharedTrainingData:
+    """
+    Numeric training matrices placed in shared memory, so that worker processes
+    can read them without receiving a pickled copy for every trial.
+
+    Each array is stored as one float64 block; workers attach to the blocks by
+    name (see `attach`) and rebuild zero-copy DataFrames over them.
+
+    Args:
+        arrays (Dict[str, pd.DataFrame or pd.Series]): Named frames to share, e.g. {'x_tr': ..., 'y_tr': ...}.
+    """
+    def __init__(self, arrays: Dict[str, Any]):
+        self.blocks: List[shared_memory.SharedMemory] = []
+        self.spec: Dict[str, Dict[str, Any]] = {}
+        for name, data in arrays.items():
+            values = data.to_numpy(dtype=np.float64)
+            block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+            np.ndarray(values.shape, dtype=np.float64, buffer=block.buf)[...] = values
+            self.blocks.append(block)
+            self.spec[name] = {
+                'block': block.name,
+                'shape': values.shape,
+                'columns': list(data.columns) if isinstance(data, pd.DataFrame) else None,
+                'name': None if isinstance(data, pd.DataFrame) else data.name,
+            }
+
+    @staticmethod
+    def attach(spec: Dict[str, Dict[str, Any]]) -> Tuple[Dict[str, Any], List[shared_memory.SharedMemory]]:
+        """
+        Attach to shared blocks created by another process.
+
+        Args:
+            spec (Dict[str, Dict[str, Any]]): The `spec` attribute of the creating instance.
+
+        Returns:
+            Tuple containing:
+                - Named DataFrames / Series backed by the shared memory
+                - The attached blocks (must stay referenced while the data is used)
+        """
+        arrays, blocks = {}, []
+        for name, item in spec.items():
+            block = shared_memory.SharedMemory(name=item['block'])
+            values = np.ndarray(item['shape'], dtype=np.float64, buffer=block.buf)
+            if item['columns'] is not None:
+                arrays[name] = pd.DataFrame(values, columns=item['columns'], copy=False)
+            else:
+                arrays[name] = pd.Series(values, name=item['name'], copy=False)
+            blocks.append(block)
+        return arrays, blocks
+
+    def close(self) -> None:
+        """Release and remove the shared blocks."""
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+
+# Per-process state of the tuning workers, set by `_init_tuning_worker`
+_worker_pools: Dict[str, Pool] = {}
+_worker_blocks: List[shared_memory.SharedMemory] = []
+
+
+def _init_tuning_worker(spec: Dict[str, Dict[str, Any]], pool_settings: Dict[str, Any]) -> None:
+    # The pools are built once per worker and reused by all the trials it runs
+    global _worker_pools, _worker_blocks
+    data, _worker_blocks = SharedTrainingData.attach(spec)
+    _worker_pools = {
+        'train': build_pool(data['x_tr'], data['y_tr'], weight=data.get('w_tr'), **pool_settings),
+        'val': build_pool(data['x_val'], data['y_val']),
+    }
+
+
+def _run_tuning_trial(
+    params: Dict[str, Any],
+    early_stopping_rounds: int,
+    trial_ref: Optional[Dict[str, Any]] = None
+) -> Tuple[float, int]:
+    # With a persistent storage the worker can report to the trial directly, which enables pruning
+    callbacks = None
+    if trial_ref is not None:
+        study = optuna.load_study(
+            study_name=trial_ref['study_name'],
+            storage=trial_ref['storage'],
+            pruner=make_pruner(trial_ref['pruner_config'], trial_ref['max_iterations'])
+        )
+        trial = optuna.trial.Trial(study, trial_ref['trial_id'])
+        callbacks = [CatBoostPruningCallback(
+            trial, metric=trial_ref['metric'], report_every=trial_ref['pruner_config'].get('report_every', 1)
+        )]
+    return fit_and_evaluate(
+        params, _worker_pools['train'], _worker_pools['val'], early_stopping_rounds, callbacks=callbacks
+    )
+
 
 class TrainingPipeline:
     """
@@ -14,6 +271,16 @@ class TrainingPipeline:
         config (Dict[str, Any]): Configuration dictionary with training parameters.
         optuna_config (Dict[str, Any]): Subset of config containing Optuna-specific settings.
         search_space (Dict[str, Any]): Hyperparameter search space for tuning.
+        n_workers (int): Number of trials evaluated concurrently in worker processes.
+        cpu_budget (int): Number of cores shared between the concurrent trials.
+        pruner_config (Dict[str, Any]): Settings of the pruner stopping unpromising trials early.
+        storage_config (Dict[str, Any]): Settings of the persistent study storage.
+        pool_config (Dict[str, Any]): Settings of the CatBoost training pools.
+        incremental_config (Dict[str, Any]): Settings of the incremental training from the production model.
+        window_config (Dict[str, Any]): Settings of the training window and the recency weights.
+        lag_search_config (Dict[str, Any]): Settings of the search over lag feature subsets.
+        feature_engineering_config (Dict[str, Any]): Feature engineering settings (the configured lags).
+        selected_lag_params (Optional[Dict[str, List[int]]]): Lags of the last trained model, None before training.
     """
 
     def __init__(self, config: Dict[str, Any]) -> None:
@@ -27,6 +294,283 @@ class TrainingPipeline:
         self.optuna_config: Dict[str, Any] = self.config.get('optuna', {})
         self.search_space: Dict[str, Any] = self.config['optuna']['search_space']
 
+        parallel_config = self.optuna_config.get('parallel', {})
+        self.n_workers: int = max(1, parallel_config.get('n_workers', 1))
+        self.cpu_budget: int = parallel_config.get('cpu_budget') or os.cpu_count() or 1
+        self.pruner_config: Dict[str, Any] = self.optuna_config.get('pruner', {})
+        self.storage_config: Dict[str, Any] = self.optuna_config.get('storage', {})
+        self.pool_config: Dict[str, Any] = self.config.get('pool', {})
+        self.incremental_config: Dict[str, Any] = self.config.get('incremental', {})
+        self.window_config: Dict[str, Any] = self.config.get('window', {})
+        self.lag_search_config: Dict[str, Any] = self.optuna_config.get('lag_search', {})
+        self.feature_engineering_config: Dict[str, Any] = config.get('feature_engineering', {})
+        self.selected_lag_params: Optional[Dict[str, List[int]]] = None
+
+    def get_storage_url(self) -> Optional[str]:
+        """
+        URL of the SQLite database the studies are persisted to.
+
+        Returns:
+            Optional[str]: Storage URL, or None if studies are kept in memory.
+        """
+        if not self.storage_config.get('enabled', False):
+            return None
+        folder = self.storage_config['folder']
+        os.makedirs(folder, exist_ok=True)
+        return f"sqlite:///{os.path.join(folder, self.storage_config.get('file_name', 'studies.db'))}"
+
+    def get_config_version(self, x_train: pd.DataFrame) -> str:
+        """
+        Version of the tuning setup: only the settings that change the objective (search
+        space, iterations, loss, split fractions, recency weights, quantization borders) and
+        the feature columns, so that other training options keep resuming the same study.
+
+        Args:
+            x_train (pd.DataFrame): Training features.
+
+        Returns:
+            str: Short hash of the tuning setup.
+        """
+        settings = {
+            'search_space': self.search_space,
+            'lag_search': self.get_lag_choices(),
+            'iterations': self.config['iterations'],
+            'loss_function': self.config['loss_function'],
+            'early_stopping_rounds': self.config['early_stopping_rounds'],
+            'train_fraction': self.config['train_fraction'],
+            'recency_half_life_rows': self.window_config.get('recency_half_life_rows'),
+            'border_count': self.pool_config.get('border_count'),
+            'features': list(x_train.columns),
+        }
+        return hashlib.sha256(json.dumps(settings, sort_keys=True, default=str).encode()).hexdigest()[:12]
+
+    @staticmethod
+    def get_data_version(x_train: pd.DataFrame, y_train: pd.Series) -> str:
+        """
+        Version of the training data: a hash of its content.
+
+        Args:
+            x_train (pd.DataFrame): Training features.
+            y_train (pd.Series): Training targets.
+
+        Returns:
+            str: Short hash of the data.
+        """
+        row_hashes = pd.util.hash_pandas_object(pd.concat([x_train, y_train], axis=1), index=False)
+        return hashlib.sha256(row_hashes.to_numpy().tobytes()).hexdigest()[:12]
+
+    def get_sample_weights(self, n: int) -> Optional[np.ndarray]:
+        """
+        Exponential recency weights of `n` consecutive training rows: the last row has
+        weight 1, and the weight halves every 'training.window.recency_half_life_rows' rows.
+
+        Args:
+            n (int): Number of rows.
+
+        Returns:
+            Optional[np.ndarray]: Weights, oldest row first. None if recency weighting is disabled.
+        """
+        half_life = self.window_config.get('recency_half_life_rows')
+        if not half_life:
+            return None
+        ages = np.arange(n - 1, -1, -1, dtype=np.float64)
+        return np.power(0.5, ages / half_life)
+
+    def pool_settings(self, name: str, x: pd.DataFrame, y: pd.Series) -> Dict[str, Any]:
+        """
+        Arguments of `build_pool` for a training pool, from the 'training.pool' config.
+
+        Args:
+            name (str): Pool name, e.g. 'train' or 'train_test'.
+            x (pd.DataFrame): Features of the pool.
+            y (pd.Series): Targets of the pool.
+
+        Returns:
+            Dict[str, Any]: 'quantize', 'border_count' and 'cache_path' (None unless the
+            quantized pool is saved; the file name contains the data version).
+        """
+        quantize = self.pool_config.get('quantize', False)
+        border_count = self.pool_config.get('border_count')
+        half_life = self.window_config.get('recency_half_life_rows')
+        cache_path = None
+        if quantize and self.pool_config.get('save_quantized', False):
+            weights = f"halflife{half_life}" if half_life else 'unweighted'
+            file_name = f"{name}-{self.get_data_version(x, y)}-{border_count or 'default'}-{weights}.quantized"
+            cache_path = os.path.join(self.pool_config['folder'], file_name)
+        return {'quantize': quantize, 'border_count': border_count, 'cache_path': cache_path}
+
+    def load_or_create_study(self, config_version: str, data_version: str) -> optuna.Study:
+        """
+        Create the Optuna study of this data / config version, or resume it if it
+        already exists in the persistent storage.
+
+        A resumed study's trials left running by an interrupted run are marked as
+        failed and their parameters queued again. A new study is warm-started with
+        the best trials of the latest study of the same config version.
+
+        Args:
+            config_version (str): Version of the tuning setup.
+            data_version (str): Version of the training data.
+
+        Returns:
+            optuna.Study: The study.
+        """
+        storage = self.get_storage_url()
+        study_name = f"{self.storage_config.get('study_prefix', 'bike_rental')}-{config_version}-{data_version}"
+        sampler = optuna.samplers.TPESampler(seed=42)
+        pruner = make_pruner(self.pruner_config, self.config["iterations"])
+        if storage is None:
+            return optuna.create_study(direction="minimize", sampler=sampler, pruner=pruner)
+
+        previous_studies = [
+            summary for summary in optuna.get_all_study_summaries(storage=storage)
+            if summary.study_name.startswith(study_name.rsplit('-', 1)[0] + '-') and summary.study_name != study_name
+        ]
+        study = optuna.create_study(
+            direction="minimize", sampler=sampler, pruner=pruner,
+            study_name=study_name, storage=storage, load_if_exists=True
+        )
+
+        n_existing = len(study.trials)
+        if n_existing:
+            interrupted = [trial for trial in study.trials if trial.state == optuna.trial.TrialState.RUNNING]
+            for trial in interrupted:
+                study.tell(trial.number, state=optuna.trial.TrialState.FAIL)
+                study.enqueue_trial(trial.params)
+            logger.info(f"Resuming study {study_name}: {n_existing} trials, {len(interrupted)} interrupted")
+        elif previous_studies:
+            previous = max(previous_studies, key=lambda summary: summary.datetime_start or pd.Timestamp.min)
+            self.warm_start(study, optuna.load_study(study_name=previous.study_name, storage=storage))
+        return study
+
+    def warm_start(self, study: optuna.Study, previous: optuna.Study) -> None:
+        """
+        Queue the parameters of the best completed trials of a previous study
+        as the first trials of a new study.
+
+        Args:
+            study (optuna.Study): New study.
+            previous (optuna.Study): Previous study.
+
+        Returns:
+            None
+        """
+        n_best = self.storage_config.get('warm_start_trials', 3)
+        completed = [trial for trial in previous.trials if trial.state == optuna.trial.TrialState.COMPLETE]
+        best_trials = sorted(completed, key=lambda trial: trial.value)[:n_best]
+        for trial in best_trials:
+            params = {name: value for name, value in trial.params.items() if self.in_search_space(name, value)}
+            study.enqueue_trial(params, skip_if_exists=True)
+        logger.info(f"Warm-starting study {study.study_name} with {len(best_trials)} trials of {previous.study_name}")
+
+    def in_search_space(self, name: str, value: Any) -> bool:
+        """
+        Check that a parameter value lies in the current search space.
+
+        Args:
+            name (str): Parameter name.
+            value (Any): Parameter value.
+
+        Returns:
+            bool: True if the parameter is tuned and the value is within its bounds.
+        """
+        if name in self.get_lag_choices():
+            return value in (True, False)
+        bounds = self.search_space.get(name)
+        return bounds is not None and bounds["low"] <= value <= bounds["high"]
+
+    def get_feature_lag_params(self) -> Dict[str, List[int]]:
+        """
+        Lags to compute for training: the configured lags and, with the lag search,
+        all candidate lags (the superset every trial selects its columns from).
+
+        Returns:
+            Dict[str, List[int]]: Feature -> lags.
+        """
+        candidates = self.lag_search_config.get('candidates') if self.lag_search_config.get('enabled', False) else None
+        return FeatureEngineeringPipeline.merge_lag_params(self.feature_engineering_config.get('lag_params'), candidates)
+
+    def get_lag_choices(self) -> Dict[str, str]:
+        """
+        Lag features whose use is searched ('training.optuna.lag_search.candidates').
+
+        Returns:
+            Dict[str, str]: Trial parameter name ('lag_<feature>_<lag>') -> lag column
+            (empty if the lag search is disabled).
+        """
+        if not self.lag_search_config.get('enabled', False):
+            return {}
+        return {
+            f"lag_{feat}_{lag}": FeatureEngineeringPipeline.lag_column(feat, lag)
+            for feat, lags in (self.lag_search_config.get('candidates') or {}).items() for lag in lags
+        }
+
+    def get_selected_lag_params(self, params: Dict[str, Any]) -> Dict[str, List[int]]:
+        """
+        Lags used with the parameters of a trial: the searched lags the trial selected
+        and the configured lags that are not searched.
+
+        Args:
+            params (Dict[str, Any]): Trial parameters.
+
+        Returns:
+            Dict[str, List[int]]: Feature -> lags, in the column order of `get_feature_lag_params`.
+        """
+        selected: Dict[str, List[int]] = {}
+        for feat, lags in self.get_feature_lag_params().items():
+            kept = [lag for lag in lags if params.get(f"lag_{feat}_{lag}", True)]
+            if kept:
+                selected[feat] = kept
+        return selected
+
+    def trial_thread_count(self) -> int:
+        """
+        Number of CatBoost threads per trial, so that concurrent trials together
+        use at most `cpu_budget` cores.
+
+        Returns:
+            int: Threads per trial (at least 1).
+        """
+        return max(1, self.cpu_budget // self.n_workers)
+
+    def suggest_params(self, trial: optuna.Trial) -> Dict[str, Any]:
+        """
+        Sample CatBoost parameters for a trial from the configured search space.
+
+        With the lag search, the trial also selects the candidate lag features it uses.
+        The unselected columns are passed as `ignored_features`, so that every trial
+        trains on the same superset pool instead of a copy of the selected columns.
+
+        Args:
+            trial (optuna.Trial): Optuna trial.
+
+        Returns:
+            Dict[str, Any]: CatBoost parameters of the trial.
+        """
+        ss = self.search_space
+        params = {
+            "learning_rate": trial.suggest_float(
+                "learning_rate", ss["learning_rate"]["low"], ss["learning_rate"]["high"],
+                log=ss["learning_rate"].get("log", False)
+            ),
+            "depth": trial.suggest_int("depth", ss["depth"]["low"], ss["depth"]["high"]),
+            "l2_leaf_reg": trial.suggest_float(
+                "l2_leaf_reg", ss["l2_leaf_reg"]["low"], ss["l2_leaf_reg"]["high"],
+                log=ss["l2_leaf_reg"].get("log", False)
+            ),
+            "iterations": self.config["iterations"],
+            "loss_function": self.config["loss_function"],
+            "verbose": self.config.get("verbose", 0),
+            "thread_count": self.trial_thread_count(),
+        }
+        ignored_features = [
+            column for name, column in self.get_lag_choices().items()
+            if not trial.suggest_categorical(name, [True, False])
+        ]
+        if ignored_features:
+            params["ignored_features"] = ignored_features
+        return params
+
     @staticmethod
     def make_target(df: pd.DataFrame, target_params: Dict[str, str]) -> pd.DataFrame:
         """
@@ -76,7 +620,8 @@ class TrainingPipeline:
         x_train: pd.DataFrame,
         y_train: pd.Series,
         x_test: pd.DataFrame,
-        y_test: pd.Series
+        y_test: pd.Series,
+        series_sizes: Optional[List[Tuple[int, int]]] = None
     ) -> Tuple[Any, optuna.Study]:
         """
         Perform hyperparameter tuning using Optuna, then retrain the model
@@ -87,6 +632,9 @@ class TrainingPipeline:
             y_train (pd.Series): Training targets.
             x_test (pd.DataFrame): Test features.
             y_test (pd.Series): Test targets.
+            series_sizes (Optional[List[Tuple[int, int]]]): Training and test rows of each
+                series when the frames concatenate several series in the same order,
+                e.g. the stations of a cluster. Defaults to a single series.
 
         Returns:
             Tuple containing:
@@ -95,64 +643,278 @@ class TrainingPipeline:
         """
         np.random.seed(42)
 
-        def objective(trial: optuna.Trial) -> float:
-            ss = self.search_space
-            params = {
-                "learning_rate": trial.suggest_float(
-                    "learning_rate", ss["learning_rate"]["low"], ss["learning_rate"]["high"],
-                    log=ss["learning_rate"].get("log", False)
-                ),
-                "depth": trial.suggest_int("depth", ss["depth"]["low"], ss["depth"]["high"]),
-                "l2_leaf_reg": trial.suggest_float(
-                    "l2_leaf_reg", ss["l2_leaf_reg"]["low"], ss["l2_leaf_reg"]["high"],
-                    log=ss["l2_leaf_reg"].get("log", False)
-                ),
-                "iterations": self.config["iterations"],
-                "loss_function": self.config["loss_function"],
-                "verbose": self.config.get("verbose", 0)
-            }
+        # Manual time-based validation split, and recency weights (None without recency weighting)
+        x_tr, x_val, y_tr, y_val, w_tr, weights = self.split_validation(
+            x_train, y_train, series_sizes or [(len(x_train), len(x_test))]
+        )
+        pools: Dict[str, Pool] = {}
 
-            # Manual time-based validation split
-            train_idx = int(self.config['train_fraction'] * len(x_train))
-            x_tr, x_val = x_train.iloc[:train_idx], x_train.iloc[train_idx:]
-            y_tr, y_val = y_train.iloc[:train_idx], y_train.iloc[train_idx:]
+        # Run Optuna study, resuming the trials already finished for this data and config version
+        study = self.load_or_create_study(self.get_config_version(x_train), self.get_data_version(x_train, y_train))
+        n_trials = self.get_remaining_trials(study)
+        if n_trials == 0:
+            logger.info(f"All trials of study {study.study_name} are already finished")
+        elif self.n_workers == 1:
+            # The pools are built (and quantized) once and shared by all trials
+            pools['train'] = build_pool(x_tr, y_tr, weight=w_tr, **self.pool_settings('train', x_tr, y_tr))
+            pools['val'] = build_pool(x_val, y_val)
+            study.optimize(self.make_objective(pools), n_trials=n_trials)
+        else:
+            data = {'x_tr': x_tr, 'y_tr': y_tr, 'x_val': x_val, 'y_val': y_val}
+            if w_tr is not None:
+                data['w_tr'] = pd.Series(w_tr, name='weight')
+            self.optimize_parallel(study, n_trials, data)
 
-            model = CatBoostRegressor(**params, random_seed=42, allow_writing_files=False)
-            model.fit(
-                x_tr, y_tr,
-                eval_set=(x_val, y_val),
-                early_stopping_rounds=self.config.get("early_stopping_rounds", 100),
-                use_best_model=True,
-                verbose=False
+        # Train final model on full training data with best parameters (and the best trial's lag features)
+        best_params = self.get_best_params(study)
+        self.selected_lag_params = self.get_selected_lag_params(study.best_params)
+        unselected = [
+            column for name, column in self.get_lag_choices().items()
+            if not study.best_params.get(name, True) and column in x_train.columns
+        ]
 
-            )
+        # Concatenate training and testing data
+        x_train_test = pd.concat([x_train, x_test], axis=0).drop(columns=unselected)
+        y_train_test = pd.concat([y_train, y_test], axis=0)
+
+        train_test_pool = build_pool(
+            x_train_test, y_train_test, weight=weights,
+            **self.pool_settings('train_test', x_train_test, y_train_test)
+        )
+        final_model = CatBoostRegressor(**best_params, random_seed=42, allow_writing_files=False)
+        final_model.fit(train_test_pool, verbose=False)
+
+        return final_model, study
+
+    def split_validation(
+        self,
+        x_train: pd.DataFrame,
+        y_train: pd.Series,
+        series_sizes: List[Tuple[int, int]]
+    ) -> Tuple[pd.DataFrame, pd.DataFrame, pd.Series, pd.Series, Optional[np.ndarray], Optional[np.ndarray]]:
+        """
+        Time-based validation split of the training rows, and recency weights, per series:
+        the last rows of each series validate the trials, and the weights of each series
+        decay from its own latest row.
+
+        Args:
+            x_train (pd.DataFrame): Training features of all series, series after series.
+            y_train (pd.Series): Training targets.
+            series_sizes (List[Tuple[int, int]]): Training and test rows of each series.
 
-            preds = model.predict(x_val)
-            rmse = np.sqrt(mean_squared_error(y_val, preds))
-            trial.set_user_attr("best_iteration", model.get_best_iteration())
+        Returns:
+            Tuple containing:
+                - Trial training features, targets (x_tr, y_tr) and validation features, targets (x_val, y_val)
+                - Weights of the trial training rows, None without recency weighting
+                - Weights of the training then test rows of the final refit, None without recency weighting
+        """
+        tr_rows, val_rows, w_tr, w_train, w_test = [], [], [], [], []
+        offset = 0
+        for n_train, n_test in series_sizes:
+            train_idx = int(self.config['train_fraction'] * n_train)
+            tr_rows.extend(range(offset, offset + train_idx))
+            val_rows.extend(range(offset + train_idx, offset + n_train))
+            offset += n_train
+
+            weights = self.get_sample_weights(n_train + n_test)
+            if weights is not None:
+                w_tr.append(weights[:train_idx])
+                w_train.append(weights[:n_train])
+                w_test.append(weights[n_train:])
+
+        x_tr, x_val = x_train.iloc[tr_rows], x_train.iloc[val_rows]
+        y_tr, y_val = y_train.iloc[tr_rows], y_train.iloc[val_rows]
+        if not w_tr:
+            return x_tr, x_val, y_tr, y_val, None, None
+        return x_tr, x_val, y_tr, y_val, np.concatenate(w_tr), np.concatenate(w_train + w_test)
+
+    def make_objective(self, pools: Dict[str, Pool]) -> Callable[[optuna.Trial], float]:
+        """
+        Optuna objective: fit the trial's parameters on the 'train' pool, with early stopping
+        and pruning on the 'val' pool.
+
+        Args:
+            pools (Dict[str, Pool]): 'train' and 'val' pools (may be filled after this call).
+
+        Returns:
+            Callable[[optuna.Trial], float]: Objective returning the validation RMSE.
+        """
+        early_stopping_rounds = self.config.get("early_stopping_rounds", 100)
+
+        def objective(trial: optuna.Trial) -> float:
+            params = self.suggest_params(trial)
+            callbacks = None
+            if self.pruner_config.get('type', 'none') != 'none':
+                callbacks = [CatBoostPruningCallback(
+                    trial, metric=self.config["loss_function"], report_every=self.pruner_config.get('report_every', 1)
+                )]
+            rmse, best_iteration = fit_and_evaluate(
+                params, pools['train'], pools['val'], early_stopping_rounds, callbacks=callbacks
+            )
+            trial.set_user_attr("best_iteration", best_iteration)
             return rmse
 
-        # Run Optuna study
-        n_trials = self.optuna_config["n_trials"]
-        study = optuna.create_study(direction="minimize", sampler=optuna.samplers.TPESampler(seed=42))
-        study.optimize(objective, n_trials=n_trials)
+        return objective
+
+    def get_remaining_trials(self, study: optuna.Study) -> int:
+        """
+        Number of trials still to run in a (resumed) study.
 
-        # Train final model on full training data with best parameters
-        best_params = study.best_params.copy()
+        Args:
+            study (optuna.Study): Study.
+
+        Returns:
+            int: 'n_trials' minus the trials already completed or pruned.
+        """
+        finished_states = (optuna.trial.TrialState.COMPLETE, optuna.trial.TrialState.PRUNED)
+        return max(0, self.optuna_config["n_trials"] - len(study.get_trials(states=finished_states)))
+
+    def get_best_params(self, study: optuna.Study) -> Dict[str, Any]:
+        """
+        CatBoost parameters of the final model: the best trial's searched parameters
+        and its number of trees before early stopping.
+
+        Args:
+            study (optuna.Study): Finished study.
+
+        Returns:
+            Dict[str, Any]: Parameters of the final refit (without the lag selection).
+        """
+        best_params = {name: value for name, value in study.best_params.items() if name in self.search_space}
         best_params.update({
             "iterations": study.best_trial.user_attrs["best_iteration"],
             "loss_function": self.config["loss_function"],
-            "verbose": False
+            "verbose": False,
+            "thread_count": self.cpu_budget
         })
+        return best_params
 
-        # Concatenate training and testing data
-        x_train_test = pd.concat([x_train, x_test], axis=0)
-        y_train_test = pd.concat([y_train, y_test], axis=0)
+    def optimize_parallel(self, study: optuna.Study, n_trials: int, data: Dict[str, Any]) -> None:
+        """
+        Evaluate Optuna trials concurrently in a pool of worker processes.
 
-        final_model = CatBoostRegressor(**best_params, random_seed=42, allow_writing_files=False)
-        final_model.fit(x_train_test, y_train_test, verbose=False)
+        Trials are created with the ask/tell interface in this process, so the sampler
+        sees every finished trial. The training matrices are placed in shared memory
+        once and attached by each worker at startup instead of being pickled per trial.
+        Trials are pruned only with the persistent storage, through which the workers
+        report their intermediate values; the in-memory study is not reachable from them.
 
-        return final_model, study
+        Args:
+            study (optuna.Study): Study to optimize.
+            n_trials (int): Number of trials.
+            data (Dict[str, Any]): 'x_tr', 'y_tr', 'x_val' and 'y_val' frames, and optionally 'w_tr' weights.
+
+        Returns:
+            None
+        """
+        early_stopping_rounds = self.config.get("early_stopping_rounds", 100)
+        storage = self.get_storage_url()
+        prune = self.pruner_config.get('type', 'none') != 'none'
+        if prune and storage is None:
+            logger.warning("Pruning is disabled for trials run in parallel workers without a persistent storage")
+        # Save the quantized pool first (if enabled), the workers then load it instead of quantizing
+        pool_settings = self.pool_settings('train', data['x_tr'], data['y_tr'])
+        if pool_settings['cache_path'] is not None:
+            build_pool(data['x_tr'], data['y_tr'], weight=data.get('w_tr'), **pool_settings)
+        shared = SharedTrainingData(data)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=self.n_workers,
+                mp_context=mp.get_context('spawn'),
+                initializer=_init_tuning_worker,
+                initargs=(shared.spec, pool_settings)
+            ) as executor:
+                running, n_asked = {}, 0
+                while running or n_asked < n_trials:
+                    while len(running) < self.n_workers and n_asked < n_trials:
+                        trial = study.ask()
+                        trial_ref = None
+                        if prune and storage is not None:
+                            trial_ref = {
+                                'storage': storage,
+                                'study_name': study.study_name,
+                                'trial_id': trial._trial_id,
+                                'pruner_config': self.pruner_config,
+                                'max_iterations': self.config["iterations"],
+                                'metric': self.config["loss_function"],
+                            }
+                        future = executor.submit(
+                            _run_tuning_trial, self.suggest_params(trial), early_stopping_rounds, trial_ref
+                        )
+                        running[future] = trial
+                        n_asked += 1
+
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        trial = running.pop(future)
+                        try:
+                            rmse, best_iteration = future.result()
+                        except optuna.TrialPruned:
+                            study.tell(trial, state=optuna.trial.TrialState.PRUNED)
+                            continue
+                        except Exception as e:
+                            logger.warning(f"Trial {trial.number} failed: {e}")
+                            study.tell(trial, state=optuna.trial.TrialState.FAIL)
+                            continue
+                        trial.set_user_attr("best_iteration", best_iteration)
+                        study.tell(trial, rmse)
+        finally:
+            shared.close()
+
+    def run_incremental(self, df: pd.DataFrame, init_model: CatBoostRegressor) -> Tuple[Optional[Any], Dict[str, Any]]:
+        """
+        Continue boosting the production model on new rows only.
+
+        The last `validation_fraction` of the new rows validates the continued model
+        against the production model. If the validation RMSE degrades by more than
+        `max_rmse_increase` (relative), no model is returned and the caller falls back
+        to full training. Otherwise the production model is continued on all new rows.
+
+        Args:
+            df (pd.DataFrame): Feature-engineered new rows (without target).
+            init_model (CatBoostRegressor): Production model to continue from.
+
+        Returns:
+            Tuple containing:
+                - The continued model, or None if it was rejected
+                - Validation scores of the production and the continued model
+        """
+        df = self.make_target(df, target_params=self.config['target_params'])
+        feats = list(init_model.feature_names_)
+        if not set(feats) <= set(df.columns):
+            return None, {'reason': 'the features differ from the production model features'}
+        x, y = df[feats], df[self.config['target_params']['new_target_name']]
+
+        # Keep the tree structure settings of the production model
+        init_params = init_model.get_all_params()
+        params = {
+            "iterations": self.incremental_config.get("iterations", 50),
+            "learning_rate": self.incremental_config.get("learning_rate") or init_params["learning_rate"],
+            "depth": init_params["depth"],
+            "l2_leaf_reg": init_params["l2_leaf_reg"],
+            "loss_function": self.config["loss_function"],
+            "verbose": False,
+            "thread_count": self.cpu_budget,
+        }
+
+        train_size = int((1 - self.incremental_config.get("validation_fraction", 0.25)) * len(x))
+        x_tr, x_val = x.iloc[:train_size], x.iloc[train_size:]
+        y_tr, y_val = y.iloc[:train_size], y.iloc[train_size:]
+        candidate = CatBoostRegressor(**params, random_seed=42, allow_writing_files=False)
+        candidate.fit(x_tr, y_tr, init_model=init_model, verbose=False)
+
+        scores = {
+            'n_new_rows': len(x),
+            'prod_rmse': float(np.sqrt(mean_squared_error(y_val, init_model.predict(x_val)))),
+            'incremental_rmse': float(np.sqrt(mean_squared_error(y_val, candidate.predict(x_val)))),
+        }
+        if scores['incremental_rmse'] > scores['prod_rmse'] * (1 + self.incremental_config.get("max_rmse_increase", 0.0)):
+            scores['reason'] = 'the validation RMSE degraded'
+            return None, scores
+
+        model = CatBoostRegressor(**params, random_seed=42, allow_writing_files=False)
+        model.fit(x, y, init_model=init_model, verbose=False)
+        return model, scores
 
     def run(self, df: pd.DataFrame) -> Any:
         """
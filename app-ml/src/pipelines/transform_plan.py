@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List, Optional, Tuple
+
+from pipelines.feature_engineering import FeatureEngineeringPipeline
+
+
+class TransformPlan:
+    """
+    Preprocessing and feature engineering of inference batches fused into one step.
+
+    The plan is compiled once from the preprocessing config, the lags and the model's
+    feature order: every model feature is resolved to a raw input column and a lag.
+    A batch is then transformed by copying the used raw columns into a preallocated
+    buffer and gathering each feature column into a preallocated matrix in the model's
+    feature order, without intermediate DataFrames. The buffers are reused across calls
+    with the same number of rows. Window features are not computed by the plan: they
+    are copied from the values maintained online (see `OnlineWindowFeatures`).
+
+    The matrix equals the output of `PreprocessingPipeline` and `FeatureEngineeringPipeline`
+    (a lag column is `shift(lag).bfill()` of its source column) for raw data without missing
+    values; `transform` returns None for batches with missing values.
+
+    Args:
+        config (Dict[str, Any]): Application configuration with a 'preprocessing' section.
+        feature_names (List[str]): Model features, in the model's order.
+        lag_params (Optional[Dict[str, List[int]]]): Lags of the model (defaults to the configured lags).
+
+    Attributes:
+        feature_names (List[str]): Model features, in the model's order.
+        source_columns (List[str]): Raw columns the features are computed from (and window features).
+        window_sources (Dict[int, int]): Source column of each used window feature -> its column
+            in the online window values.
+        steps (List[Tuple[int, int]]): Per feature, index of its source column and its lag (0: no lag).
+    """
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        feature_names: List[str],
+        lag_params: Optional[Dict[str, List[int]]] = None
+    ):
+        if lag_params is None:
+            lag_params = config['feature_engineering']['lag_params']
+        raw_names = {new: old for old, new in config['preprocessing']['column_mapping'].items()}
+        dropped = set(config['preprocessing']['drop_columns'])
+        lag_columns = {
+            FeatureEngineeringPipeline.lag_column(feat, lag): (feat, lag)
+            for feat, lags in lag_params.items() for lag in lags
+        }
+        window_columns = FeatureEngineeringPipeline.window_columns(config['feature_engineering'].get('window_params'))
+
+        self.feature_names: List[str] = list(feature_names)
+        self.source_columns: List[str] = []
+        self.steps: List[Tuple[int, int]] = []
+        self.window_sources: Dict[int, int] = {}
+        for feature in self.feature_names:
+            if feature in window_columns:
+                self.window_sources[len(self.source_columns)] = window_columns.index(feature)
+                self.steps.append((len(self.source_columns), 0))
+                self.source_columns.append(feature)
+                continue
+            column, lag = lag_columns.get(feature, (feature, 0))
+            if column in dropped:
+                raise ValueError(f"Feature {feature} is computed from the dropped column {column}")
+            raw_column = raw_names.get(column, column)
+            if raw_column not in self.source_columns:
+                self.source_columns.append(raw_column)
+            self.steps.append((self.source_columns.index(raw_column), lag))
+
+        self._n_rows: Optional[int] = None
+        self._source: Optional[np.ndarray] = None
+        self._matrix: Optional[np.ndarray] = None
+        self._indices: Dict[int, Optional[np.ndarray]] = {}
+
+    def _allocate(self, n_rows: int) -> None:
+        # Buffers and gather indices depend on the batch length only
+        self._n_rows = n_rows
+        self._source = np.empty((n_rows, len(self.source_columns)), dtype=np.float64, order='F')
+        self._matrix = np.empty((n_rows, len(self.feature_names)), dtype=np.float64, order='F')
+        rows = np.arange(n_rows)
+        # Row i of a lag column holds row i - lag of its source, the first rows are back-filled with row 0
+        self._indices = {
+            lag: (np.maximum(rows - lag, 0) if lag < n_rows else None)
+            for lag in {lag for _, lag in self.steps}
+        }
+
+    def transform(self, df: pd.DataFrame, window_values: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        """
+        Transform a raw batch into the model's feature matrix.
+
+        Args:
+            df (pd.DataFrame): Raw rows, in time order.
+            window_values (Optional[np.ndarray]): Window features of the rows (rows x window columns).
+
+        Returns:
+            Optional[np.ndarray]: Feature matrix (rows x model features), valid until the next
+            call; None if a used column has missing values or the window features are not given.
+        """
+        if self.window_sources and window_values is None:
+            return None
+        if self._n_rows != len(df):
+            self._allocate(len(df))
+        source, matrix = self._source, self._matrix
+        for k, column in enumerate(self.source_columns):
+            if k in self.window_sources:
+                source[:, k] = window_values[:, self.window_sources[k]]
+            else:
+                source[:, k] = df[column].to_numpy()
+        if np.isnan(source).any():
+            return None
+        for j, (k, lag) in enumerate(self.steps):
+            indices = self._indices[lag]
+            if indices is None:
+                # Shorter batch than the lag: the lag column is empty
+                matrix[:, j] = np.nan
+            else:
+                np.take(source[:, k], indices, out=matrix[:, j], mode='clip')
+        return matrix
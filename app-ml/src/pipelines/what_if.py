@@ -0,0 +1,147 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List
+
+from pipelines.feature_engineering import FeatureEngineeringPipeline
+
+
+class WhatIfPipeline:
+    """
+    Next-point predictions of the production model under changed conditions of the
+    latest row, e.g. rain, another temperature or a holiday.
+
+    A scenario overrides some of the configured 'what_if.columns' (weather, temperature,
+    working day, ...) of the latest row. The features of all scenarios are built from the
+    feature row of the latest batch in one vectorized pass: the overridden columns are
+    replaced, and their window features, which cover the row itself, are recomputed from
+    the previous values (rolling statistics) or updated with the changed value (EWMs).
+    Lag features only depend on earlier rows and are unchanged. The baseline and all
+    scenarios are then scored with a single prediction call.
+
+    Args:
+        config (Dict[str, Any]): Application configuration with a 'what_if' section.
+
+    Attributes:
+        columns (List[str]): Feature columns scenarios may override.
+        max_scenarios (int): Maximum number of scenarios of a request.
+    """
+    def __init__(self, config: Dict[str, Any]):
+        what_if_config = config.get('what_if', {})
+        self.columns: List[str] = list(what_if_config.get('columns', []))
+        self.max_scenarios: int = what_if_config.get('max_scenarios', 1000)
+        self.column_mapping: Dict[str, str] = config['preprocessing']['column_mapping']
+        self.window_params: Dict[str, Dict[str, Any]] = config['feature_engineering'].get('window_params') or {}
+
+    def get_history_rows(self) -> int:
+        """
+        Rows before the latest one the window features of the overridable columns depend on.
+
+        Returns:
+            int: Number of rows.
+        """
+        return max(
+            (window - 1 for column in self.columns for window in self.window_params.get(column, {}).get('windows', [])),
+            default=0
+        )
+
+    def get_overrides(self, scenarios: List[Dict[str, Any]]) -> pd.DataFrame:
+        """
+        Validate the scenarios and align their overrides in a frame.
+
+        Args:
+            scenarios (List[Dict[str, Any]]): Overrides per scenario, by feature or raw column
+                name, e.g. [{'weather': 3}, {'working_day': 0, 'temperature': 0.3}].
+
+        Returns:
+            pd.DataFrame: One row per scenario, one column per overridden feature column
+            (NaN where a scenario keeps the latest value).
+
+        Raises:
+            ValueError: If a column cannot be overridden or a value is not numeric.
+        """
+        rows = []
+        for scenario in scenarios:
+            row = {}
+            for column, value in scenario.items():
+                column = self.column_mapping.get(column, column)
+                if column not in self.columns:
+                    raise ValueError(f"Column {column} cannot be overridden, expected one of {self.columns}")
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    raise ValueError(f"Value of {column} must be a number, got {value!r}")
+                row[column] = float(value)
+            rows.append(row)
+        return pd.DataFrame(rows, index=range(len(scenarios)), dtype=np.float64)
+
+    def build_features(self, features: pd.DataFrame, history: pd.DataFrame, overrides: pd.DataFrame) -> pd.DataFrame:
+        """
+        Feature rows of the scenarios.
+
+        Args:
+            features (pd.DataFrame): Features of the latest batch; the last row is the one scenarios change.
+            history (pd.DataFrame): Preprocessed rows ending with the latest one, covering the
+                windows of the overridden columns (see `get_history_rows`).
+            overrides (pd.DataFrame): Overrides per scenario (see `get_overrides`).
+
+        Returns:
+            pd.DataFrame: One feature row per scenario.
+        """
+        base = features.iloc[-1]
+        x = np.tile(base.to_numpy(dtype=np.float64), (len(overrides), 1))
+        positions = {column: i for i, column in enumerate(features.columns)}
+        for column in overrides.columns:
+            values = overrides[column].fillna(base[column]).to_numpy()
+            x[:, positions[column]] = values
+
+            spec = self.window_params.get(column, {})
+            previous = history[column].to_numpy(dtype=np.float64)[:-1]
+            for window in spec.get('windows', []):
+                # Previous values of the window next to each scenario's value
+                window_previous = previous[max(0, len(previous) - window + 1):]
+                window_values = np.column_stack([np.tile(window_previous, (len(values), 1)), values])
+                for stat in spec.get('stats', ['mean']):
+                    stat_values = window_values.std(axis=1) if stat == 'std' else getattr(window_values, stat)(axis=1)
+                    x[:, positions[FeatureEngineeringPipeline.rolling_column(column, window, stat)]] = stat_values
+            for span in spec.get('ewm_spans', []):
+                # The EWM of the latest row weights its value by alpha
+                ewm = FeatureEngineeringPipeline.ewm_column(column, span)
+                x[:, positions[ewm]] = base[ewm] + 2 / (span + 1) * (values - base[column])
+        return pd.DataFrame(x, columns=features.columns)
+
+    def run(
+        self,
+        model: Any,
+        features: pd.DataFrame,
+        history: pd.DataFrame,
+        scenarios: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Score the baseline and the scenarios with one prediction call.
+
+        Args:
+            model (Any): Served model.
+            features (pd.DataFrame): Features of the latest batch.
+            history (pd.DataFrame): Preprocessed rows ending with the latest one.
+            scenarios (List[Dict[str, Any]]): Overrides per scenario.
+
+        Returns:
+            Dict[str, Any]: Baseline prediction, and the overrides, prediction and change
+            from the baseline of every scenario.
+
+        Raises:
+            ValueError: If there are more than `max_scenarios` scenarios or an override is invalid.
+        """
+        if len(scenarios) > self.max_scenarios:
+            raise ValueError(f"{len(scenarios)} scenarios, at most {self.max_scenarios} are scored per request")
+        # The baseline is scored as a scenario without overrides
+        overrides = self.get_overrides([{}] + list(scenarios))
+        x = self.build_features(features, history, overrides)
+        feature_names = getattr(model, 'feature_names_', None)
+        y_pred = model.predict(x[feature_names] if feature_names else x)
+        baseline = float(y_pred[0])
+        return {
+            'baseline': baseline,
+            'scenarios': [
+                {'overrides': scenario, 'prediction': float(prediction), 'change': float(prediction) - baseline}
+                for scenario, prediction in zip(scenarios, y_pred[1:])
+            ],
+        }
@@ -16,9 +16,10 @@ import dash_bootstrap_components as dbc
 import plotly.graph_objects as go
 from common.data_manager import DataManager
 from common.utils import read_config, make_prediction_figures
+from common.tracing import configure_tracing
 
-# Load configuration using utils function
-config_path = project_root / 'config' / 'config.yaml'
+# Load configuration using utils function (CONFIG_PATH overrides the default config file)
+config_path = os.environ.get('CONFIG_PATH', project_root / 'config' / 'config.yaml')
 config = read_config(config_path)
 
 # Override host for Docker environment if environment variable is set
@@ -27,9 +28,12 @@ inference_api_port = config.get('inference_api', {}).get('port', 5001)
 inference_api_endpoint = config.get('inference_api', {}).get('endpoint', '/run-inference')
 INFERENCE_API_URL = f"http://{inference_api_host}:{inference_api_port}{inference_api_endpoint}"
 
-# Initialize data manager and production database
+# Record spans of the dashboard callbacks, propagated to the inference API
+tracer = configure_tracing(config, service_name='app-ui')
+
+# Initialize data manager and resume (or initialize) the production database
 data_manager = DataManager(config)
-data_manager.initialize_prod_database()
+data_manager.prepare_prod_database()
 
 # Use the default Bootstrap (light) theme
 app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
@@ -159,14 +163,17 @@ def update_graphs(lookback_hours, parameters, shared_xrange, inference_trigger):
     try:
         if lookback_hours is None or lookback_hours < 1:
             lookback_hours = config['ui']['default_lookback_hours']
-        try:
-            df_pred = data_manager.load_prediction_data()
-        except Exception:
-            df_pred = None
-        df_prod = data_manager.load_prod_data()
-        fig1, fig2 = make_prediction_figures(
-            df_prod, df_pred, parameters, config, lookback_hours, shared_xrange
-        )
+        with tracer.span('ui.update_graphs', {'lookback_hours': lookback_hours}):
+            with tracer.span('ui.load_data'):
+                try:
+                    df_pred = data_manager.load_prediction_data()
+                except Exception:
+                    df_pred = None
+                df_prod = data_manager.load_prod_data()
+            with tracer.span('ui.make_figures'):
+                fig1, fig2 = make_prediction_figures(
+                    df_prod, df_pred, parameters, config, lookback_hours, shared_xrange
+                )
         return fig1, fig2
     except Exception as e:
         fig1 = go.Figure()
@@ -205,8 +212,12 @@ def trigger_inference(n_clicks):
         return "", False, 0
     try:
         # Disable button during inference
-        # Call the inference API in the other container
-        response = requests.post(INFERENCE_API_URL)
+        # Call the inference API in the other container, passing the trace context along
+        with tracer.span('ui.trigger_inference', {'n_clicks': n_clicks}):
+            with tracer.span('http.post', {'http.url': INFERENCE_API_URL}) as span:
+                response = requests.post(INFERENCE_API_URL, headers=tracer.inject())
+                if span is not None:
+                    span.set_attribute('http.status_code', response.status_code)
         if response.status_code == 200:
             result = response.json()
             if result.get("status") == "success":
@@ -0,0 +1,314 @@
+import os
+import datetime as dt
+from typing import Dict, Any, Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+# Relative demand per hour of day, estimated from the UCI bike sharing dataset
+HOURLY_PROFILE = {
+    'working_day': np.array([
+        0.19, 0.09, 0.05, 0.03, 0.03, 0.13, 0.54, 1.53, 2.52, 1.27, 0.71, 0.84,
+        1.06, 1.05, 0.97, 1.06, 1.55, 2.77, 2.60, 1.84, 1.32, 0.98, 0.73, 0.47
+    ]),
+    'non_working_day': np.array([
+        0.48, 0.37, 0.28, 0.14, 0.04, 0.05, 0.10, 0.23, 0.56, 0.91, 1.35, 1.66,
+        1.93, 1.97, 1.92, 1.89, 1.86, 1.71, 1.48, 1.22, 0.92, 0.75, 0.61, 0.45
+    ]),
+}
+
+# Mean normalized temperature per month and per hour offset from the daily mean
+MONTHLY_TEMPERATURE = np.array([0.24, 0.30, 0.39, 0.47, 0.59, 0.68, 0.76, 0.71, 0.62, 0.49, 0.37, 0.32])
+HOURLY_TEMPERATURE_OFFSET = np.array([
+    -0.030, -0.038, -0.042, -0.044, -0.050, -0.061, -0.065, -0.058, -0.042, -0.020, 0.004, 0.026,
+    0.043, 0.058, 0.068, 0.072, 0.068, 0.058, 0.044, 0.027, 0.012, -0.002, -0.012, -0.022
+])
+
+# Hour-to-hour transition probabilities between weather situations 1..4
+WEATHER_TRANSITIONS = np.array([
+    [0.920, 0.071, 0.009, 0.000],
+    [0.178, 0.737, 0.085, 0.000],
+    [0.073, 0.273, 0.651, 0.003],
+    [0.000, 0.000, 0.600, 0.400],
+])
+WEATHER_DEMAND_FACTOR = np.array([1.08, 0.92, 0.59, 0.39])
+WEATHER_HUMIDITY = np.array([0.57, 0.70, 0.83, 0.88])
+
+COLUMNS = [
+    'datetime', 'season', 'yr', 'mnth', 'hr', 'holiday', 'weekday', 'workingday', 'weathersit',
+    'temp', 'atemp', 'hum', 'windspeed', 'casual', 'registered', 'cnt'
+]
+
+
+def us_holidays(year: int) -> set:
+    """
+    Return the US federal holidays (plus DC Emancipation Day) of a given year,
+    matching the holiday calendar of the UCI dataset.
+
+    Args:
+        year (int): Calendar year.
+
+    Returns:
+        set: Set of datetime.date objects.
+    """
+    def nth_weekday(month: int, weekday: int, n: int) -> dt.date:
+        first = dt.date(year, month, 1)
+        offset = (weekday - first.weekday()) % 7
+        return first + dt.timedelta(days=offset + 7 * (n - 1))
+
+    def last_weekday(month: int, weekday: int) -> dt.date:
+        last = dt.date(year + month // 12, month % 12 + 1, 1) - dt.timedelta(days=1)
+        return last - dt.timedelta(days=(last.weekday() - weekday) % 7)
+
+    return {
+        dt.date(year, 1, 1),
+        nth_weekday(1, 0, 3),   # Martin Luther King Jr. Day
+        nth_weekday(2, 0, 3),   # Washington's Birthday
+        dt.date(year, 4, 16),   # Emancipation Day (DC)
+        last_weekday(5, 0),     # Memorial Day
+        dt.date(year, 7, 4),
+        nth_weekday(9, 0, 1),   # Labor Day
+        nth_weekday(10, 0, 2),  # Columbus Day
+        dt.date(year, 11, 11),
+        nth_weekday(11, 3, 4),  # Thanksgiving
+        dt.date(year, 12, 25),
+    }
+
+
+class SyntheticDataGenerator:
+    """
+    Generates statistically realistic hourly bike rental data with the same schema
+    as the UCI-derived raw data, for load and scale testing.
+
+    The generated data contains:
+    - Daily and yearly seasonality of temperature, with autocorrelated anomalies
+    - Weather regimes following a Markov chain fitted on the UCI data
+    - Holidays, working days and commute-shaped demand profiles
+    - Optionally many stations sharing the city weather (adds a 'station_id' column)
+
+    Multi-station data interleaves the rows of the stations, which only the per-series
+    training ('training.per_series') consumes; the single-model pipelines expect one
+    row per timestamp. Several stations are therefore rejected unless it is enabled.
+
+    Data is produced chunk by chunk and streamed to parquet, so memory usage is
+    bounded by `chunk_hours * n_stations` rows regardless of the generated span.
+
+    Args:
+        config (Dict[str, Any]): Configuration dictionary containing the 'data_generator' section
+
+    Raises:
+        ValueError: If several stations are requested without per-series training.
+    """
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config['data_generator']
+        self.n_stations = self.config.get('n_stations', 1)
+        if self.n_stations > 1 and not config.get('training', {}).get('per_series', {}).get('enabled', False):
+            raise ValueError(
+                f"{self.n_stations} stations are only consumed by the per-series training, "
+                "enable 'training.per_series' or generate a single station"
+            )
+        self.chunk_hours = self.config.get('chunk_hours', 720)
+        self.rng = np.random.default_rng(self.config.get('seed', 42))
+
+        self.start_timestamp = pd.Timestamp(self.config['start_timestamp'])
+        self.end_timestamp = pd.Timestamp(self.config['end_timestamp'])
+
+        # Each station gets its own demand level, on average at the scale of the UCI data
+        station_factors = self.rng.lognormal(mean=0.0, sigma=0.5, size=self.n_stations)
+        self.station_factors = station_factors / station_factors.mean()
+
+        # Generator state carried across chunks
+        self.weather = 1
+        self.temperature_anomaly = 0.0
+        self.humidity_anomaly = 0.0
+
+    def schema(self) -> pa.Schema:
+        """
+        Build the Arrow schema of the generated data.
+
+        Returns:
+            pa.Schema: Schema matching the raw data (plus 'station_id' when n_stations > 1).
+        """
+        fields = [pa.field('datetime', pa.string())]
+        if self.n_stations > 1:
+            fields.append(pa.field('station_id', pa.int64()))
+        for column in COLUMNS[1:]:
+            dtype = pa.float64() if column in ('temp', 'atemp', 'hum', 'windspeed') else pa.int64()
+            fields.append(pa.field(column, dtype))
+        return pa.schema(fields)
+
+    def simulate_weather(self, n_hours: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Simulate the hourly weather situation, temperature and humidity anomalies.
+
+        Args:
+            n_hours (int): Number of consecutive hours to simulate.
+
+        Returns:
+            Tuple of arrays (weather situation, temperature anomaly, humidity anomaly).
+        """
+        weather = np.empty(n_hours, dtype=np.int64)
+        temperature_anomaly = np.empty(n_hours)
+        humidity_anomaly = np.empty(n_hours)
+        uniform = self.rng.random(n_hours)
+        temperature_noise = self.rng.normal(0.0, 0.024, n_hours)
+        humidity_noise = self.rng.normal(0.0, 0.03, n_hours)
+        cumulative_transitions = WEATHER_TRANSITIONS.cumsum(axis=1)
+
+        for i in range(n_hours):
+            self.weather = int(np.searchsorted(cumulative_transitions[self.weather - 1], uniform[i])) + 1
+            self.weather = min(self.weather, 4)
+            self.temperature_anomaly = 0.97 * self.temperature_anomaly + temperature_noise[i]
+            self.humidity_anomaly = 0.9 * self.humidity_anomaly + humidity_noise[i]
+            weather[i] = self.weather
+            temperature_anomaly[i] = self.temperature_anomaly
+            humidity_anomaly[i] = self.humidity_anomaly
+        return weather, temperature_anomaly, humidity_anomaly
+
+    def generate_chunk(self, timestamps: pd.DatetimeIndex) -> pd.DataFrame:
+        """
+        Generate the data for a block of consecutive hourly timestamps.
+
+        Args:
+            timestamps (pd.DatetimeIndex): Consecutive hourly timestamps.
+
+        Returns:
+            pd.DataFrame: Generated rows ordered by datetime (and station).
+        """
+        n_hours = len(timestamps)
+        month = timestamps.month.to_numpy()
+        hour = timestamps.hour.to_numpy()
+        day_of_year = timestamps.dayofyear.to_numpy()
+        years = (timestamps - self.start_timestamp) / pd.Timedelta(days=365.25)
+
+        holidays = set()
+        for year in np.unique(timestamps.year):
+            holidays |= us_holidays(int(year))
+        holiday = np.isin(timestamps.date, list(holidays)).astype(np.int64)
+        weekday = ((timestamps.dayofweek + 1) % 7).to_numpy()  # 0 = Sunday as in the raw data
+        working_day = ((weekday != 0) & (weekday != 6) & (holiday == 0)).astype(np.int64)
+        season = (month % 12) // 3 + 1
+
+        weather, temperature_anomaly, humidity_anomaly = self.simulate_weather(n_hours)
+
+        # Smooth yearly temperature cycle (interpolated between monthly means)
+        yearly_position = (day_of_year - 15) / 365.25 * 12
+        lower = np.floor(yearly_position).astype(int) % 12
+        upper = (lower + 1) % 12
+        weight = yearly_position - np.floor(yearly_position)
+        temp = (1 - weight) * MONTHLY_TEMPERATURE[lower] + weight * MONTHLY_TEMPERATURE[upper]
+        temp = temp + HOURLY_TEMPERATURE_OFFSET[hour] + temperature_anomaly - 0.02 * (weather >= 3)
+        temp = np.clip(temp, 0.02, 1.0).round(2)
+        atemp = np.clip(0.88 * temp + 0.038 + self.rng.normal(0.0, 0.02, n_hours), 0.0, 1.0).round(4)
+        hum = WEATHER_HUMIDITY[weather - 1] + 0.08 * np.cos(2 * np.pi * (hour - 4) / 24) + humidity_anomaly
+        hum = np.clip(hum, 0.0, 1.0).round(2)
+        windspeed = np.clip(self.rng.gamma(2.4, 0.08, n_hours), 0.0, 0.8507).round(4)
+
+        # Expected city demand
+        profile = np.where(working_day == 1, HOURLY_PROFILE['working_day'][hour], HOURLY_PROFILE['non_working_day'][hour])
+        temperature_factor = np.clip(0.1 + 2.2 * temp - 1.0 * temp ** 2, 0.1, None)
+        growth = (1 + self.config.get('annual_growth', 0.1)) ** np.asarray(years)
+        city_demand = (
+            self.config.get('base_demand', 190.0) * profile * temperature_factor
+            * WEATHER_DEMAND_FACTOR[weather - 1] * growth
+        )
+
+        # Expand to stations: (n_hours, n_stations) with over-dispersed Poisson noise
+        expected = np.outer(city_demand, self.station_factors)
+        rate = expected * self.rng.gamma(8.0, 1 / 8.0, expected.shape)
+        cnt = np.maximum(self.rng.poisson(rate), 1)
+        casual_share = np.where(working_day == 1, 0.14, 0.25) * (0.5 + temp)
+        casual = self.rng.binomial(cnt, np.clip(casual_share, 0.0, 0.9)[:, None])
+
+        n_stations = self.n_stations
+        data = {'datetime': np.repeat(timestamps.strftime('%Y-%m-%d %H:%M:%S').to_numpy(), n_stations)}
+        if n_stations > 1:
+            data['station_id'] = np.tile(np.arange(n_stations, dtype=np.int64), n_hours)
+        per_hour = {
+            'season': season,
+            'yr': timestamps.year.to_numpy() - self.start_timestamp.year,
+            'mnth': month,
+            'hr': hour,
+            'holiday': holiday,
+            'weekday': weekday,
+            'workingday': working_day,
+            'weathersit': weather,
+            'temp': temp,
+            'atemp': atemp,
+            'hum': hum,
+            'windspeed': windspeed,
+        }
+        for column, values in per_hour.items():
+            data[column] = np.repeat(values, n_stations)
+        data['casual'] = casual.ravel().astype(np.int64)
+        data['registered'] = (cnt - casual).ravel().astype(np.int64)
+        data['cnt'] = cnt.ravel().astype(np.int64)
+
+        df = pd.DataFrame(data)
+        int_columns = [col for col in df.columns if col not in ('datetime', 'temp', 'atemp', 'hum', 'windspeed')]
+        df[int_columns] = df[int_columns].astype(np.int64)
+        return df
+
+    def iter_chunks(self) -> Iterator[pd.DataFrame]:
+        """
+        Iterate over the configured time span in chunks of `chunk_hours` hours.
+
+        Yields:
+            pd.DataFrame: Generated rows for each chunk.
+        """
+        chunk_start = self.start_timestamp
+        while chunk_start <= self.end_timestamp:
+            chunk_end = min(chunk_start + pd.Timedelta(hours=self.chunk_hours - 1), self.end_timestamp)
+            yield self.generate_chunk(pd.date_range(chunk_start, chunk_end, freq='h'))
+            chunk_start = chunk_end + pd.Timedelta(hours=1)
+
+    def run(self, config: Dict[str, Any], history_end_timestamp: Optional[str] = None) -> Dict[str, int]:
+        """
+        Generate the data and write it to the locations given by the 'data_manager'
+        section of `config`:
+        - the raw database (rows up to `history_end_timestamp`)
+        - the real-time production data (all rows, as in the bundled data)
+
+        Args:
+            config (Dict[str, Any]): Configuration whose 'data_manager' section gives the output paths.
+            history_end_timestamp (Optional[str]): Last timestamp of the raw database. Defaults to
+                one time increment before 'pipeline_runner.first_timestamp'.
+
+        Returns:
+            Dict[str, int]: Number of rows written to each file.
+        """
+        if history_end_timestamp is None:
+            history_end_timestamp = (
+                pd.Timestamp(config['pipeline_runner']['first_timestamp'])
+                - pd.Timedelta(config['pipeline_runner']['time_increment'])
+            )
+        history_end = pd.Timestamp(history_end_timestamp).strftime('%Y-%m-%d %H:%M:%S')
+
+        raw_data_path = os.path.join(
+            config['data_manager']['raw_data_folder'],
+            config['data_manager']['raw_database_name']
+        )
+        real_time_data_path = os.path.join(
+            config['data_manager']['prod_data_folder'],
+            config['data_manager']['real_time_data_prod_name']
+        )
+        os.makedirs(os.path.dirname(raw_data_path), exist_ok=True)
+        os.makedirs(os.path.dirname(real_time_data_path), exist_ok=True)
+
+        schema = self.schema()
+        rows = {raw_data_path: 0, real_time_data_path: 0}
+        with pq.ParquetWriter(raw_data_path, schema) as raw_writer, \
+                pq.ParquetWriter(real_time_data_path, schema) as real_time_writer:
+            for chunk in self.iter_chunks():
+                table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+                real_time_writer.write_table(table)
+                rows[real_time_data_path] += table.num_rows
+
+                history = chunk.loc[chunk['datetime'] <= history_end]
+                if not history.empty:
+                    raw_writer.write_table(pa.Table.from_pandas(history, schema=schema, preserve_index=False))
+                    rows[raw_data_path] += len(history)
+        return rows
@@ -1,9 +1,18 @@
 import os
 import sys
+import copy
+import json
+import time
+import fcntl
+import shutil
+import uuid
+from contextlib import contextmanager
 from pathlib import Path
 
 import pandas as pd
-from typing import Dict, Any
+import pyarrow as pa
+import pyarrow.parquet as pq
+from typing import Dict, Any, List, Optional, Iterator
 
 
 
@@ -13,13 +22,33 @@ class DataManager:
     and transformations used across the ML pipeline.
 
     Responsibilities:
-    - Initializing production database
+    - Initializing production database (or resuming it from a checkpoint)
+    - Checkpointing the production state
     - Loading and saving parquet files
     - Appending new data to existing datasets
     - Slicing or filtering data by timestamp
     - Saving predictions incrementally
+
+    Appended tables (the production database, the feature store, the shadow predictions)
+    are parquet datasets: a folder of part files read in name order. An append writes
+    the new rows to the last part, which is rewritten until it holds `PART_ROWS` rows,
+    and then starts a new part, so its cost does not grow with the history. The readers
+    below accept a dataset folder or a single parquet file.
     """
 
+    # Files in the production folder coordinating the startup of several processes
+    PROD_LOCK_FILE_NAME = '.prod_init.lock'
+    PROD_READY_FILE_NAME = 'prod_ready.json'
+    CHECKPOINT_FOLDER_NAME = 'checkpoint'
+    # Rows per parquet row group (one year of hourly data), so that windows of recent
+    # rows are read without reading the whole file
+    ROW_GROUP_SIZE = 8760
+    # Rows appended to a part file of a dataset before a new part is started (one month of hourly data)
+    PART_ROWS = 720
+    PART_PREFIX = 'part-'
+    # File of a dataset folder holding its identity
+    DATASET_ID_FILE_NAME = '_dataset_id'
+
     def __init__(self, config: Dict[str, Any]):
         """
         Initialize the DataManager with a configuration dictionary.
@@ -29,6 +58,25 @@ class DataManager:
         """
         self.config = config
 
+    @staticmethod
+    def relocate_config(config: Dict[str, Any], data_root: str) -> Dict[str, Any]:
+        """
+        Return a copy of the configuration whose raw and production data folders
+        live under `data_root` (e.g. synthetic data or a temporary test directory).
+
+        Args:
+            config (Dict[str, Any]): Configuration to relocate.
+            data_root (str): Root folder containing 'raw_data/' and 'prod_data/'.
+
+        Returns:
+            Dict[str, Any]: Relocated copy of the configuration.
+        """
+        relocated = copy.deepcopy(config)
+        relocated['data_manager']['data_root'] = data_root
+        relocated['data_manager']['raw_data_folder'] = os.path.join(data_root, 'raw_data', '')
+        relocated['data_manager']['prod_data_folder'] = os.path.join(data_root, 'prod_data', '')
+        return relocated
+
     def initialize_prod_database(self) -> None:
         """
         Initialize the production database by copying the raw database
@@ -45,9 +93,14 @@ class DataManager:
             self.config['data_manager']['prod_data_folder'],
             self.config['data_manager']['prod_database_name']
         )
-        df = pd.read_parquet(raw_data_path)
-        # Save the data to the prod folder to initialize production "database"
-        df.to_parquet(prod_data_path, index=False)
+        # Copy the raw file to the prod folder to initialize production "database", as the
+        # first part of a dataset. The file is copied as is, so memory usage does not depend on the data size.
+        tmp_folder = f"{prod_data_path}.{os.getpid()}.init"
+        shutil.rmtree(tmp_folder, ignore_errors=True)
+        os.makedirs(tmp_folder)
+        self._copy_file(raw_data_path, self._part_path(tmp_folder, 0), link=False)
+        self.get_dataset_id(tmp_folder)
+        self._replace_path(tmp_folder, prod_data_path)
 
         # If the prediction file exist from the previous runs, we delete it
         prediction_path = os.path.join(
@@ -101,23 +154,266 @@ class DataManager:
         """
         return data.loc[pd.to_datetime(data['datetime']) == pd.to_datetime(timestamp)].copy()
 
+    @staticmethod
+    def list_parts(path: str) -> List[str]:
+        """
+        Parquet files of a dataset folder in row order, or the file itself for a parquet file.
+
+        Args:
+            path (str): Dataset folder or parquet file.
+
+        Returns:
+            List[str]: Paths of the part files.
+        """
+        if not os.path.isdir(path):
+            return [path]
+        return sorted(
+            os.path.join(path, name) for name in os.listdir(path)
+            if name.startswith(DataManager.PART_PREFIX) and name.endswith('.parquet')
+        )
+
+    @staticmethod
+    def count_rows(path: str) -> int:
+        """
+        Number of rows of a dataset (or parquet file), read from the file footers.
+
+        Args:
+            path (str): Dataset folder or parquet file.
+
+        Returns:
+            int: Number of rows.
+        """
+        return sum(pq.read_metadata(part).num_rows for part in DataManager.list_parts(path))
+
+    @staticmethod
+    def read_schema(path: str) -> pa.Schema:
+        """Arrow schema of a dataset (or parquet file)."""
+        return pq.read_schema(DataManager.list_parts(path)[0])
+
+    @staticmethod
+    def get_dataset_id(path: str) -> Optional[str]:
+        """
+        Identity of a dataset, created once with the dataset and kept by its copies
+        (checkpoints). Two datasets never share it, e.g. the production databases of two
+        data roots, or a database before and after a reset.
+
+        Args:
+            path (str): Dataset folder.
+
+        Returns:
+            Optional[str]: Identity, None for a single parquet file.
+        """
+        if not os.path.isdir(path):
+            return None
+        id_path = os.path.join(path, DataManager.DATASET_ID_FILE_NAME)
+        if not os.path.exists(id_path):
+            # Published with a hard link, which fails if another process created it first
+            tmp_path = f"{id_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                f.write(uuid.uuid4().hex)
+            try:
+                os.link(tmp_path, id_path)
+            except FileExistsError:
+                pass
+            finally:
+                os.remove(tmp_path)
+        with open(id_path) as f:
+            return f.read().strip()
+
     @staticmethod
     def load_data(path: str) -> pd.DataFrame:
         """
-        Load a DataFrame from a parquet file.
+        Load a DataFrame from a parquet file or dataset.
 
         Args:
-            path (str): Path to the parquet file.
+            path (str): Path to the parquet file or dataset folder.
 
         Returns:
             pd.DataFrame: Loaded data.
         """
-        return pd.read_parquet(path)
+        if not os.path.isdir(path):
+            return pd.read_parquet(path)
+        return pa.concat_tables([pq.read_table(part) for part in DataManager.list_parts(path)]).to_pandas()
+
+    @staticmethod
+    def load_last_rows(path: str, n: int) -> pd.DataFrame:
+        """
+        Load only the last `n` rows of a parquet file or dataset, reading the row groups
+        from the end until enough rows are collected.
+
+        Args:
+            path (str): Path to the parquet file or dataset folder.
+            n (int): Number of rows to load.
+
+        Returns:
+            pd.DataFrame: The last `n` rows (fewer if the data is smaller).
+        """
+        tables, n_rows = [], 0
+        for part in reversed(DataManager.list_parts(path)):
+            parquet_file = pq.ParquetFile(part)
+            row_groups = []
+            for i in reversed(range(parquet_file.num_row_groups)):
+                row_groups.insert(0, i)
+                n_rows += parquet_file.metadata.row_group(i).num_rows
+                if n_rows >= n:
+                    break
+            tables.insert(0, parquet_file.read_row_groups(row_groups))
+            if n_rows >= n:
+                break
+        table = pa.concat_tables(tables)
+        return table.slice(max(table.num_rows - n, 0)).to_pandas()
+
+    @staticmethod
+    def load_column(path: str, column: str, since: Optional[Any] = None) -> pd.Series:
+        """
+        Load a single column of a parquet file or dataset, optionally only the rows where it
+        is greater than or equal to `since` (row groups entirely before `since` are skipped).
+
+        Args:
+            path (str): Path to the parquet file or dataset folder.
+            column (str): Column to load.
+            since (Optional[Any]): Lower bound of the column values, e.g. a timestamp.
+
+        Returns:
+            pd.Series: The column values.
+        """
+        filters = None
+        if since is not None:
+            # Compare with the stored type, e.g. 'datetime' is stored as 'YYYY-MM-DD HH:MM:SS' strings
+            if pa.types.is_string(DataManager.read_schema(path).field(column).type):
+                since = str(pd.Timestamp(since))
+            filters = [(column, '>=', since)]
+        tables = [pq.read_table(part, columns=[column], filters=filters) for part in DataManager.list_parts(path)]
+        return pa.concat_tables(tables).column(column).to_pandas()
+
+    @staticmethod
+    def append_to_parquet(data: pd.DataFrame, path: str) -> None:
+        """
+        Append rows to a parquet dataset, created if it does not exist. The rows are added
+        to the last part file while it has fewer than `PART_ROWS` rows (the part is replaced
+        atomically), otherwise to a new part, so the cost of an append is bounded by
+        `PART_ROWS` and not by the size of the dataset. A single parquet file (e.g. a
+        database written before datasets were used) is first turned into the first part
+        of a dataset.
+
+        Args:
+            data (pd.DataFrame): Rows to append.
+            path (str): Path to the dataset folder.
+
+        Returns:
+            None
+        """
+        if not os.path.exists(path):
+            DataManager.save_dataset(data, path)
+            return
+        if not os.path.isdir(path):
+            DataManager._file_to_dataset(path)
+        last_part = DataManager.list_parts(path)[-1]
+        existing_rows = pq.read_metadata(last_part).num_rows
+        new_rows = pa.Table.from_pandas(data, schema=pq.read_schema(last_part), preserve_index=False)
+        if existing_rows < DataManager.PART_ROWS:
+            part_path, table = last_part, pa.concat_tables([pq.read_table(last_part), new_rows])
+        else:
+            index = int(os.path.basename(last_part)[len(DataManager.PART_PREFIX):-len('.parquet')]) + 1
+            part_path, table = DataManager._part_path(path, index), new_rows
+        tmp_path = f"{part_path}.{os.getpid()}.tmp"
+        pq.write_table(table, tmp_path, row_group_size=DataManager.ROW_GROUP_SIZE)
+        os.replace(tmp_path, part_path)
+
+    @staticmethod
+    def save_dataset(data: pd.DataFrame, path: str, metadata: Optional[Dict[str, str]] = None) -> None:
+        """
+        Write a DataFrame as a new parquet dataset, replacing the data at `path`.
+
+        Args:
+            data (pd.DataFrame): Data to be saved.
+            path (str): Dataset folder.
+            metadata (Optional[Dict[str, str]]): Entries added to the schema metadata, kept by
+                the parts appended later (see `read_schema`).
+
+        Returns:
+            None
+        """
+        tmp_folder = f"{path}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp_folder, ignore_errors=True)
+        os.makedirs(tmp_folder)
+        table = pa.Table.from_pandas(data, preserve_index=False)
+        if metadata:
+            table = table.replace_schema_metadata({**(table.schema.metadata or {}), **metadata})
+        pq.write_table(table, DataManager._part_path(tmp_folder, 0), row_group_size=DataManager.ROW_GROUP_SIZE)
+        DataManager._replace_path(tmp_folder, path)
+
+    @staticmethod
+    def _part_path(path: str, index: int) -> str:
+        return os.path.join(path, f"{DataManager.PART_PREFIX}{index:06d}.parquet")
+
+    @staticmethod
+    def _file_to_dataset(path: str) -> None:
+        tmp_folder = f"{path}.{os.getpid()}.tmp"
+        os.makedirs(tmp_folder, exist_ok=True)
+        os.replace(path, DataManager._part_path(tmp_folder, 0))
+        os.replace(tmp_folder, path)
+
+    @staticmethod
+    def _replace_path(src: str, dst: str) -> None:
+        # A folder cannot atomically replace another one: the old one is moved away first
+        if os.path.isdir(src) or os.path.isdir(dst):
+            old_path = f"{dst}.{os.getpid()}.old"
+            if os.path.lexists(dst):
+                os.replace(dst, old_path)
+            os.replace(src, dst)
+            if os.path.isdir(old_path):
+                shutil.rmtree(old_path, ignore_errors=True)
+            elif os.path.lexists(old_path):
+                os.remove(old_path)
+        else:
+            os.replace(src, dst)
+
+    @staticmethod
+    def copy_file_atomic(src: str, dst: str, link: bool = False) -> None:
+        """
+        Copy a file (or a dataset folder) so that readers of `dst` see either the old or
+        the new data, never a partial one.
+
+        Args:
+            src (str): Source file or dataset folder.
+            dst (str): Destination.
+            link (bool): Hard link instead of copying when possible (constant time). Only safe for
+                files that are never modified in place, which holds for files written by this class.
+
+        Returns:
+            None
+        """
+        tmp_path = f"{dst}.{os.getpid()}.tmp"
+        if os.path.isdir(tmp_path):
+            shutil.rmtree(tmp_path)
+        elif os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        if os.path.isdir(src):
+            os.makedirs(tmp_path)
+            for name in os.listdir(src):
+                if not name.endswith('.tmp'):
+                    DataManager._copy_file(os.path.join(src, name), os.path.join(tmp_path, name), link)
+        else:
+            DataManager._copy_file(src, tmp_path, link)
+        DataManager._replace_path(tmp_path, dst)
+
+    @staticmethod
+    def _copy_file(src: str, dst: str, link: bool) -> None:
+        if link:
+            try:
+                os.link(src, dst)
+                return
+            except OSError:
+                # e.g. cross-device or a file system without hard links
+                pass
+        shutil.copyfile(src, dst)
 
     @staticmethod
     def save_data(data: pd.DataFrame, path: str) -> None:
         """
-        Save a DataFrame to a CSV file.
+        Save a DataFrame to a parquet file. The file is replaced atomically,
+        so concurrent readers (e.g. the UI) never see a partially written file.
 
         Args:
             data (pd.DataFrame): Data to be saved.
@@ -126,7 +422,9 @@ class DataManager:
         Returns:
             None
         """
-        data.to_parquet(path, index=False)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        data.to_parquet(tmp_path, index=False, row_group_size=DataManager.ROW_GROUP_SIZE)
+        os.replace(tmp_path, path)
 
     def save_predictions(self, df_pred: pd.DataFrame, current_timestamp: pd.Timestamp) -> None:
         """
@@ -151,15 +449,19 @@ class DataManager:
                 # Start fresh for first timestamp
                 combined_df = df_pred
             else:
-                # Append to existing predictions
+                # Append to existing predictions, replacing a prediction for the same time
+                # (e.g. a step repeated after resuming from a checkpoint)
                 existing_pred_df = pd.read_parquet(prediction_path)
+                existing_pred_df = existing_pred_df[
+                    pd.to_datetime(existing_pred_df['datetime']) != pd.to_datetime(df_pred['datetime'].iloc[0])
+                ]
                 combined_df = pd.concat([existing_pred_df, df_pred], ignore_index=True)
         else:
             # File doesn't exist yet
             combined_df = df_pred
 
         # Save final DataFrame
-        combined_df.to_parquet(prediction_path, index=False)
+        self.save_data(combined_df, prediction_path)
 
     def load_prod_data(self) -> pd.DataFrame:
         """
@@ -187,4 +489,222 @@ class DataManager:
         )
         df = self.load_data(prediction_path)
         df['datetime'] = pd.to_datetime(df['datetime'])
-        return df 
\ No newline at end of file
+        return df
+
+    def _prod_path(self, name: str) -> str:
+        return os.path.join(self.config['data_manager']['prod_data_folder'], name)
+
+    @contextmanager
+    def prod_init_lock(self, timeout_s: float) -> Iterator[None]:
+        """
+        Hold the production initialization lock (an exclusive lock on a file in the
+        production folder, shared by all containers mounting it).
+
+        Args:
+            timeout_s (float): Maximum time to wait for the lock.
+
+        Yields:
+            None
+
+        Raises:
+            TimeoutError: If the lock could not be acquired in time.
+        """
+        lock_path = self._prod_path(self.PROD_LOCK_FILE_NAME)
+        os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+        with open(lock_path, 'a') as lock_file:
+            deadline = time.monotonic() + timeout_s
+            while True:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if time.monotonic() > deadline:
+                        raise TimeoutError(f"Could not acquire {lock_path} within {timeout_s}s")
+                    time.sleep(0.1)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def is_prod_ready(self) -> bool:
+        """
+        Check the readiness signal of the production database.
+
+        Returns:
+            bool: True if the production database has been initialized and is ready to use.
+        """
+        return os.path.exists(self._prod_path(self.PROD_READY_FILE_NAME))
+
+    def wait_until_prod_ready(self, timeout_s: float) -> None:
+        """
+        Block until the production database is ready (initialized by another process).
+
+        Args:
+            timeout_s (float): Maximum time to wait.
+
+        Raises:
+            TimeoutError: If the production database is not ready in time.
+        """
+        deadline = time.monotonic() + timeout_s
+        while not self.is_prod_ready():
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Production database not ready within {timeout_s}s")
+            time.sleep(0.2)
+
+    def _set_prod_ready(self, info: Optional[Dict[str, Any]]) -> None:
+        ready_path = self._prod_path(self.PROD_READY_FILE_NAME)
+        if info is None:
+            if os.path.exists(ready_path):
+                os.remove(ready_path)
+            return
+        tmp_path = f"{ready_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(info, f, default=str)
+        os.replace(tmp_path, ready_path)
+
+    def prepare_prod_database(self, mode: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Make the production database ready for use, with a single process doing the work.
+
+        The first process to take the initialization lock prepares the database, the others
+        wait for the lock and find it ready. Modes:
+        - 'resume': reuse the production files if they are ready, otherwise restore the latest
+          checkpoint, otherwise initialize from the raw database (first start).
+        - 'reset': initialize from the raw database and drop predictions and checkpoints.
+
+        Args:
+            mode (Optional[str]): 'resume' or 'reset', defaults to 'data_manager.startup.mode'.
+
+        Returns:
+            Dict[str, Any]: The action taken ('reused', 'restored' or 'initialized') and the
+            restored checkpoint state, if any.
+        """
+        startup_config = self.config['data_manager'].get('startup', {})
+        mode = mode or startup_config.get('mode', 'reset')
+        if mode not in ('resume', 'reset'):
+            raise ValueError(f"Unknown startup mode: {mode}")
+
+        with self.prod_init_lock(timeout_s=startup_config.get('lock_timeout_s', 120)):
+            prod_data_path = self._prod_path(self.config['data_manager']['prod_database_name'])
+            state = None
+            if mode == 'resume' and self.is_prod_ready() and self._is_readable(prod_data_path):
+                action = 'reused'
+            else:
+                self._set_prod_ready(None)
+                state = self.restore_checkpoint() if mode == 'resume' else None
+                if state is not None:
+                    action = 'restored'
+                else:
+                    self.initialize_prod_database()
+                    self.clear_checkpoints()
+                    action = 'initialized'
+            result = {'action': action, 'mode': mode, 'state': state, 'pid': os.getpid(), 'time': time.time()}
+            if action != 'reused':
+                self._set_prod_ready(result)
+        return result
+
+    @staticmethod
+    def _is_readable(path: str) -> bool:
+        try:
+            parts = DataManager.list_parts(path)
+            for part in parts:
+                pq.read_metadata(part)
+            return bool(parts)
+        except (OSError, pa.ArrowException):
+            return False
+
+    def _checkpoint_folder(self) -> str:
+        return self._prod_path(self.CHECKPOINT_FOLDER_NAME)
+
+    def save_checkpoint(self, state: Dict[str, Any]) -> str:
+        """
+        Checkpoint the production database and predictions together with `state`
+        (e.g. the inference cursor and the model version).
+
+        The files are hard-linked into a new snapshot folder when possible (constant time),
+        and the snapshot becomes current by atomically replacing the 'CURRENT' pointer,
+        so a crash never leaves a partially written checkpoint. Older snapshots are removed.
+
+        Args:
+            state (Dict[str, Any]): JSON-serializable state saved with the snapshot.
+
+        Returns:
+            str: Path of the snapshot folder.
+        """
+        checkpoint_folder = self._checkpoint_folder()
+        snapshot_id = f"{time.time_ns()}"
+        snapshot_folder = os.path.join(checkpoint_folder, snapshot_id)
+        os.makedirs(snapshot_folder, exist_ok=True)
+
+        files = []
+        for name in (self.config['data_manager']['prod_database_name'],
+                     self.config['data_manager']['real_time_prediction_data_name']):
+            if os.path.exists(self._prod_path(name)):
+                self.copy_file_atomic(self._prod_path(name), os.path.join(snapshot_folder, name), link=True)
+                files.append(name)
+
+        with open(os.path.join(snapshot_folder, 'state.json'), 'w') as f:
+            json.dump({'state': state, 'files': files}, f, default=str)
+
+        # Publish the snapshot, then drop the previous ones
+        pointer_path = os.path.join(checkpoint_folder, 'CURRENT')
+        tmp_path = f"{pointer_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(snapshot_id)
+        os.replace(tmp_path, pointer_path)
+        for name in os.listdir(checkpoint_folder):
+            if name not in (snapshot_id, 'CURRENT') and os.path.isdir(os.path.join(checkpoint_folder, name)):
+                shutil.rmtree(os.path.join(checkpoint_folder, name), ignore_errors=True)
+        return snapshot_folder
+
+    def load_checkpoint(self) -> Optional[Dict[str, Any]]:
+        """
+        Read the current checkpoint, if any.
+
+        Returns:
+            Optional[Dict[str, Any]]: {'state', 'files', 'folder'} of the current snapshot, or None.
+        """
+        pointer_path = os.path.join(self._checkpoint_folder(), 'CURRENT')
+        if not os.path.exists(pointer_path):
+            return None
+        with open(pointer_path) as f:
+            snapshot_folder = os.path.join(self._checkpoint_folder(), f.read().strip())
+        state_path = os.path.join(snapshot_folder, 'state.json')
+        if not os.path.exists(state_path):
+            return None
+        with open(state_path) as f:
+            checkpoint = json.load(f)
+        checkpoint['folder'] = snapshot_folder
+        return checkpoint
+
+    def restore_checkpoint(self) -> Optional[Dict[str, Any]]:
+        """
+        Restore the production files from the current checkpoint. Runs in time
+        proportional to the snapshot (hard links when possible), not to the raw data.
+
+        Returns:
+            Optional[Dict[str, Any]]: The restored state, or None if there is no checkpoint.
+        """
+        checkpoint = self.load_checkpoint()
+        if checkpoint is None:
+            return None
+        if self.config['data_manager']['prod_database_name'] not in checkpoint['files']:
+            return None
+        for name in (self.config['data_manager']['prod_database_name'],
+                     self.config['data_manager']['real_time_prediction_data_name']):
+            if name in checkpoint['files']:
+                self.copy_file_atomic(os.path.join(checkpoint['folder'], name), self._prod_path(name), link=True)
+            elif os.path.isdir(self._prod_path(name)):
+                shutil.rmtree(self._prod_path(name))
+            elif os.path.exists(self._prod_path(name)):
+                os.remove(self._prod_path(name))
+        return checkpoint['state']
+
+    def clear_checkpoints(self) -> None:
+        """
+        Remove all checkpoints.
+
+        Returns:
+            None
+        """
+        shutil.rmtree(self._checkpoint_folder(), ignore_errors=True)
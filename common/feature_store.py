@@ -0,0 +1,136 @@
+import os
+import json
+import fcntl
+import hashlib
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, Optional
+
+import pandas as pd
+
+from common.data_manager import DataManager
+
+
+class FeatureStore:
+    """
+    Materialized features of the production database, stored next to it.
+
+    The store holds one feature row per production row, keyed by the row's 'datetime',
+    in a parquet dataset named after the feature config version, so that a config change
+    starts a new store instead of mixing feature definitions. It lives in the production
+    data folder and records the identity of the production database it was materialized
+    from, so a store is never used for another database (another data root, or the
+    database after a reset). The inference service appends the features of every new
+    production row, and training reads the materialized matrix instead of recomputing
+    it, as long as the store covers exactly the rows of the production database.
+    Materializations (by trainings, possibly in other processes) and appends hold the
+    store's lock and check that the store covers the rows they extend.
+
+    Args:
+        config (Dict[str, Any]): Application configuration with a 'feature_store' section.
+        feature_config (Dict[str, Any]): Everything the features depend on (versions the store).
+
+    Attributes:
+        enabled (bool): If False, features are always computed.
+        version (str): Feature config version.
+        path (str): Parquet dataset of the store.
+    """
+    KEY_COLUMN = 'datetime'
+    DATABASE_ID_KEY = b'database_id'
+
+    def __init__(self, config: Dict[str, Any], feature_config: Dict[str, Any]):
+        store_config = config.get('feature_store', {})
+        self.enabled: bool = store_config.get('enabled', False)
+        self.version: str = hashlib.sha256(
+            json.dumps(feature_config, sort_keys=True, default=str).encode()
+        ).hexdigest()[:12]
+        self.path: str = os.path.join(
+            config['data_manager']['prod_data_folder'], 'feature_store', f"features-{self.version}.parquet"
+        )
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        """
+        Hold the store's lock (an exclusive lock on a file next to the store, shared by
+        all processes), serializing materializations, appends and reads.
+
+        Yields:
+            None
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(os.path.join(os.path.dirname(self.path), f".features-{self.version}.lock"), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def is_synced(self, n_rows: int, last_key: Any, database_id: Optional[str]) -> bool:
+        """
+        Check that the store covers exactly the given production rows.
+
+        Args:
+            n_rows (int): Number of production rows.
+            last_key (Any): 'datetime' of the last production row.
+            database_id (Optional[str]): Identity of the production database (see `DataManager.get_dataset_id`).
+
+        Returns:
+            bool: True if the store was materialized from this database, has `n_rows` rows
+            and ends with `last_key`.
+        """
+        if not self.enabled or database_id is None or not os.path.exists(self.path):
+            return False
+        metadata = DataManager.read_schema(self.path).metadata or {}
+        if metadata.get(self.DATABASE_ID_KEY) != database_id.encode():
+            return False
+        if DataManager.count_rows(self.path) != n_rows:
+            return False
+        stored_key = DataManager.load_last_rows(self.path, 1)[self.KEY_COLUMN].iloc[-1]
+        return str(stored_key) == str(last_key)
+
+    def write(self, features: pd.DataFrame, keys: pd.Series, database_id: str) -> None:
+        """
+        Materialize the features of all production rows, replacing the store.
+
+        Args:
+            features (pd.DataFrame): Feature rows, in production row order.
+            keys (pd.Series): 'datetime' of the rows.
+            database_id (str): Identity of the production database.
+
+        Returns:
+            None
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        DataManager.save_dataset(
+            self._with_keys(features, keys), self.path, metadata={self.DATABASE_ID_KEY: database_id.encode()}
+        )
+
+    def append(self, features: pd.DataFrame, keys: pd.Series) -> None:
+        """
+        Append the features of new production rows.
+
+        Args:
+            features (pd.DataFrame): Feature rows of the new rows.
+            keys (pd.Series): 'datetime' of the new rows.
+
+        Returns:
+            None
+        """
+        DataManager.append_to_parquet(self._with_keys(features, keys), self.path)
+
+    def read(self, n_last: Optional[int] = None) -> pd.DataFrame:
+        """
+        Read the materialized features (without the key column).
+
+        Args:
+            n_last (Optional[int]): Only read the last `n_last` rows.
+
+        Returns:
+            pd.DataFrame: Feature rows, in production row order.
+        """
+        df = DataManager.load_data(self.path) if n_last is None else DataManager.load_last_rows(self.path, n_last)
+        return df.drop(columns=[self.KEY_COLUMN]).reset_index(drop=True)
+
+    def _with_keys(self, features: pd.DataFrame, keys: pd.Series) -> pd.DataFrame:
+        return pd.concat(
+            [pd.DataFrame({self.KEY_COLUMN: keys.astype(str).to_numpy()}), features.reset_index(drop=True)], axis=1
+        )
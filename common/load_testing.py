@@ -0,0 +1,317 @@
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import tempfile
+import threading
+import importlib.util
+import urllib.error
+import urllib.request
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+import yaml
+from werkzeug.serving import make_server, WSGIRequestHandler
+
+from common.data_manager import DataManager
+
+
+project_root = Path(__file__).resolve().parents[1]
+
+
+def dash_update_graphs_payload(lookback_hours: int = 12, parameters: Optional[List[str]] = None,
+                               inference_trigger: int = 0) -> Dict[str, Any]:
+    """
+    Build the request body Dash sends to '/_dash-update-component' for the
+    `update_graphs` callback of the UI.
+
+    Args:
+        lookback_hours (int): Value of the 'lookback-hours' input.
+        parameters (Optional[List[str]]): Selected features of the 'parameter-dropdown'.
+        inference_trigger (int): Value of the 'inference-trigger' store.
+
+    Returns:
+        Dict[str, Any]: JSON body of the callback request.
+    """
+    return {
+        'output': '..graph-1.figure...graph-2.figure..',
+        'outputs': [
+            {'id': 'graph-1', 'property': 'figure'},
+            {'id': 'graph-2', 'property': 'figure'},
+        ],
+        'inputs': [
+            {'id': 'lookback-hours', 'property': 'value', 'value': lookback_hours},
+            {'id': 'parameter-dropdown', 'property': 'value', 'value': parameters or ['temp', 'hum']},
+            {'id': 'shared-xaxis-range', 'property': 'data', 'value': None},
+            {'id': 'inference-trigger', 'property': 'data', 'value': inference_trigger},
+        ],
+        'changedPropIds': ['inference-trigger.data'],
+        'state': [],
+    }
+
+
+def build_requests(api_url: Optional[str], ui_url: Optional[str], config: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    Build the request definitions the load generator can send.
+
+    Args:
+        api_url (Optional[str]): Base URL of the inference API (skipped if None).
+        ui_url (Optional[str]): Base URL of the Dash UI (skipped if None).
+        config (Dict[str, Any]): Application configuration.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Request name -> {'method', 'url', 'body'}.
+    """
+    requests = {}
+    if api_url:
+        endpoint = config.get('inference_api', {}).get('endpoint', '/run-inference')
+        requests['run_inference'] = {'method': 'POST', 'url': f"{api_url}{endpoint}", 'body': None}
+        requests['health'] = {'method': 'GET', 'url': f"{api_url}/health", 'body': None}
+    if ui_url:
+        body = dash_update_graphs_payload(lookback_hours=config['ui']['default_lookback_hours'])
+        requests['update_graphs'] = {'method': 'POST', 'url': f"{ui_url}/_dash-update-component", 'body': body}
+    return requests
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    """Request handler that does not log every request (the load test would flood the console)."""
+    def log_request(self, *args, **kwargs) -> None:
+        pass
+
+
+class AppServer:
+    """
+    Serves a WSGI application from a background thread on a free local port.
+
+    Args:
+        wsgi_app: WSGI application (e.g. a Flask app or `dash_app.server`).
+        host (str): Interface to bind.
+        port (int): Port to bind, 0 picks a free port.
+    """
+    def __init__(self, wsgi_app, host: str = '127.0.0.1', port: int = 0):
+        self.server = make_server(host, port, wsgi_app, threaded=True, request_handler=QuietRequestHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.server.host}:{self.server.port}"
+
+    def start(self) -> 'AppServer':
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.thread.join()
+
+
+def _import_from_path(module_name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def prepare_data_root(config: Dict[str, Any], data_root: str) -> Dict[str, Any]:
+    """
+    Copy the configured raw database and real-time data into `data_root`
+    and return the configuration relocated to it.
+
+    Args:
+        config (Dict[str, Any]): Application configuration with the source data locations.
+        data_root (str): Temporary data folder.
+
+    Returns:
+        Dict[str, Any]: Configuration pointing to `data_root`.
+    """
+    relocated = DataManager.relocate_config(config, data_root)
+    for folder_key, name_key in [('raw_data_folder', 'raw_database_name'),
+                                 ('prod_data_folder', 'real_time_data_prod_name')]:
+        os.makedirs(relocated['data_manager'][folder_key], exist_ok=True)
+        shutil.copyfile(
+            os.path.join(config['data_manager'][folder_key], config['data_manager'][name_key]),
+            os.path.join(relocated['data_manager'][folder_key], config['data_manager'][name_key])
+        )
+    return relocated
+
+
+def start_apps_in_process(config: Dict[str, Any], start_ui: bool = True) -> Tuple[AppServer, Optional[AppServer], str]:
+    """
+    Start the inference API (and optionally the Dash UI) in this process against
+    a copy of the data in a temporary directory.
+
+    Args:
+        config (Dict[str, Any]): Application configuration with the source data locations.
+        start_ui (bool): Whether to start the Dash UI as well.
+
+    Returns:
+        Tuple of (API server, UI server or None, temporary data directory).
+    """
+    data_root = tempfile.mkdtemp(prefix='load_test_')
+    app_config = prepare_data_root(config, data_root)
+
+    inference_api = _import_from_path('inference_api', project_root / 'app-ml' / 'entrypoint' / 'inference_api.py')
+    api_server = AppServer(inference_api.init_app(app_config)).start()
+
+    ui_server = None
+    if start_ui:
+        # The UI reads its configuration at import time, point it to the API started above
+        app_config['inference_api']['host'] = api_server.server.host
+        app_config['inference_api']['port'] = api_server.server.port
+        config_path = os.path.join(data_root, 'config.yaml')
+        with open(config_path, 'w') as f:
+            yaml.safe_dump(app_config, f)
+        os.environ['CONFIG_PATH'] = config_path
+        ui_app = _import_from_path('ui_app', project_root / 'app-ui' / 'app.py')
+        ui_server = AppServer(ui_app.server).start()
+    return api_server, ui_server, data_root
+
+
+class LoadGenerator:
+    """
+    Thread-based closed-loop load generator: `concurrency` workers each send
+    requests back to back, picking the request type according to a weighted mix.
+
+    Args:
+        requests (Dict[str, Dict[str, Any]]): Request definitions from `build_requests`.
+        request_mix (Dict[str, float]): Relative weight of each request name.
+        concurrency (int): Number of concurrent workers (simulated users).
+        duration_s (Optional[float]): Stop after this many seconds.
+        n_requests (Optional[int]): Stop after this many requests in total.
+        timeout_s (float): Per-request timeout.
+        seed (int): Seed of the request mix sampling.
+    """
+    def __init__(self, requests: Dict[str, Dict[str, Any]], request_mix: Dict[str, float], concurrency: int,
+                 duration_s: Optional[float] = None, n_requests: Optional[int] = None,
+                 timeout_s: float = 30.0, seed: int = 42):
+        if duration_s is None and n_requests is None:
+            raise ValueError("Either duration_s or n_requests must be set")
+        self.requests = requests
+        self.request_mix = {name: weight for name, weight in request_mix.items() if name in requests and weight > 0}
+        if not self.request_mix:
+            raise ValueError(f"Request mix {request_mix} has no available request among {list(requests)}")
+        self.concurrency = concurrency
+        self.duration_s = duration_s
+        self.n_requests = n_requests
+        self.timeout_s = timeout_s
+        self.seed = seed
+
+        self.results: List[Tuple[str, float, bool]] = []
+        self._lock = threading.Lock()
+        self._sent = 0
+
+    def send(self, name: str) -> Tuple[float, bool]:
+        """
+        Send one request and measure its latency.
+
+        Args:
+            name (str): Request name.
+
+        Returns:
+            Tuple of (latency in seconds, success flag).
+        """
+        spec = self.requests[name]
+        data = json.dumps(spec['body']).encode() if spec['body'] is not None else None
+        request = urllib.request.Request(spec['url'], data=data, method=spec['method'],
+                                         headers={'Content-Type': 'application/json'})
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout_s) as response:
+                response.read()
+                ok = 200 <= response.status < 300
+        except (urllib.error.URLError, OSError):
+            ok = False
+        return time.perf_counter() - start, ok
+
+    def _next_request(self, deadline: Optional[float]) -> bool:
+        with self._lock:
+            if self.n_requests is not None and self._sent >= self.n_requests:
+                return False
+            self._sent += 1
+        return deadline is None or time.perf_counter() < deadline
+
+    def _worker(self, worker_id: int, deadline: Optional[float]) -> None:
+        rng = random.Random(self.seed + worker_id)
+        names, weights = list(self.request_mix), list(self.request_mix.values())
+        while self._next_request(deadline):
+            name = rng.choices(names, weights=weights)[0]
+            latency, ok = self.send(name)
+            with self._lock:
+                self.results.append((name, latency, ok))
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Run the load test.
+
+        Returns:
+            Dict[str, Any]: Summary computed by `summarize`.
+        """
+        self.results = []
+        self._sent = 0
+        start = time.perf_counter()
+        deadline = start + self.duration_s if self.duration_s is not None else None
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for future in [executor.submit(self._worker, i, deadline) for i in range(self.concurrency)]:
+                future.result()
+        return summarize(self.results, elapsed_s=time.perf_counter() - start, concurrency=self.concurrency)
+
+
+def summarize(results: List[Tuple[str, float, bool]], elapsed_s: float, concurrency: int) -> Dict[str, Any]:
+    """
+    Compute throughput, latency percentiles and error rates per request type and overall.
+
+    Args:
+        results (List[Tuple[str, float, bool]]): (request name, latency in seconds, success) tuples.
+        elapsed_s (float): Wall time of the test.
+        concurrency (int): Number of workers used.
+
+    Returns:
+        Dict[str, Any]: Summary with one entry per request name plus 'total'.
+    """
+    def stats(rows: List[Tuple[str, float, bool]]) -> Dict[str, float]:
+        latencies_ms = np.array([latency for _, latency, _ in rows]) * 1000
+        errors = sum(1 for _, _, ok in rows if not ok)
+        p50, p90, p95, p99 = np.percentile(latencies_ms, [50, 90, 95, 99]) if len(rows) else [np.nan] * 4
+        return {
+            'requests': len(rows),
+            'errors': errors,
+            'error_rate': errors / len(rows) if rows else 0.0,
+            'throughput_rps': len(rows) / elapsed_s if elapsed_s > 0 else 0.0,
+            'p50_ms': float(p50),
+            'p90_ms': float(p90),
+            'p95_ms': float(p95),
+            'p99_ms': float(p99),
+            'max_ms': float(latencies_ms.max()) if len(rows) else float('nan'),
+        }
+
+    summary = {'elapsed_s': elapsed_s, 'concurrency': concurrency, 'endpoints': {}}
+    for name in sorted({name for name, _, _ in results}):
+        summary['endpoints'][name] = stats([row for row in results if row[0] == name])
+    summary['endpoints']['total'] = stats(results)
+    return summary
+
+
+def format_report(summary: Dict[str, Any]) -> str:
+    """
+    Format a load test summary as a text table.
+
+    Args:
+        summary (Dict[str, Any]): Output of `summarize`.
+
+    Returns:
+        str: Human-readable report.
+    """
+    header = f"{'endpoint':<16}{'requests':>10}{'errors':>8}{'err %':>8}{'rps':>9}" \
+             f"{'p50 ms':>9}{'p90 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}"
+    lines = [f"Concurrency: {summary['concurrency']}, elapsed: {summary['elapsed_s']:.1f}s", header, '-' * len(header)]
+    for name, s in summary['endpoints'].items():
+        lines.append(
+            f"{name:<16}{s['requests']:>10}{s['errors']:>8}{100 * s['error_rate']:>8.1f}{s['throughput_rps']:>9.1f}"
+            f"{s['p50_ms']:>9.1f}{s['p90_ms']:>9.1f}{s['p95_ms']:>9.1f}{s['p99_ms']:>9.1f}{s['max_ms']:>9.1f}"
+        )
+    return '\n'.join(lines)
@@ -0,0 +1,182 @@
+import os
+import json
+import shutil
+import secrets
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+import pandas as pd
+
+from common.data_manager import DataManager
+from common.utils import load_model_metadata, save_model_metadata
+
+
+class ModelRegistry:
+    """
+    Versioned model artifacts next to the production model.
+
+    Every trained model is written to its own folder 'versions/<version>/' (model file
+    and metadata JSON). Activating a version atomically replaces the production model
+    files ('pipeline_runner.model_path'), which the inference service picks up between
+    requests. The activation history allows rolling back to the previous version.
+
+    Args:
+        config (Dict[str, Any]): Application configuration.
+
+    Attributes:
+        model_path (Path): Production model path without extension.
+        versions_folder (Path): Folder of the model versions.
+        history_path (Path): JSON file with the active version and the activation history.
+    """
+    MODEL_SUFFIXES = ('.cbm', '.pkl', '.json')
+
+    def __init__(self, config: Dict[str, Any]):
+        self.model_path = Path(config['pipeline_runner']['model_path'])
+        self.versions_folder = self.model_path.parent / 'versions'
+        self.history_path = self.versions_folder / 'history.json'
+
+    @staticmethod
+    def new_version(timestamp: Optional[pd.Timestamp] = None) -> str:
+        """Return a new, time-ordered version name (from `timestamp`, by default now)."""
+        return f"{timestamp or pd.Timestamp.now():%Y%m%d-%H%M%S}-{secrets.token_hex(3)}"
+
+    def version_model_path(self, version: str) -> str:
+        """Model path (without extension) of a version."""
+        return str(self.versions_folder / version / self.model_path.name)
+
+    def load_history(self) -> Dict[str, Any]:
+        """
+        Load the activation history.
+
+        Returns:
+            Dict[str, Any]: {'active': active version or None, 'history': activated versions, oldest first}.
+        """
+        if not self.history_path.exists():
+            return {'active': None, 'history': []}
+        with open(self.history_path) as f:
+            return json.load(f)
+
+    def _save_history(self, history: Dict[str, Any]) -> None:
+        self.versions_folder.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.history_path.with_suffix(f".json.{os.getpid()}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(history, f, indent=2)
+        os.replace(tmp_path, self.history_path)
+
+    def list_versions(self) -> List[Dict[str, Any]]:
+        """
+        List the saved versions with their metadata, oldest first.
+
+        Returns:
+            List[Dict[str, Any]]: One entry per version with 'version', 'active' and 'metadata'.
+        """
+        if not self.versions_folder.exists():
+            return []
+        active = self.load_history()['active']
+        return [
+            {
+                'version': version,
+                'active': version == active,
+                'metadata': load_model_metadata(self.version_model_path(version)) or {},
+            }
+            for version in sorted(os.listdir(self.versions_folder))
+            if (self.versions_folder / version).is_dir()
+        ]
+
+    def register_production_model(self) -> Optional[str]:
+        """
+        Save the current production model as a version if it is not versioned yet,
+        so that the first activation can be rolled back.
+
+        Returns:
+            Optional[str]: The new version, None if there is nothing to register.
+        """
+        if self.load_history()['active'] is not None:
+            return None
+        sources = [self.model_path.with_suffix(suffix) for suffix in self.MODEL_SUFFIXES]
+        if not any(path.exists() for path in sources[:2]):
+            return None
+        model_file = next(path for path in sources[:2] if path.exists())
+        version = self.new_version(pd.Timestamp.fromtimestamp(os.path.getmtime(model_file)))
+        target = Path(self.version_model_path(version))
+        target.parent.mkdir(parents=True, exist_ok=True)
+        for path in sources:
+            if path.exists():
+                shutil.copyfile(path, target.with_suffix(path.suffix))
+        self._save_history({'active': version, 'history': [version]})
+        return version
+
+    def _install(self, version: str) -> None:
+        source = Path(self.version_model_path(version))
+        if not any(source.with_suffix(suffix).exists() for suffix in self.MODEL_SUFFIXES[:2]):
+            raise FileNotFoundError(f"Model version {version} not found in {self.versions_folder}")
+        # Metadata first: readers reload when the model file changes
+        for suffix in reversed(self.MODEL_SUFFIXES):
+            if source.with_suffix(suffix).exists():
+                DataManager.copy_file_atomic(str(source.with_suffix(suffix)), str(self.model_path.with_suffix(suffix)))
+            elif self.model_path.with_suffix(suffix).exists():
+                os.remove(self.model_path.with_suffix(suffix))
+
+    def activate(self, version: str) -> None:
+        """
+        Make a version the production model.
+
+        Args:
+            version (str): Version to activate.
+
+        Returns:
+            None
+        """
+        self.register_production_model()
+        self._install(version)
+        history = self.load_history()
+        history['active'] = version
+        history['history'].append(version)
+        self._save_history(history)
+
+    def previous_version(self) -> str:
+        """
+        Version that was active before the current one, which `rollback` reactivates.
+
+        Returns:
+            str: The previous version.
+
+        Raises:
+            ValueError: If there is no previous version.
+        """
+        history = self.load_history()
+        if len(history['history']) < 2:
+            raise ValueError("No previous model version to roll back to")
+        return history['history'][-2]
+
+    def rollback(self) -> str:
+        """
+        Reactivate the version that was active before the current one.
+
+        Returns:
+            str: The reactivated version.
+
+        Raises:
+            ValueError: If there is no previous version.
+        """
+        previous = self.previous_version()
+        history = self.load_history()
+        self._install(previous)
+        history['history'] = history['history'][:-1]
+        history['active'] = previous
+        self._save_history(history)
+        return previous
+
+    def tag(self, version: str, metadata: Dict[str, Any]) -> None:
+        """
+        Add entries to the metadata of a version.
+
+        Args:
+            version (str): Model version.
+            metadata (Dict[str, Any]): Entries to add.
+
+        Returns:
+            None
+        """
+        path = self.version_model_path(version)
+        save_model_metadata({**(load_model_metadata(path) or {}), **metadata}, base_path=path)
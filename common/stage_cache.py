@@ -0,0 +1,188 @@
+import os
+import json
+import hashlib
+import inspect
+from typing import Dict, Any, Callable, Optional, Tuple
+
+import pandas as pd
+
+from common.data_manager import DataManager
+from common.utils import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class StageCache:
+    """
+    Memoizes the outputs of pipeline stages on disk.
+
+    A stage output is keyed by the fingerprint of the stage input, the stage's config
+    section and the source code of the stage, and stored as a parquet file in the cache
+    folder. The key of a stage output serves as the input fingerprint of the next stage,
+    so a chain of cached stages never hashes intermediate data. The folder is kept under
+    `max_size_mb` by evicting the least recently used files.
+
+    Args:
+        config (Dict[str, Any]): Application configuration with a 'stage_cache' section.
+
+    Attributes:
+        enabled (bool): If False, stages are always computed.
+        cache_dir (str): Folder of the cached stage outputs.
+        max_size_bytes (int): Maximum total size of the cached files.
+        stats (Dict[str, int]): Number of cache 'hits', 'misses' and 'evictions'.
+    """
+    def __init__(self, config: Dict[str, Any]):
+        cache_config = config.get('stage_cache', {})
+        self.enabled: bool = cache_config.get('enabled', False)
+        self.cache_dir: str = cache_config.get('cache_dir', './data/stage_cache/')
+        self.max_size_bytes: int = int(cache_config.get('max_size_mb', 500) * 1024 * 1024)
+        self.stats: Dict[str, int] = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    @staticmethod
+    def file_fingerprint(path: str) -> str:
+        """
+        Fingerprint of a data file (or of the part files of a dataset folder) from its path,
+        size and modification time, which avoids reading the file to check whether a cached
+        output is valid.
+
+        Args:
+            path (str): Data file or dataset folder.
+
+        Returns:
+            str: Fingerprint of the file.
+        """
+        digest = hashlib.sha256(os.path.abspath(path).encode())
+        for part in DataManager.list_parts(path):
+            stat = os.stat(part)
+            digest.update(f":{os.path.basename(part)}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def data_fingerprint(df: pd.DataFrame) -> str:
+        """
+        Fingerprint of a DataFrame from its content, index, column names and dtypes.
+
+        Args:
+            df (pd.DataFrame): Data.
+
+        Returns:
+            str: Fingerprint of the data.
+        """
+        digest = hashlib.sha256(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+        digest.update(json.dumps([(str(column), str(dtype)) for column, dtype in df.dtypes.items()]).encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def stage_key(stage: Any, input_fingerprint: str, stage_config: Any) -> str:
+        """
+        Cache key of a stage output.
+
+        Args:
+            stage (Any): Stage object (its class source code is part of the key).
+            input_fingerprint (str): Fingerprint of the stage input.
+            stage_config (Any): Config section the stage depends on.
+
+        Returns:
+            str: Cache key.
+        """
+        stage_class = type(stage)
+        digest = hashlib.sha256(stage_class.__qualname__.encode())
+        digest.update(inspect.getsource(stage_class).encode())
+        digest.update(input_fingerprint.encode())
+        digest.update(json.dumps(stage_config, sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.parquet")
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        """
+        Load a cached stage output and mark it as recently used.
+
+        Args:
+            key (str): Cache key.
+
+        Returns:
+            Optional[pd.DataFrame]: The cached output, or None if it is not cached.
+        """
+        path = self._path(key)
+        try:
+            df = pd.read_parquet(path)
+            os.utime(path)
+        except (FileNotFoundError, OSError):
+            return None
+        return df
+
+    def put(self, key: str, df: pd.DataFrame) -> None:
+        """
+        Store a stage output and evict the least recently used outputs above the size limit.
+
+        Args:
+            key (str): Cache key.
+            df (pd.DataFrame): Stage output.
+
+        Returns:
+            None
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        df.to_parquet(tmp_path)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove the least recently used cached outputs until the cache fits in `max_size_bytes`."""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.parquet'):
+                stat = os.stat(os.path.join(self.cache_dir, name))
+                entries.append((stat.st_mtime_ns, stat.st_size, name))
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total_size <= self.max_size_bytes:
+                break
+            os.remove(os.path.join(self.cache_dir, name))
+            total_size -= size
+            self.stats['evictions'] += 1
+
+    def run_stage(
+        self,
+        stage: Any,
+        stage_config: Any,
+        input_fingerprint: str,
+        load_input: Callable[[], pd.DataFrame],
+        run_kwargs: Optional[Dict[str, Any]] = None
+    ) -> Tuple[pd.DataFrame, str]:
+        """
+        Return the output of `stage.run` on the input, from the cache if possible.
+
+        Args:
+            stage (Any): Stage with a `run(df)` method.
+            stage_config (Any): Config section the stage depends on.
+            input_fingerprint (str): Fingerprint of the stage input.
+            load_input (Callable[[], pd.DataFrame]): Loads (or computes) the input, only called on a miss.
+            run_kwargs (Optional[Dict[str, Any]]): Additional arguments of `stage.run`
+                (they must be reflected in `stage_config`).
+
+        Returns:
+            Tuple containing:
+                - The stage output
+                - Its fingerprint, to be passed to the next stage
+        """
+        key = self.stage_key(stage, input_fingerprint, stage_config)
+        run_kwargs = run_kwargs or {}
+        if not self.enabled:
+            return stage.run(df=load_input(), **run_kwargs), key
+
+        df = self.get(key)
+        if df is not None:
+            self.stats['hits'] += 1
+            logger.debug(f"Stage cache hit: {type(stage).__name__}")
+            return df, key
+
+        self.stats['misses'] += 1
+        logger.debug(f"Stage cache miss: {type(stage).__name__}")
+        df = stage.run(df=load_input(), **run_kwargs)
+        self.put(key, df)
+        return df, key
@@ -0,0 +1,317 @@
+import os
+import json
+import time
+import secrets
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+
+
+# (trace_id, span_id) of the span currently active in this thread / task
+_current_span: contextvars.ContextVar = contextvars.ContextVar('current_span', default=None)
+
+
+class Span:
+    """
+    A timed operation of a trace.
+
+    Attributes:
+        name (str): Operation name, e.g. 'pipeline.preprocessing'.
+        trace_id (str): 32 hex characters identifying the trace.
+        span_id (str): 16 hex characters identifying the span.
+        parent_span_id (str): Span id of the parent span ('' for a root span).
+        attributes (Dict[str, Any]): Additional key/values recorded with the span.
+    """
+    def __init__(self, name: str, trace_id: str, parent_span_id: str, attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_span_id = parent_span_id
+        self.attributes = dict(attributes or {})
+        self.start_time_ns = time.time_ns()
+        self.end_time_ns = None
+        self.status = {'code': 'STATUS_CODE_OK'}
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_error(self, error: BaseException) -> None:
+        self.status = {'code': 'STATUS_CODE_ERROR', 'message': str(error)}
+
+    def traceparent(self) -> str:
+        """W3C trace context header value pointing to this span."""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_dict(self, service_name: str) -> Dict[str, Any]:
+        """Serialize with the OpenTelemetry (OTLP JSON) span field names."""
+        return {
+            'resource': {'service.name': service_name},
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'parentSpanId': self.parent_span_id,
+            'name': self.name,
+            'kind': 'SPAN_KIND_INTERNAL',
+            'startTimeUnixNano': self.start_time_ns,
+            'endTimeUnixNano': self.end_time_ns,
+            'attributes': self.attributes,
+            'status': self.status,
+        }
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[Tuple[str, str]]:
+    """
+    Parse a W3C 'traceparent' header.
+
+    Args:
+        header (Optional[str]): Header value, e.g. '00-<trace id>-<parent span id>-01'.
+
+    Returns:
+        Optional[Tuple[str, str]]: (trace id, parent span id), or None if missing or malformed.
+    """
+    if not header:
+        return None
+    parts = header.strip().split('-')
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    return parts[1], parts[2]
+
+
+class Tracer:
+    """
+    Records spans and exports them as JSON lines to a local file, without a collector.
+
+    Spans opened with `span()` nest automatically (the active span is tracked in a
+    context variable), and `traceparent` headers propagate a trace across services.
+
+    Args:
+        service_name (str): Name of the service recording the spans.
+        trace_file (Optional[str]): JSON-lines file the spans are appended to.
+        enabled (bool): If False, spans are not recorded (no-op tracer).
+        max_file_bytes (int): The trace file is rotated to '<trace_file>.1' above this size.
+    """
+    def __init__(self, service_name: str, trace_file: Optional[str] = None, enabled: bool = True,
+                 max_file_bytes: int = 50 * 1024 * 1024):
+        self.service_name = service_name
+        self.trace_file = trace_file
+        self.enabled = enabled and trace_file is not None
+        self.max_file_bytes = max_file_bytes
+        self._lock = threading.Lock()
+        if self.enabled:
+            os.makedirs(os.path.dirname(os.path.abspath(trace_file)), exist_ok=True)
+
+    @contextmanager
+    def span(self, name: str, attributes: Optional[Dict[str, Any]] = None,
+             traceparent: Optional[str] = None) -> Iterator[Optional[Span]]:
+        """
+        Record a span around the enclosed block.
+
+        Args:
+            name (str): Operation name.
+            attributes (Optional[Dict[str, Any]]): Attributes recorded with the span.
+            traceparent (Optional[str]): Incoming 'traceparent' header to continue a remote trace.
+                Ignored if a span is already active.
+
+        Yields:
+            Optional[Span]: The span (None when tracing is disabled).
+        """
+        if not self.enabled:
+            yield None
+            return
+
+        parent = _current_span.get()
+        if parent is None:
+            parent = parse_traceparent(traceparent)
+        trace_id, parent_span_id = parent if parent is not None else (secrets.token_hex(16), '')
+
+        span = Span(name, trace_id, parent_span_id, attributes)
+        token = _current_span.set((span.trace_id, span.span_id))
+        try:
+            yield span
+        except BaseException as e:
+            span.set_error(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end_time_ns = time.time_ns()
+            self.export(span)
+
+    def inject(self, headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """
+        Add the 'traceparent' header of the active span to outgoing request headers.
+
+        Args:
+            headers (Optional[Dict[str, str]]): Headers to extend.
+
+        Returns:
+            Dict[str, str]: Headers including 'traceparent' when a span is active.
+        """
+        headers = dict(headers or {})
+        current = _current_span.get()
+        if self.enabled and current is not None:
+            headers['traceparent'] = f"00-{current[0]}-{current[1]}-01"
+        return headers
+
+    def export(self, span: Span) -> None:
+        """
+        Append a finished span to the trace file.
+
+        Args:
+            span (Span): Finished span.
+
+        Returns:
+            None
+        """
+        line = json.dumps(span.to_dict(self.service_name), default=str) + '\n'
+        with self._lock:
+            if os.path.exists(self.trace_file) and os.path.getsize(self.trace_file) > self.max_file_bytes:
+                os.replace(self.trace_file, f"{self.trace_file}.1")
+            with open(self.trace_file, 'a') as f:
+                f.write(line)
+
+
+_tracer = Tracer(service_name='bike-rental', enabled=False)
+
+
+def configure_tracing(config: Dict[str, Any], service_name: str) -> Tracer:
+    """
+    Configure the process-wide tracer from the 'tracing' config section.
+
+    Args:
+        config (Dict[str, Any]): Application configuration.
+        service_name (str): Name of the service recording spans.
+
+    Returns:
+        Tracer: The configured tracer.
+    """
+    global _tracer
+    tracing_config = config.get('tracing', {})
+    _tracer = Tracer(
+        service_name=service_name,
+        trace_file=tracing_config.get('trace_file'),
+        enabled=tracing_config.get('enabled', False),
+        max_file_bytes=tracing_config.get('max_file_mb', 50) * 1024 * 1024,
+    )
+    return _tracer
+
+
+def get_tracer() -> Tracer:
+    """Return the process-wide tracer (a no-op tracer until `configure_tracing` is called)."""
+    return _tracer
+
+
+def load_spans(paths: List[str]) -> List[Dict[str, Any]]:
+    """
+    Load exported spans from one or more JSON-lines trace files.
+
+    Args:
+        paths (List[str]): Trace files (missing files are skipped).
+
+    Returns:
+        List[Dict[str, Any]]: Spans as dictionaries.
+    """
+    spans = []
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    spans.append(json.loads(line))
+    return spans
+
+
+def critical_path(trace_spans: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Compute the critical path of a trace: starting from the root span, repeatedly
+    follow the child span that finishes last.
+
+    Args:
+        trace_spans (List[Dict[str, Any]]): All spans of one trace.
+
+    Returns:
+        List[Dict[str, Any]]: Spans on the critical path, root first.
+    """
+    span_ids = {span['spanId'] for span in trace_spans}
+    children: Dict[str, List[Dict[str, Any]]] = {}
+    for span in trace_spans:
+        children.setdefault(span['parentSpanId'], []).append(span)
+
+    # Roots are spans whose parent is not part of the trace (e.g. not exported yet)
+    roots = [span for span in trace_spans if span['parentSpanId'] not in span_ids]
+    if not roots:
+        return []
+    path = [min(roots, key=lambda span: span['startTimeUnixNano'])]
+    while children.get(path[-1]['spanId']):
+        path.append(max(children[path[-1]['spanId']], key=lambda span: span['endTimeUnixNano']))
+    return path
+
+
+def summarize_traces(spans: List[Dict[str, Any]], top: int = 10) -> List[Dict[str, Any]]:
+    """
+    Find the slowest traces and their critical paths.
+
+    Args:
+        spans (List[Dict[str, Any]]): Exported spans.
+        top (int): Number of traces to return.
+
+    Returns:
+        List[Dict[str, Any]]: One entry per trace with 'trace_id', 'duration_ms', 'root',
+        'services' and 'critical_path' (list of (span name, service, duration ms, self time ms)).
+    """
+    traces: Dict[str, List[Dict[str, Any]]] = {}
+    for span in spans:
+        traces.setdefault(span['traceId'], []).append(span)
+
+    summaries = []
+    for trace_id, trace_spans in traces.items():
+        start = min(span['startTimeUnixNano'] for span in trace_spans)
+        end = max(span['endTimeUnixNano'] for span in trace_spans)
+        # Self time of a span: its duration minus the time spent in its direct children
+        children_ns: Dict[str, int] = {}
+        for span in trace_spans:
+            duration_ns = span['endTimeUnixNano'] - span['startTimeUnixNano']
+            children_ns[span['parentSpanId']] = children_ns.get(span['parentSpanId'], 0) + duration_ns
+
+        path = critical_path(trace_spans)
+        steps = []
+        for span in path:
+            duration_ns = span['endTimeUnixNano'] - span['startTimeUnixNano']
+            self_ns = max(duration_ns - children_ns.get(span['spanId'], 0), 0)
+            steps.append((span['name'], span['resource']['service.name'], duration_ns / 1e6, self_ns / 1e6))
+        summaries.append({
+            'trace_id': trace_id,
+            'duration_ms': (end - start) / 1e6,
+            'root': path[0]['name'] if path else '',
+            'services': sorted({span['resource']['service.name'] for span in trace_spans}),
+            'critical_path': steps,
+        })
+    return sorted(summaries, key=lambda summary: summary['duration_ms'], reverse=True)[:top]
+
+
+def span_statistics(spans: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """
+    Aggregate span durations per span name.
+
+    Args:
+        spans (List[Dict[str, Any]]): Exported spans.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Span name -> count, mean, p50, p95 and max duration in ms.
+    """
+    durations: Dict[str, List[float]] = {}
+    for span in spans:
+        durations.setdefault(span['name'], []).append((span['endTimeUnixNano'] - span['startTimeUnixNano']) / 1e6)
+
+    statistics = {}
+    for name, values in durations.items():
+        values = sorted(values)
+        statistics[name] = {
+            'count': len(values),
+            'mean_ms': sum(values) / len(values),
+            'p50_ms': values[int(0.50 * (len(values) - 1))],
+            'p95_ms': values[int(0.95 * (len(values) - 1))],
+            'max_ms': values[-1],
+        }
+    return statistics
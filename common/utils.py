@@ -5,8 +5,12 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 import os
+import sys
+import json
+import hashlib
+import resource
 from pathlib import Path
-from typing import Union, Optional, Any
+from typing import Union, Optional, Any, Dict
 from catboost import CatBoostRegressor
 from sklearn.base import BaseEstimator
 import plotly.graph_objects as go
@@ -15,6 +19,9 @@ def read_config(path: Union[str, Path]) -> dict:
     """
     Reads a YAML configuration file and returns it as a dictionary.
 
+    A 'data_manager.data_root' setting (e.g. the synthetic data) replaces the raw and
+    production data folders by its 'raw_data/' and 'prod_data/' subfolders.
+
     Parameters:
     ----------
     path : str or Path
@@ -30,7 +37,13 @@ def read_config(path: Union[str, Path]) -> dict:
         raise FileNotFoundError(f"Config file not found: {path}")
 
     with path.open("r") as f:
-        return yaml.safe_load(f)
+        config = yaml.safe_load(f)
+
+    data_root = (config or {}).get('data_manager', {}).get('data_root')
+    if data_root:
+        from common.data_manager import DataManager
+        config = DataManager.relocate_config(config, data_root)
+    return config
 
 
 def setup_logger(name: str = __name__, log_file: Optional[str] = None, level: int = logging.INFO) -> logging.Logger:
@@ -64,6 +77,44 @@ def setup_logger(name: str = __name__, log_file: Optional[str] = None, level: in
     return logger
 
 
+def get_process_rss_bytes() -> int:
+    """
+    Return the resident set size (RSS) of the current process in bytes.
+
+    Reads /proc/self/statm where available (current RSS), otherwise falls back
+    to the peak RSS reported by getrusage.
+
+    Returns:
+        int: Resident memory of the process in bytes.
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+        return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+def format_prometheus_metrics(metrics: Dict[str, float], prefix: str = 'bike_rental_') -> str:
+    """
+    Format gauges in the Prometheus text exposition format.
+
+    Args:
+        metrics (Dict[str, float]): Gauge name -> value.
+        prefix (str): Prefix added to every metric name.
+
+    Returns:
+        str: Metrics page content.
+    """
+    lines = []
+    for name, value in metrics.items():
+        lines.append(f"# TYPE {prefix}{name} gauge")
+        lines.append(f"{prefix}{name} {value}")
+    return "\n".join(lines) + "\n"
+
+
 def plot_predictions_vs_actual(predictions_df: pd.DataFrame, actual_df: pd.DataFrame, 
                               save_path: str = "inference_results.png") -> None:
     """
@@ -155,17 +206,19 @@ def save_model(model: Any, base_path: str) -> None:
         raise ValueError(f"Unsupported model type: {type(model)}")
 
 
-def load_model(base_path: str) -> Any:
+def load_model(base_path: str, serving: bool = False) -> Any:
     """
     Load model by checking both .cbm and .pkl variants.
 
     Args:
         base_path: File path without extension.
+        serving: Load the latency budget serving model of the model instead, if it is
+            up to date (see `get_serving_model_path`).
 
     Returns:
         Loaded model.
     """
-    path = Path(base_path)
+    path = Path(get_serving_model_path(base_path) if serving else base_path)
 
     cbm_path = path.with_suffix(".cbm")
     pkl_path = path.with_suffix(".pkl")
@@ -186,6 +239,84 @@ def load_model(base_path: str) -> Any:
         raise FileNotFoundError(f"Neither {cbm_path} nor {pkl_path} found.")
 
 
+def save_model_metadata(metadata: Dict[str, Any], base_path: str) -> None:
+    """
+    Save the metadata of a model as JSON next to the model file.
+
+    Args:
+        metadata: Metadata of the model (e.g. the data it was trained on).
+        base_path: Model file path without extension.
+    """
+    path = Path(base_path).with_suffix(".json")
+    tmp_path = path.with_suffix(f".json.{os.getpid()}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(metadata, f, indent=2, default=str)
+    os.replace(tmp_path, path)
+
+
+def load_model_metadata(base_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Load the metadata saved with `save_model_metadata`.
+
+    Args:
+        base_path: Model file path without extension.
+
+    Returns:
+        Optional[Dict[str, Any]]: The metadata, None if the model has none.
+    """
+    path = Path(base_path).with_suffix(".json")
+    if not path.exists():
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def get_model_version(base_path: str) -> Optional[str]:
+    """
+    Identify a saved model by a hash of its file content.
+
+    Args:
+        base_path: File path without extension.
+
+    Returns:
+        Optional[str]: Short content hash of the .cbm (or .pkl) file, None if no model is saved.
+    """
+    path = Path(base_path)
+    for model_path in (path.with_suffix(".cbm"), path.with_suffix(".pkl")):
+        if model_path.exists():
+            digest = hashlib.sha256()
+            with open(model_path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(block)
+            return digest.hexdigest()[:16]
+    return None
+
+
+def serving_model_path(base_path: str) -> str:
+    """Path (without extension) of the latency budget serving model saved next to a model."""
+    return f"{base_path}_serving"
+
+
+def get_serving_model_path(base_path: str, serving_path: Optional[str] = None) -> str:
+    """
+    Model to serve for a model path: its latency budget serving model if it was derived
+    from the current model file, the model itself otherwise.
+
+    Args:
+        base_path: File path without extension.
+        serving_path: Serving model to check, defaults to the one saved next to `base_path`
+            (e.g. the production serving model for a registry version being activated).
+
+    Returns:
+        str: Serving model path or `base_path`, without extension.
+    """
+    path = serving_path or serving_model_path(base_path)
+    metadata = load_model_metadata(path)
+    if metadata is not None and metadata.get('full_model_version') == get_model_version(base_path):
+        return path
+    return base_path
+
+
 def make_prediction_figures(
     df_prod: pd.DataFrame,
     df_pred: pd.DataFrame,
@@ -0,0 +1,80 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+import yaml
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.append(str(project_root))
+
+from common.utils import read_config
+from common.data_manager import DataManager
+from common.data_generator import SyntheticDataGenerator
+
+
+def make_config(**overrides):
+    config = read_config(project_root / 'config' / 'config.yaml')
+    config['data_generator'].update({
+        'start_timestamp': '2012-01-01 00:00:00',
+        'end_timestamp': '2012-01-10 23:00:00',
+        'chunk_hours': 50,
+    })
+    config['data_generator'].update(overrides)
+    return config
+
+
+def test_generated_data_matches_raw_schema(tmp_path):
+    """
+    Test Case 1: Generate a few days of data in several chunks and verify the
+    files have the raw data schema and a continuous hourly index.
+    """
+    config = make_config()
+    output_config = DataManager.relocate_config(config, str(tmp_path))
+    rows = SyntheticDataGenerator(config).run(output_config, history_end_timestamp='2012-01-05 23:00:00')
+
+    raw = pd.read_parquet(project_root / 'data' / 'raw_data' / 'database.parquet')
+    generated = pd.read_parquet(tmp_path / 'raw_data' / 'database.parquet')
+    real_time = pd.read_parquet(tmp_path / 'prod_data' / 'real_time_data_prod.parquet')
+
+    assert list(generated.columns) == list(raw.columns)
+    assert generated.dtypes.equals(raw.dtypes)
+    assert len(generated) == 5 * 24 and len(real_time) == 10 * 24
+    assert sorted(rows.values()) == [5 * 24, 10 * 24]
+
+    hours = pd.to_datetime(real_time['datetime']).diff().dropna()
+    assert (hours == pd.Timedelta(hours=1)).all()
+    assert real_time['cnt'].min() >= 1
+    assert (real_time['casual'] + real_time['registered'] == real_time['cnt']).all()
+
+
+def test_generated_stations_share_city_weather(tmp_path):
+    """
+    Test Case 2: With several stations, each timestamp has one row per station
+    and all stations share the same weather.
+    """
+    config = make_config(n_stations=4)
+    config['training']['per_series']['enabled'] = True
+    SyntheticDataGenerator(config).run(DataManager.relocate_config(config, str(tmp_path)))
+
+    real_time = pd.read_parquet(tmp_path / 'prod_data' / 'real_time_data_prod.parquet')
+    assert len(real_time) == 4 * 10 * 24
+    assert real_time.groupby('datetime')['station_id'].nunique().eq(4).all()
+    assert real_time.groupby('datetime')['temp'].nunique().eq(1).all()
+
+
+def test_stations_require_per_series_training_and_data_root_relocates(tmp_path):
+    """
+    Test Case 3: Several stations are rejected without the per-series training, and the
+    'data_manager.data_root' setting points the data folders to the generated data.
+    """
+    with pytest.raises(ValueError):
+        SyntheticDataGenerator(make_config(n_stations=4))
+
+    config = make_config()
+    config['data_manager']['data_root'] = str(tmp_path)
+    config_path = tmp_path / 'config.yaml'
+    config_path.write_text(yaml.safe_dump(config))
+    relocated = read_config(config_path)
+    assert relocated['data_manager']['raw_data_folder'] == str(tmp_path / 'raw_data') + '/'
+    assert relocated['data_manager']['prod_data_folder'] == str(tmp_path / 'prod_data') + '/'
@@ -0,0 +1,37 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.append(str(project_root))
+
+from common.data_manager import DataManager
+
+
+def test_appends_fill_bounded_parts_of_a_dataset(tmp_path, monkeypatch):
+    """
+    Test Case 1: Appending to a parquet file turns it into a dataset, every append only
+    rewrites the last part until it is full, and the readers see all rows in order.
+    """
+    monkeypatch.setattr(DataManager, 'PART_ROWS', 10)
+    raw = pd.read_parquet(project_root / 'data' / 'raw_data' / 'database.parquet').head(100)
+    path = str(tmp_path / 'database.parquet')
+    raw.iloc[:50].to_parquet(path, index=False)
+
+    for start in range(50, 100, 3):
+        DataManager.append_to_parquet(raw.iloc[start:start + 3], path)
+
+    parts = DataManager.list_parts(path)
+    assert len(parts) == 1 + 5  # the original file, then parts of at most 10 + 2 rows
+    assert DataManager.count_rows(path) == 100
+    pd.testing.assert_frame_equal(DataManager.load_data(path), raw.reset_index(drop=True))
+    pd.testing.assert_frame_equal(DataManager.load_last_rows(path, 25), raw.iloc[-25:].reset_index(drop=True))
+    since = raw['datetime'].iloc[60]
+    assert list(DataManager.load_column(path, 'datetime', since=since)) == list(raw['datetime'].iloc[60:])
+
+    # Snapshots of a dataset keep their rows when the last part is rewritten
+    snapshot = str(tmp_path / 'snapshot.parquet')
+    DataManager.copy_file_atomic(path, snapshot, link=True)
+    DataManager.append_to_parquet(raw.iloc[:1], path)
+    assert DataManager.count_rows(snapshot) == 100 and DataManager.count_rows(path) == 101
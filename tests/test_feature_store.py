@@ -0,0 +1,77 @@
+import sys
+import shutil
+from pathlib import Path
+
+import pandas as pd
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.append(str(project_root))
+sys.path.append(str(project_root / 'app-ml' / 'src'))
+
+from common.utils import read_config
+from common.data_manager import DataManager
+from common.load_testing import prepare_data_root
+from pipelines.pipeline_runner import PipelineRunner
+
+
+def make_runner(config, data_root):
+    config = prepare_data_root(config, data_root)
+    data_manager = DataManager(config)
+    data_manager.prepare_prod_database()
+    return PipelineRunner(config=config, data_manager=data_manager)
+
+
+def test_feature_store_belongs_to_its_production_database(tmp_path, monkeypatch):
+    """
+    Test Case 1: The store lives in the production folder of its data root, is extended by
+    inference, and is not used for another production database with the same rows.
+    """
+    monkeypatch.chdir(project_root)
+    config = read_config(project_root / 'config' / 'config.yaml')
+    config['feature_store']['enabled'] = True
+
+    runner = make_runner(config, str(tmp_path / 'a'))
+    assert Path(runner.feature_store.path).is_relative_to(tmp_path / 'a' / 'prod_data')
+    expected = runner.get_training_features()
+    assert runner.feature_store.is_synced(runner.n_database_rows, runner.get_latest_timestamp(), runner.database_id)
+
+    timestamp = runner.get_latest_timestamp() + pd.Timedelta(config['pipeline_runner']['time_increment'])
+    runner.run_inference(timestamp)
+    assert DataManager.count_rows(runner.feature_store.path) == len(expected) + 1
+    assert runner.get_training_features().iloc[:-1].equals(expected)
+
+    # Another data root, with the store of the first one copied next to the same rows
+    other = make_runner(config, str(tmp_path / 'b'))
+    shutil.copytree(Path(runner.feature_store.path).parent, Path(other.feature_store.path).parent)
+    DataManager.append_to_parquet(
+        runner.data_manager.load_last_rows(runner.prod_data_path, 1), other.prod_data_path
+    )
+    n_rows = DataManager.count_rows(other.prod_data_path)
+    assert not other.feature_store.is_synced(n_rows, timestamp, other.database_id)
+    assert other.feature_store.is_synced(n_rows, timestamp, runner.database_id)
+
+
+def test_stale_materialization_is_not_written(tmp_path, monkeypatch):
+    """
+    Test Case 2: Features computed by a training before rows were appended to the database
+    do not replace the store, and inference only appends to a store that covers its rows.
+    """
+    monkeypatch.chdir(project_root)
+    config = read_config(project_root / 'config' / 'config.yaml')
+    config['feature_store']['enabled'] = True
+    runner = make_runner(config, str(tmp_path))
+    compute = runner.compute_training_features
+
+    def compute_then_append(*args):
+        df = compute(*args)
+        # Another process (the inference service) extends the database meanwhile
+        DataManager.append_to_parquet(runner.data_manager.load_last_rows(runner.prod_data_path, 1), runner.prod_data_path)
+        return df
+
+    monkeypatch.setattr(runner, 'compute_training_features', compute_then_append)
+    runner.get_training_features()
+    assert not Path(runner.feature_store.path).exists()
+
+    runner.n_database_rows = DataManager.count_rows(runner.prod_data_path)
+    runner.run_inference(runner.get_latest_timestamp() + pd.Timedelta(config['pipeline_runner']['time_increment']))
+    assert not runner.feature_store_synced and not Path(runner.feature_store.path).exists()
@@ -0,0 +1,59 @@
+import sys
+import shutil
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.append(str(project_root))
+sys.path.append(str(project_root / 'app-ml' / 'src'))
+sys.path.append(str(project_root / 'app-ml' / 'entrypoint'))
+
+from common.utils import read_config, load_model, load_model_metadata
+from common.data_manager import DataManager
+from common.load_testing import prepare_data_root
+from pipelines.pipeline_runner import PipelineRunner
+from inference_api import run_next_inference
+
+
+def test_production_model_is_continued_on_new_rows(tmp_path, monkeypatch):
+    """
+    Test Case 1: The production model is continued on the rows added since its training,
+    kept when there are too few new rows, and left to a full training when the continued
+    model is rejected.
+    """
+    monkeypatch.chdir(project_root)
+    config = prepare_data_root(read_config(project_root / 'config' / 'config.yaml'), str(tmp_path))
+    config['training']['iterations'] = 30
+    config['training']['optuna']['n_trials'] = 2
+    config['training']['incremental'].update({'min_new_rows': 24, 'iterations': 10, 'max_rmse_increase': 10.0})
+    model_path = tmp_path / 'models' / 'latest_model'
+    config['pipeline_runner']['model_path'] = str(model_path)
+    data_manager = DataManager(config)
+    data_manager.prepare_prod_database()
+    runner = PipelineRunner(config=config, data_manager=data_manager)
+
+    # Without a model trained by the pipeline there is nothing to continue
+    model_path.parent.mkdir()
+    shutil.copyfile(project_root / 'models' / 'prod' / 'latest_model.cbm', model_path.with_suffix('.cbm'))
+    assert not runner.run_incremental_training()
+
+    runner.run_training(incremental=False)
+    full_model = load_model(str(model_path))
+    n_rows = load_model_metadata(str(model_path))['n_rows']
+    for _ in range(10):
+        run_next_inference(runner)
+    assert runner.run_incremental_training()
+    assert load_model(str(model_path)).tree_count_ == full_model.tree_count_
+
+    for _ in range(20):
+        run_next_inference(runner)
+    assert runner.run_incremental_training()
+    metadata = load_model_metadata(str(model_path))
+    assert metadata['mode'] == 'incremental' and metadata['n_new_rows'] == 30
+    assert metadata['n_rows'] == n_rows + 30 == DataManager.count_rows(runner.prod_data_path)
+    assert metadata['trained_until'] == str(runner.get_latest_timestamp())
+    assert load_model(str(model_path)).tree_count_ == full_model.tree_count_ + 10
+
+    for _ in range(24):
+        run_next_inference(runner)
+    runner.config['training']['incremental']['max_rmse_increase'] = -1.0
+    assert not runner.run_incremental_training()
@@ -0,0 +1,49 @@
+import sys
+import shutil
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.append(str(project_root))
+sys.path.append(str(project_root / 'app-ml' / 'src'))
+
+from common.utils import read_config, load_model, save_model, get_model_version, serving_model_path
+from common.data_manager import DataManager
+from common.load_testing import prepare_data_root
+from pipelines.pipeline_runner import PipelineRunner
+from pipelines.latency_budget import LatencyBudgetPipeline
+
+
+def test_serving_model_is_only_served_for_its_full_model(tmp_path, monkeypatch):
+    """
+    Test Case 1: The serving model built for a latency target is loaded instead of the
+    production model it was derived from, and no longer once the production model changed.
+    """
+    monkeypatch.chdir(project_root)
+    config = prepare_data_root(read_config(project_root / 'config' / 'config.yaml'), str(tmp_path))
+    config['latency_budget'].update({'target_ms': 0.0, 'tree_fractions': [1.0, 0.1]})
+    model_path = tmp_path / 'models' / 'latest_model'
+    model_path.parent.mkdir()
+    shutil.copyfile(project_root / 'models' / 'prod' / 'latest_model.cbm', model_path.with_suffix('.cbm'))
+    config['pipeline_runner']['model_path'] = str(model_path)
+
+    data_manager = DataManager(config)
+    data_manager.prepare_prod_database()
+    runner = PipelineRunner(config=config, data_manager=data_manager)
+    full_model = load_model(str(model_path))
+
+    # Latency grows with the trees: no candidate meets 0 ms, the one with the fewest trees is served
+    monkeypatch.setattr(LatencyBudgetPipeline, 'measure_latency', lambda self, model, batch: float(model.tree_count_))
+    report = runner.run_latency_budget()
+    assert not report['met_target']
+    serving_model = load_model(str(model_path), serving=True)
+    assert serving_model.tree_count_ == report['selected']['n_trees'] < full_model.tree_count_
+    model, version, _ = runner.inference_pipeline.load_model_files(str(model_path))
+    assert model.tree_count_ == serving_model.tree_count_ and version == get_model_version(str(model_path))
+
+    # A new production model: its stale serving model is not served
+    full_model.shrink(ntree_end=full_model.tree_count_ - 1)
+    save_model(full_model, str(model_path))
+    assert Path(serving_model_path(str(model_path))).with_suffix('.cbm').exists()
+    assert load_model(str(model_path), serving=True).tree_count_ == full_model.tree_count_
+    model, _, _ = runner.inference_pipeline.load_model_files(str(model_path))
+    assert model.tree_count_ == full_model.tree_count_
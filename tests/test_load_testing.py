@@ -0,0 +1,48 @@
+import sys
+import shutil
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.append(str(project_root))
+sys.path.append(str(project_root / 'app-ml' / 'src'))
+
+from common.utils import read_config
+from common.data_manager import DataManager
+from common.load_testing import start_apps_in_process, build_requests, LoadGenerator, format_report
+
+
+def test_load_test_against_in_process_apps(monkeypatch):
+    """
+    Test Case 1: The load generator sends the configured request mix to the API and the
+    UI started in-process on a copy of the data, and reports every request type.
+    """
+    monkeypatch.chdir(project_root)
+    # The UI reads its configuration from CONFIG_PATH, restored after the test
+    monkeypatch.setenv('CONFIG_PATH', str(project_root / 'config' / 'config.yaml'))
+    config = read_config(project_root / 'config' / 'config.yaml')
+
+    api_server, ui_server, data_root = start_apps_in_process(config)
+    try:
+        generator = LoadGenerator(
+            requests=build_requests(api_server.url, ui_server.url, config),
+            request_mix=config['load_test']['request_mix'],
+            concurrency=4,
+            n_requests=40,
+        )
+        summary = generator.run()
+        endpoints = summary['endpoints']
+        assert set(endpoints) == {'run_inference', 'health', 'update_graphs', 'total'}
+        assert endpoints['total']['requests'] == 40 and endpoints['total']['errors'] == 0
+        assert endpoints['total']['p50_ms'] <= endpoints['total']['p99_ms'] <= endpoints['total']['max_ms']
+        assert 'update_graphs' in format_report(summary)
+
+        # Every inference request appended one row to the copied production database only
+        relocated = DataManager.relocate_config(config, data_root)
+        prod_path = Path(relocated['data_manager']['prod_data_folder']) / config['data_manager']['prod_database_name']
+        raw_path = Path(config['data_manager']['raw_data_folder']) / config['data_manager']['raw_database_name']
+        n_inferences = endpoints['run_inference']['requests']
+        assert DataManager.count_rows(str(prod_path)) == DataManager.count_rows(str(raw_path)) + n_inferences
+    finally:
+        api_server.stop()
+        ui_server.stop()
+        shutil.rmtree(data_root, ignore_errors=True)
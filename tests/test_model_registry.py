@@ -0,0 +1,60 @@
+import sys
+import shutil
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.append(str(project_root))
+sys.path.append(str(project_root / 'app-ml' / 'src'))
+sys.path.append(str(project_root / 'app-ml' / 'entrypoint'))
+
+from common.utils import read_config, load_model, save_model, get_model_version
+from common.load_testing import prepare_data_root
+from common.model_registry import ModelRegistry
+
+
+def test_activate_and_rollback_are_hot_swapped(tmp_path, monkeypatch):
+    """
+    Test Case 1: Activating a version and rolling back install its files as the production
+    model and swap the loaded model in, so requests never load a model themselves.
+    """
+    monkeypatch.chdir(project_root)
+    config = prepare_data_root(read_config(project_root / 'config' / 'config.yaml'), str(tmp_path))
+    model_path = tmp_path / 'models' / 'prod' / 'latest_model'
+    model_path.parent.mkdir(parents=True)
+    shutil.copyfile(project_root / 'models' / 'prod' / 'latest_model.cbm', model_path.with_suffix('.cbm'))
+    config['pipeline_runner']['model_path'] = str(model_path)
+    first_version = get_model_version(str(model_path))
+
+    import inference_api
+    inference_api.init_app(config)
+    registry = inference_api.model_registry
+    runner = inference_api.pipeline_runner
+
+    # A new version: the production model with fewer trees
+    model = load_model(str(model_path))
+    model.shrink(ntree_end=model.tree_count_ // 2)
+    new_path = Path(registry.version_model_path('20990101-000000-new'))
+    new_path.parent.mkdir(parents=True)
+    save_model(model, str(new_path))
+
+    def fail_on_request_path():
+        raise AssertionError("The model was loaded by a request")
+
+    monkeypatch.setattr(runner.inference_pipeline, 'load_current_model', fail_on_request_path)
+
+    inference_api.activate_model_version('20990101-000000-new', {'mode': 'full'})
+    assert get_model_version(str(model_path)) == get_model_version(str(new_path)) == runner.model_version
+    assert runner.inference_pipeline.get_model().tree_count_ == model.tree_count_
+    inference_api.run_next_inference(runner)
+
+    response = inference_api.app.test_client().post('/rollback')
+    assert response.status_code == 200
+    assert registry.load_history()['active'] == response.get_json()['active_version']
+    assert get_model_version(str(model_path)) == first_version == runner.model_version
+    inference_api.run_next_inference(runner)
+
+    with pytest.raises(ValueError):
+        registry.rollback()
+    assert ModelRegistry(config).list_versions()[-1]['version'] == '20990101-000000-new'
@@ -0,0 +1,73 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.append(str(project_root))
+sys.path.append(str(project_root / 'app-ml' / 'src'))
+
+from common.utils import read_config
+from common.data_manager import DataManager
+from pipelines.preprocessing import PreprocessingPipeline
+from pipelines.feature_engineering import FeatureEngineeringPipeline
+from pipelines.online_features import OnlineWindowFeatures, RollingWindow
+
+WINDOW_PARAMS = {
+    'bike_count': {'windows': [24, 168], 'stats': ['mean', 'std', 'min', 'max'], 'ewm_spans': [24]},
+    'temperature': {'windows': [24], 'stats': ['mean']},
+    'humidity': {'windows': [24], 'stats': ['mean']},
+}
+
+
+def test_online_window_features_match_batch(monkeypatch):
+    """
+    Test Case 1: Window features updated online row by row, starting from the last
+    history rows only, match the batch computation over the full history.
+    """
+    monkeypatch.chdir(project_root)
+    config = read_config(project_root / 'config' / 'config.yaml')
+    config['feature_engineering']['window_params'] = WINDOW_PARAMS
+    raw = DataManager(config).load_data(
+        str(Path(config['data_manager']['raw_data_folder']) / config['data_manager']['raw_database_name'])
+    )
+    feature_eng_pipeline = FeatureEngineeringPipeline(config)
+    window_params = config['feature_engineering']['window_params']
+    columns = feature_eng_pipeline.window_columns(window_params)
+    expected = feature_eng_pipeline.run(PreprocessingPipeline(config).run(raw.copy()))[columns].to_numpy()
+
+    n_history = feature_eng_pipeline.get_history_rows({}, window_params)
+    online = OnlineWindowFeatures(config, n_recent=30)
+    online.update(raw.iloc[-(n_history + 60):-30])
+    for i in range(len(raw) - 30, len(raw)):
+        online.update(raw.iloc[i:i + 1])
+
+    assert online.columns == columns
+    np.testing.assert_allclose(online.recent(30), expected[-30:], rtol=1e-7, atol=1e-7)
+
+
+def test_online_window_features_skip_missing_values():
+    """
+    Test Case 2: Missing values are skipped by the online windows and EWMs like pandas,
+    e.g. the mean of the last 3 values of [1, nan, 2, 3, 4, 5, 6] is 5.0.
+    """
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=400)
+    values[rng.random(400) < 0.3] = np.nan
+    values[:5] = np.nan
+    values[100:130] = np.nan
+    raw = pd.DataFrame({'value': values})
+
+    window_params = {'value': {'windows': [3, 24], 'stats': ['mean', 'std', 'min', 'max'], 'ewm_spans': [24]}}
+    config = {'feature_engineering': {'window_params': window_params}, 'preprocessing': {'column_mapping': {}}}
+    online = OnlineWindowFeatures(config, n_recent=len(raw))
+    online.update(raw)
+
+    expected = FeatureEngineeringPipeline.add_window_feats(raw, window_params)[online.columns].to_numpy()
+    np.testing.assert_allclose(online.recent(len(raw)), expected, rtol=1e-7, atol=1e-7)
+
+    window = RollingWindow(3)
+    for value in [1, np.nan, 2, 3, 4, 5, 6]:
+        window.push(value)
+    assert window.stat('mean') == 5.0
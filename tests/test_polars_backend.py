@@ -0,0 +1,35 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.append(str(project_root))
+sys.path.append(str(project_root / 'app-ml' / 'src'))
+
+from common.utils import read_config
+from common.data_manager import DataManager
+from pipelines.preprocessing import PreprocessingPipeline
+from pipelines.feature_engineering import FeatureEngineeringPipeline
+
+
+def test_polars_backend_matches_pandas(monkeypatch):
+    """
+    Test Case 1: The polars backend produces exactly the training features of the
+    pandas pipelines, for the full history and for its last rows.
+    """
+    pytest.importorskip('polars')
+    from pipelines.polars_backend import PolarsFeaturePipeline
+
+    monkeypatch.chdir(project_root)
+    config = read_config(project_root / 'config' / 'config.yaml')
+    path = str(Path(config['data_manager']['raw_data_folder']) / config['data_manager']['raw_database_name'])
+    lag_params = config['feature_engineering']['lag_params']
+
+    for n_last in (None, 1000):
+        raw = DataManager.load_data(path) if n_last is None else DataManager.load_last_rows(path, n_last)
+        expected = FeatureEngineeringPipeline(config).run(PreprocessingPipeline(config).run(raw), lag_params=lag_params)
+        pd.testing.assert_frame_equal(
+            PolarsFeaturePipeline(config).run(path, lag_params, n_last=n_last), expected, check_exact=True
+        )
@@ -0,0 +1,56 @@
+import sys
+import shutil
+from pathlib import Path
+
+import pandas as pd
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.append(str(project_root))
+sys.path.append(str(project_root / 'app-ml' / 'src'))
+
+from common.utils import read_config
+from common.data_manager import DataManager
+from common.load_testing import prepare_data_root
+from pipelines.pipeline_runner import PipelineRunner
+
+
+def run_steps(config, data_manager, n_steps):
+    pipeline_runner = PipelineRunner(config=config, data_manager=data_manager)
+    timestamp = pipeline_runner.get_latest_timestamp()
+    for _ in range(n_steps):
+        timestamp += pd.Timedelta(config['pipeline_runner']['time_increment'])
+        pipeline_runner.run_inference(timestamp)
+    return timestamp
+
+
+def test_resume_reuses_and_restores_production_state(tmp_path, monkeypatch):
+    """
+    Test Case 1: A restart in resume mode keeps the production state, a lost
+    production database is restored from the checkpoint, and reset mode starts over.
+    """
+    monkeypatch.chdir(project_root)
+    config = prepare_data_root(read_config(project_root / 'config' / 'config.yaml'), str(tmp_path))
+    config['data_manager']['startup'].update({'mode': 'resume', 'checkpoint_every_n_steps': 1})
+    data_manager = DataManager(config)
+
+    assert data_manager.prepare_prod_database()['action'] == 'initialized'
+    assert data_manager.is_prod_ready()
+    n_raw_rows = len(data_manager.load_prod_data())
+    last_timestamp = run_steps(config, data_manager, n_steps=3)
+
+    # Restart: the production files are reused as they are
+    assert data_manager.prepare_prod_database()['action'] == 'reused'
+    assert len(data_manager.load_prod_data()) == n_raw_rows + 3
+
+    # Lost production database: restored from the last checkpoint
+    shutil.rmtree(Path(config['data_manager']['prod_data_folder']) / config['data_manager']['prod_database_name'])
+    startup = data_manager.prepare_prod_database()
+    assert startup['action'] == 'restored'
+    assert startup['state']['cursor'] == str(last_timestamp)
+    assert len(data_manager.load_prod_data()) == n_raw_rows + 3
+    assert len(data_manager.load_prediction_data()) == 3
+
+    # Reset: back to the raw database, without predictions and checkpoints
+    assert data_manager.prepare_prod_database(mode='reset')['action'] == 'initialized'
+    assert len(data_manager.load_prod_data()) == n_raw_rows
+    assert data_manager.load_checkpoint() is None
@@ -0,0 +1,42 @@
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.append(str(project_root))
+sys.path.append(str(project_root / 'app-ml' / 'src'))
+sys.path.append(str(project_root / 'app-ml' / 'entrypoint'))
+
+from common.utils import read_config
+from common.data_manager import DataManager
+from common.load_testing import prepare_data_root
+
+
+def test_retention_window_bounds_memory_and_exports_gauges(tmp_path, monkeypatch):
+    """
+    Test Case 1: With the retention window, the runner keeps only the rows inference needs
+    in memory while the full history grows on disk, and /metrics reports the in-memory
+    frame sizes and the process memory.
+    """
+    monkeypatch.chdir(project_root)
+    config = read_config(project_root / 'config' / 'config.yaml')
+    config['pipeline_runner']['retention'] = {'enabled': True, 'extra_rows': 5}
+    config = prepare_data_root(config, str(tmp_path))
+
+    import inference_api
+    inference_api.init_app(config)
+    runner = inference_api.pipeline_runner
+    retention_rows = max(config['pipeline_runner']['batch_size'], runner.get_max_lag() + 1) + 5
+    assert runner.retention_rows == retention_rows
+    assert len(runner.current_database_data) == retention_rows
+
+    n_rows = DataManager.count_rows(runner.prod_data_path)
+    client = inference_api.app.test_client()
+    for _ in range(3):
+        assert client.post('/run-inference').status_code == 200
+    assert len(runner.current_database_data) == retention_rows
+    assert DataManager.count_rows(runner.prod_data_path) == runner.n_database_rows == n_rows + 3
+    assert runner.current_database_data.equals(DataManager.load_last_rows(runner.prod_data_path, retention_rows))
+
+    metrics = client.get('/metrics').get_data(as_text=True)
+    assert f"bike_rental_database_rows {retention_rows}\n" in metrics
+    assert "bike_rental_database_bytes " in metrics and "bike_rental_process_rss_bytes " in metrics
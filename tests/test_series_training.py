@@ -0,0 +1,71 @@
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.append(str(project_root))
+sys.path.append(str(project_root / 'app-ml' / 'src'))
+
+from common.utils import read_config
+from pipelines.training import TrainingPipeline
+from pipelines import series_training
+
+
+def test_cluster_is_validated_and_weighted_per_series(monkeypatch):
+    """
+    Test Case 1: The trials of a cluster are validated on the latest rows of every member,
+    and the recency weights of every member decay from its own latest row.
+    """
+    monkeypatch.chdir(project_root)
+    config = read_config(project_root / 'config' / 'config.yaml')
+    config['training']['train_fraction'] = 0.5
+    config['training']['window']['recency_half_life_rows'] = 2
+    training_pipeline = TrainingPipeline(config=config)
+
+    # Two series of 8 and 4 training rows, and 2 and 1 test rows
+    series = np.array([0] * 8 + [1] * 4)
+    x_train = pd.DataFrame({'series': series, 'row': np.r_[np.arange(8), np.arange(4)]})
+    y_train = pd.Series(np.arange(12, dtype=np.float64))
+
+    x_tr, x_val, y_tr, y_val, w_tr, weights = training_pipeline.split_validation(x_train, y_train, [(8, 2), (4, 1)])
+    assert list(x_val['series']) == [0] * 4 + [1] * 2
+    assert list(x_val['row']) == [4, 5, 6, 7, 2, 3]
+    assert list(y_tr) == [0, 1, 2, 3, 8, 9]
+
+    # The latest test row of each series has weight 1
+    own = [training_pipeline.get_sample_weights(10), training_pipeline.get_sample_weights(5)]
+    assert np.allclose(w_tr, np.r_[own[0][:4], own[1][:2]])
+    assert np.allclose(weights, np.r_[own[0][:8], own[1][:4], own[0][8:], own[1][4:]])
+    assert weights[13] == weights[14] == 1.0 and weights[7] == 0.5
+
+    # A single series keeps the split of the whole frame
+    x_tr, x_val, *_ = training_pipeline.split_validation(x_train, y_train, [(12, 3)])
+    assert len(x_tr) == 6 and list(x_val.index) == list(range(6, 12))
+
+
+def crash_on_station_1(config, name, frames, model_path):
+    # Stands in for `train_series_model` in the worker processes
+    if name == 'station_id_1':
+        os._exit(1)
+    return {'series': name, 'status': 'succeeded'}
+
+
+def test_crashed_worker_only_fails_its_series(tmp_path, monkeypatch):
+    """
+    Test Case 2: A series that crashes its worker process fails alone; the series lost
+    with the crashed pool are retried and trained.
+    """
+    monkeypatch.chdir(project_root)
+    config = read_config(project_root / 'config' / 'config.yaml')
+    config['training']['per_series'].update({'n_workers': 3, 'models_folder': str(tmp_path)})
+    monkeypatch.setattr(series_training, 'train_series_model', crash_on_station_1)
+
+    df = pd.DataFrame({'station_id': np.repeat([0, 1, 2], 4), 'value': np.arange(12)})
+    results = series_training.SeriesTrainer(config).run(df)
+    assert {name: result['status'] for name, result in results.items()} == {
+        'station_id_0': 'succeeded', 'station_id_1': 'failed', 'station_id_2': 'succeeded'
+    }
+    assert (tmp_path / 'summary.json').exists()
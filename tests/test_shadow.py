@@ -0,0 +1,43 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.append(str(project_root))
+sys.path.append(str(project_root / 'app-ml' / 'src'))
+
+from common.utils import read_config
+from common.data_manager import DataManager
+from pipelines.shadow import ShadowScorer
+
+
+def test_shadow_scores_compared_with_actuals(monkeypatch, tmp_path):
+    """
+    Test Case 1: A shadow copy of the production model scores the same prediction
+    as production, and both are compared with the actual value appended next.
+    """
+    monkeypatch.chdir(project_root)
+    config = read_config(project_root / 'config' / 'config.yaml')
+    config['shadow'].update({
+        'enabled': True,
+        'models': {'copy': config['pipeline_runner']['model_path']},
+        'predictions_path': str(tmp_path / 'predictions.parquet'),
+    })
+    raw = DataManager(config).load_data(
+        str(Path(config['data_manager']['raw_data_folder']) / config['data_manager']['raw_database_name'])
+    )
+    batch, next_row = raw.iloc[-31:-1], raw.iloc[-1:]
+
+    scorer = ShadowScorer(config)
+    prediction_time = pd.Timestamp(next_row['datetime'].iloc[0])
+    copy_prediction = scorer.score(prediction_time, batch, batch.iloc[-1:], production_prediction=0.0)['copy']
+    scorer.submit(prediction_time, batch, batch.iloc[-1:], production_prediction=copy_prediction).result()
+    scorer.update_actuals(next_row)
+    scorer.close()
+
+    metrics = scorer.get_metrics()
+    actual = float(next_row['cnt'].iloc[0])
+    assert metrics['copy'] == metrics['production']
+    assert metrics['copy']['mae'] == abs(copy_prediction - actual)
+    assert len(pd.read_parquet(tmp_path / 'predictions.parquet')) == 4
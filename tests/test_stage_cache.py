@@ -0,0 +1,49 @@
+import sys
+import logging
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.append(str(project_root))
+sys.path.append(str(project_root / 'app-ml' / 'src'))
+
+from common.utils import read_config
+from common.data_manager import DataManager
+from common.load_testing import prepare_data_root
+from pipelines.pipeline_runner import PipelineRunner
+
+
+def test_training_features_are_memoized(tmp_path, monkeypatch, caplog):
+    """
+    Test Case 1: The second run serves the features from the cache, a feature
+    engineering config change only recomputes feature engineering, a training run
+    logs the cache hits and misses, and the cache is evicted down to its size limit.
+    """
+    monkeypatch.chdir(project_root)
+    config = prepare_data_root(read_config(project_root / 'config' / 'config.yaml'), str(tmp_path / 'data'))
+    config['stage_cache'].update({'enabled': True, 'cache_dir': str(tmp_path / 'cache')})
+    config['training']['iterations'] = 30
+    config['training']['optuna']['n_trials'] = 1
+    config['pipeline_runner']['model_path'] = str(tmp_path / 'models' / 'latest_model')
+    (tmp_path / 'models').mkdir()
+    data_manager = DataManager(config)
+    data_manager.prepare_prod_database()
+    runner = PipelineRunner(config=config, data_manager=data_manager)
+
+    expected = runner.feature_eng_pipeline.run(
+        runner.preprocessing_pipeline.run(runner.data_manager.load_data(runner.prod_data_path))
+    )
+    assert runner.get_training_features().equals(expected)
+    assert runner.get_training_features().equals(expected)
+    assert runner.stage_cache.stats == {'hits': 1, 'misses': 2, 'evictions': 0}
+
+    config['feature_engineering']['lag_params'] = {'bike_count': [1, 2]}
+    runner.get_training_features()
+    assert runner.stage_cache.stats == {'hits': 2, 'misses': 3, 'evictions': 0}
+
+    with caplog.at_level(logging.INFO, logger='pipelines.pipeline_runner'):
+        runner.run_training(incremental=False)
+    assert "Stage cache: 3 hits, 3 misses, 0 evictions" in caplog.text
+
+    runner.stage_cache.max_size_bytes = 1
+    runner.stage_cache.evict()
+    assert list((tmp_path / 'cache').glob('*.parquet')) == []
@@ -0,0 +1,61 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.append(str(project_root))
+sys.path.append(str(project_root / 'app-ml' / 'src'))
+
+from common.utils import read_config
+from common.load_testing import prepare_data_root
+from pipelines.tenant_pool import TenantPool
+
+
+def test_tenants_are_loaded_lazily_and_evicted_lru(tmp_path, monkeypatch):
+    """
+    Test Case 1: Tenants are loaded on first use with their own data, the least recently
+    used tenant is evicted above the memory budget, and an evicted tenant resumes its
+    production state when it is used again.
+    """
+    monkeypatch.chdir(project_root)
+    config = read_config(project_root / 'config' / 'config.yaml')
+    for tenant in ('north', 'south'):
+        prepare_data_root(config, str(tmp_path / tenant))
+    config['tenants'] = {
+        'memory_budget_mb': 0,  # a single tenant stays loaded
+        'cities': {tenant: {'data_root': str(tmp_path / tenant)} for tenant in ('north', 'south')},
+    }
+    pool = TenantPool(config)
+    assert pool.loaded_tenants() == []
+
+    def step(tenant):
+        with pool.use(tenant) as runner:
+            timestamp = runner.get_latest_timestamp() + pd.Timedelta(runner.config['pipeline_runner']['time_increment'])
+            runner.run_inference(timestamp)
+            return timestamp
+
+    first = step('north')
+    assert pool.loaded_tenants() == ['north']
+    step('south')
+    assert pool.loaded_tenants() == ['south']
+    assert step('north') == first + pd.Timedelta(config['pipeline_runner']['time_increment'])
+
+    stats = pool.stats()
+    assert stats['tenants_loads'] == 3 and stats['tenants_evictions'] == 2
+    pool.close()
+
+
+def test_tenants_never_share_the_default_data(tmp_path, monkeypatch):
+    """
+    Test Case 2: A tenant without a data root of its own, or whose data root is the data
+    folder of the default tenant, is rejected instead of sharing its production files.
+    """
+    monkeypatch.chdir(project_root)
+    config = read_config(project_root / 'config' / 'config.yaml')
+    config['tenants'] = {'cities': {'shared': {}, 'default': {'data_root': './data'}}}
+    pool = TenantPool(config)
+    for tenant in ('shared', 'default'):
+        with pytest.raises(ValueError):
+            pool.get_tenant_config(tenant)
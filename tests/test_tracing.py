@@ -0,0 +1,46 @@
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.append(str(project_root))
+sys.path.append(str(project_root / 'app-ml' / 'src'))
+sys.path.append(str(project_root / 'app-ml' / 'entrypoint'))
+
+from common import tracing
+from common.utils import read_config
+from common.load_testing import prepare_data_root
+
+
+def test_ui_trace_continues_through_the_api(tmp_path, monkeypatch):
+    """
+    Test Case 1: A span of the UI propagated in the 'traceparent' header is the parent of
+    the API request span, whose pipeline stage spans belong to the same trace.
+    """
+    monkeypatch.chdir(project_root)
+    monkeypatch.setattr(tracing, '_tracer', tracing.get_tracer())
+    config = prepare_data_root(read_config(project_root / 'config' / 'config.yaml'), str(tmp_path))
+    config['tracing'].update({'enabled': True, 'trace_file': str(tmp_path / 'traces' / 'api.jsonl')})
+
+    import inference_api
+    inference_api.init_app(config)
+
+    ui_tracer = tracing.Tracer(service_name='ui', trace_file=str(tmp_path / 'traces' / 'ui.jsonl'))
+    with ui_tracer.span('ui.trigger_inference') as ui_span:
+        headers = ui_tracer.inject()
+    # The request is sent outside of the UI span, only the header carries the trace
+    response = inference_api.app.test_client().post('/run-inference', headers=headers)
+    assert response.status_code == 200
+
+    spans = tracing.load_spans([str(tmp_path / 'traces' / 'ui.jsonl'), str(tmp_path / 'traces' / 'api.jsonl')])
+    by_name = {span['name']: span for span in spans}
+    assert headers['traceparent'] == ui_span.traceparent()
+    assert by_name['api.run_inference']['traceId'] == ui_span.trace_id
+    assert by_name['api.run_inference']['parentSpanId'] == ui_span.span_id
+    assert by_name['pipeline.run_inference']['traceId'] == ui_span.trace_id
+    stages = [span for span in spans if span['name'].startswith('pipeline.') and span['name'] != 'pipeline.run_inference']
+    assert stages and all(span['parentSpanId'] == by_name['pipeline.run_inference']['spanId'] for span in stages)
+
+    summary, = tracing.summarize_traces(spans)
+    assert summary['root'] == 'ui.trigger_inference'
+    assert summary['services'] == ['inference-api', 'ui']
+    assert [step[0] for step in summary['critical_path']][:2] == ['ui.trigger_inference', 'api.run_inference']
@@ -0,0 +1,245 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import optuna
+import pytest
+from catboost import Pool
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.append(str(project_root))
+sys.path.append(str(project_root / 'app-ml' / 'src'))
+
+from common.utils import read_config
+from common.data_manager import DataManager
+from common.load_testing import prepare_data_root
+from pipelines.preprocessing import PreprocessingPipeline
+from pipelines.feature_engineering import FeatureEngineeringPipeline
+from pipelines.training import TrainingPipeline, build_pool, fit_and_evaluate
+from pipelines.feature_pruning import FeaturePruningPipeline
+from pipelines.pipeline_runner import PipelineRunner
+
+
+def make_config(tmp_path, n_trials=3):
+    config = read_config(project_root / 'config' / 'config.yaml')
+    config['training']['iterations'] = 30
+    config['training']['optuna']['n_trials'] = n_trials
+    config['training']['optuna']['storage']['folder'] = str(tmp_path / 'optuna')
+    config['training']['pool']['folder'] = str(tmp_path / 'pools')
+    return config
+
+
+def load_features(config, n_rows=2000):
+    path = str(Path(config['data_manager']['raw_data_folder']) / config['data_manager']['raw_database_name'])
+    return FeatureEngineeringPipeline(config).run(
+        PreprocessingPipeline(config).run(DataManager.load_last_rows(path, n_rows)),
+        lag_params=TrainingPipeline(config).get_feature_lag_params()
+    )
+
+
+def load_dataset(config, n_rows=2000):
+    return TrainingPipeline(config).prepare_dataset(load_features(config, n_rows))
+
+
+def test_persistent_study_is_resumed_and_warm_starts(tmp_path, monkeypatch):
+    """
+    Test Case 1: A study interrupted while a trial was running is resumed with that trial
+    queued again, and a study on new data starts with the best trials of the previous one.
+    """
+    monkeypatch.chdir(project_root)
+    config = make_config(tmp_path)
+    config['training']['optuna']['storage']['enabled'] = True
+    x_train, x_test, y_train, y_test = load_dataset(config)
+
+    _, study = TrainingPipeline(config).tune_hyperparams(x_train, y_train, x_test, y_test)
+    assert len(study.trials) == 3
+
+    # An interrupted run leaves a trial running in the storage
+    interrupted = study.ask()
+    interrupted_params = TrainingPipeline(config).suggest_params(interrupted)
+
+    config['training']['optuna']['n_trials'] = 4
+    _, resumed = TrainingPipeline(config).tune_hyperparams(x_train, y_train, x_test, y_test)
+    assert resumed.study_name == study.study_name
+    states = [trial.state for trial in resumed.trials]
+    assert states.count(optuna.trial.TrialState.COMPLETE) == 4
+    assert resumed.trials[interrupted.number].state == optuna.trial.TrialState.FAIL
+    assert resumed.trials[-1].params['learning_rate'] == interrupted_params['learning_rate']
+
+    # New data: a new study of the same config version, warm-started
+    training_pipeline = TrainingPipeline(config)
+    data_version = training_pipeline.get_data_version(x_train.iloc[1:], y_train.iloc[1:])
+    warm = training_pipeline.load_or_create_study(training_pipeline.get_config_version(x_train), data_version)
+    assert warm.study_name != study.study_name
+    best = sorted(
+        (trial for trial in resumed.trials if trial.state == optuna.trial.TrialState.COMPLETE), key=lambda trial: trial.value
+    )[:config['training']['optuna']['storage']['warm_start_trials']]
+    queued = [trial for trial in warm.trials if trial.state == optuna.trial.TrialState.WAITING]
+    assert [trial.system_attrs['fixed_params'] for trial in queued] == [trial.params for trial in best]
+
+    # Options that do not change the objective keep the study, the objective settings do not
+    version = training_pipeline.get_config_version(x_train)
+    config['training']['feature_pruning']['enabled'] = True
+    config['training']['incremental']['enabled'] = True
+    config['training']['window']['enabled'] = True
+    assert TrainingPipeline(config).get_config_version(x_train) == version
+    config['training']['iterations'] += 1
+    assert TrainingPipeline(config).get_config_version(x_train) != version
+
+
+def test_lag_search_selects_columns_of_the_superset(tmp_path, monkeypatch):
+    """
+    Test Case 2: With the lag search, the features hold every candidate lag once, each trial
+    ignores the lags it did not select, and the final model and the selected lag params
+    only use the lags of the best trial.
+    """
+    monkeypatch.chdir(project_root)
+    config = make_config(tmp_path, n_trials=4)
+    config['training']['optuna']['lag_search']['enabled'] = True
+    training_pipeline = TrainingPipeline(config)
+    x_train, x_test, y_train, y_test = load_dataset(config)
+    choices = training_pipeline.get_lag_choices()
+    assert set(choices.values()) <= set(x_train.columns)
+
+    # A trial keeping only the first candidate ignores the other candidate columns
+    first = next(iter(choices))
+    fixed = {'learning_rate': 0.1, 'depth': 4, 'l2_leaf_reg': 1.0, **{name: name == first for name in choices}}
+    params = training_pipeline.suggest_params(optuna.trial.FixedTrial(fixed))
+    assert params['ignored_features'] == [column for name, column in choices.items() if name != first]
+
+    model, study = training_pipeline.tune_hyperparams(x_train, y_train, x_test, y_test)
+    assert any(not study.trials[i].params[name] for i in range(len(study.trials)) for name in choices)
+    unselected = {column for name, column in choices.items() if not study.best_params[name]}
+    assert list(model.feature_names_) == [column for column in x_train.columns if column not in unselected]
+
+    selected = training_pipeline.selected_lag_params
+    lag_columns = {column for column in x_train.columns if '_lag_' in column} - unselected
+    assert {FeatureEngineeringPipeline.lag_column(feat, lag) for feat, lags in selected.items() for lag in lags} == lag_columns
+
+
+def test_pruned_model_and_lag_params_agree(tmp_path, monkeypatch):
+    """
+    Test Case 3: The pruned model is returned with the lag params of exactly the lag
+    columns it uses, so feature engineering generates every serving feature.
+    """
+    monkeypatch.chdir(project_root)
+    config = make_config(tmp_path, n_trials=2)
+    config['training']['feature_pruning'].update({'keep_fractions': [1.0, 0.3], 'max_rmse_increase': 10.0})
+    df = load_features(config)
+    training_pipeline = TrainingPipeline(config)
+    model = training_pipeline.run(df)
+    lag_params = training_pipeline.selected_lag_params
+
+    # Latency grows with the features, so the smallest candidate is the fastest
+    pruning_pipeline = FeaturePruningPipeline(config)
+    monkeypatch.setattr(pruning_pipeline, 'measure_latency', lambda model, batch, lags: float(len(model.feature_names_)))
+    pruned, pruned_lag_params, report = pruning_pipeline.run(model, df, lag_params)
+
+    assert report['selected_n_features'] == len(pruned.feature_names_) < len(model.feature_names_)
+    lag_columns = {
+        FeatureEngineeringPipeline.lag_column(feat, lag) for feat, lags in pruned_lag_params.items() for lag in lags
+    }
+    all_lag_columns = {
+        FeatureEngineeringPipeline.lag_column(feat, lag) for feat, lags in lag_params.items() for lag in lags
+    }
+    assert lag_columns == set(pruned.feature_names_) & all_lag_columns
+
+    serving = FeatureEngineeringPipeline(config).run(df.drop(columns=list(all_lag_columns)), lag_params=pruned_lag_params)
+    assert set(pruned.feature_names_) <= set(serving.columns)
+
+
+def test_parallel_trials_share_the_cpu_budget(tmp_path, monkeypatch):
+    """
+    Test Case 4: Trials run in worker processes split the CPU budget between them, and
+    evaluate the same validation split as a sequential trial with the same parameters.
+    """
+    monkeypatch.chdir(project_root)
+    config = make_config(tmp_path, n_trials=4)
+    config['training']['optuna']['parallel'] = {'n_workers': 2, 'cpu_budget': 2}
+    training_pipeline = TrainingPipeline(config)
+    x_train, x_test, y_train, y_test = load_dataset(config)
+
+    model, study = training_pipeline.tune_hyperparams(x_train, y_train, x_test, y_test)
+    assert training_pipeline.trial_thread_count() == 1
+    assert [trial.state for trial in study.trials] == [optuna.trial.TrialState.COMPLETE] * 4
+    assert model.get_params()['thread_count'] == 2
+
+    x_tr, x_val, y_tr, y_val, w_tr, _ = training_pipeline.split_validation(x_train, y_train, [(len(x_train), len(x_test))])
+    trial = study.best_trial
+    params = training_pipeline.suggest_params(optuna.trial.FixedTrial(trial.params))
+    assert params['thread_count'] == 1
+    rmse, best_iteration = fit_and_evaluate(
+        params, build_pool(x_tr, y_tr, weight=w_tr), build_pool(x_val, y_val), config['training']['early_stopping_rounds']
+    )
+    assert rmse == pytest.approx(trial.value) and best_iteration == trial.user_attrs['best_iteration']
+
+
+def test_unpromising_trials_are_pruned_early(tmp_path, monkeypatch):
+    """
+    Test Case 5: With a pruner, trials whose intermediate validation loss is worse than
+    the completed trials stop after a few boosting iterations, and the final model uses
+    the best completed trial.
+    """
+    monkeypatch.chdir(project_root)
+    config = make_config(tmp_path, n_trials=8)
+    config['training']['optuna']['pruner'].update(
+        {'type': 'median', 'n_startup_trials': 1, 'n_warmup_steps': 0, 'report_every': 1}
+    )
+    training_pipeline = TrainingPipeline(config)
+    x_train, x_test, y_train, y_test = load_dataset(config)
+
+    model, study = training_pipeline.tune_hyperparams(x_train, y_train, x_test, y_test)
+    pruned = [trial for trial in study.trials if trial.state == optuna.trial.TrialState.PRUNED]
+    assert pruned
+    assert any(max(trial.intermediate_values) < config['training']['iterations'] for trial in pruned)
+    assert training_pipeline.get_remaining_trials(study) == 0
+    assert study.best_trial.state == optuna.trial.TrialState.COMPLETE
+    assert model.tree_count_ == study.best_trial.user_attrs['best_iteration']
+
+
+def test_quantized_pools_are_reused(tmp_path, monkeypatch):
+    """
+    Test Case 6: The quantized training pools are saved once and loaded by later runs on
+    the same data instead of being quantized again, with the same tuned model.
+    """
+    monkeypatch.chdir(project_root)
+    config = make_config(tmp_path, n_trials=2)
+    config['training']['pool'].update({'quantize': True, 'save_quantized': True})
+    x_train, x_test, y_train, y_test = load_dataset(config)
+
+    model, _ = TrainingPipeline(config).tune_hyperparams(x_train, y_train, x_test, y_test)
+    saved = sorted(path.name.split('-')[0] for path in (tmp_path / 'pools').iterdir())
+    assert saved == ['train', 'train_test']
+
+    def fail_to_quantize(*args, **kwargs):
+        raise AssertionError("A saved pool was quantized again")
+
+    monkeypatch.setattr(Pool, 'quantize', fail_to_quantize)
+    reused, _ = TrainingPipeline(config).tune_hyperparams(x_train, y_train, x_test, y_test)
+    assert (reused.predict(x_test) == model.predict(x_test)).all()
+
+
+def test_training_window_reads_only_recent_rows(tmp_path, monkeypatch):
+    """
+    Test Case 7: The training window keeps the rows of the last 'max_span', with the
+    same features as on the full history, and recency weights halve every half-life.
+    """
+    monkeypatch.chdir(project_root)
+    config = prepare_data_root(make_config(tmp_path), str(tmp_path / 'data'))
+    data_manager = DataManager(config)
+    data_manager.prepare_prod_database()
+    runner = PipelineRunner(config=config, data_manager=data_manager)
+    expected = runner.get_training_features()
+
+    config['training']['window'].update(
+        {'enabled': True, 'max_rows': 5000, 'max_span': '30D', 'recency_half_life_rows': 24}
+    )
+    runner = PipelineRunner(config=config, data_manager=data_manager)
+    n_loaded, n_window = runner.get_training_window()
+    assert n_window == 30 * 24 + 1 and n_loaded == n_window + runner.get_max_lag()
+    df = runner.get_training_features()
+    assert len(df) == n_window
+    assert df.equals(expected.iloc[-n_window:].reset_index(drop=True))
+
+    weights = runner.training_pipeline.get_sample_weights(n_window)
+    assert weights[-1] == 1.0 and np.isclose(weights[-25], 0.5) and np.isclose(weights[-49], 0.25)
@@ -0,0 +1,49 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.append(str(project_root))
+sys.path.append(str(project_root / 'app-ml' / 'src'))
+
+from common.utils import read_config
+from common.data_manager import DataManager
+from pipelines.preprocessing import PreprocessingPipeline
+from pipelines.feature_engineering import FeatureEngineeringPipeline
+from pipelines.transform_plan import TransformPlan
+
+WINDOW_PARAMS = {
+    'bike_count': {'windows': [24, 168], 'stats': ['mean', 'std', 'min', 'max'], 'ewm_spans': [24]},
+    'temperature': {'windows': [24], 'stats': ['mean']},
+    'humidity': {'windows': [24], 'stats': ['mean']},
+}
+
+
+def test_plan_matches_pipelines(monkeypatch):
+    """
+    Test Case 1: The fused plan produces the same feature matrix as preprocessing
+    plus feature engineering, in a shuffled model feature order, for full batches
+    and for batches shorter than the largest lag, and reuses its buffers. The window
+    features are copied from the given online values.
+    """
+    monkeypatch.chdir(project_root)
+    config = read_config(project_root / 'config' / 'config.yaml')
+    config['feature_engineering']['window_params'] = WINDOW_PARAMS
+    raw = DataManager(config).load_data(
+        str(Path(config['data_manager']['raw_data_folder']) / config['data_manager']['raw_database_name'])
+    )
+
+    for n_rows in (30, 10):
+        batch = raw.iloc[-n_rows:]
+        expected = FeatureEngineeringPipeline(config).run(PreprocessingPipeline(config).run(batch.copy()))
+        feature_names = list(np.random.default_rng(0).permutation(expected.columns))
+        plan = TransformPlan(config, feature_names)
+
+        window_values = expected[FeatureEngineeringPipeline.window_columns(
+            config['feature_engineering'].get('window_params')
+        )].to_numpy()
+
+        matrix = plan.transform(batch, window_values=window_values)
+        np.testing.assert_array_equal(matrix, expected[feature_names].to_numpy(dtype=np.float64))
+        assert plan.transform(batch, window_values=window_values) is matrix
@@ -0,0 +1,59 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.append(str(project_root))
+sys.path.append(str(project_root / 'app-ml' / 'src'))
+
+from common.utils import read_config
+from common.data_manager import DataManager
+from common.load_testing import prepare_data_root
+from pipelines.pipeline_runner import PipelineRunner
+
+WINDOW_PARAMS = {
+    'bike_count': {'windows': [24, 168], 'stats': ['mean', 'std', 'min', 'max'], 'ewm_spans': [24]},
+    'temperature': {'windows': [24], 'stats': ['mean']},
+    'humidity': {'windows': [24], 'stats': ['mean']},
+}
+
+
+def test_scenarios_match_the_pipelines_on_changed_rows(tmp_path, monkeypatch):
+    """
+    Test Case 1: The baseline is the production prediction, and each scenario is scored
+    as if the latest row had its conditions: same features (including the recomputed
+    window features) and same prediction as the pipelines on the changed row.
+    """
+    monkeypatch.chdir(project_root)
+    config = read_config(project_root / 'config' / 'config.yaml')
+    config['feature_engineering']['window_params'] = WINDOW_PARAMS
+    config = prepare_data_root(config, str(tmp_path))
+    data_manager = DataManager(config)
+    data_manager.prepare_prod_database()
+    runner = PipelineRunner(config=config, data_manager=data_manager)
+
+    scenarios = [{'weathersit': 3, 'temperature': 0.2}, {'working_day': 0, 'humidity': 0.95}, {}]
+    result = runner.run_what_if(scenarios)
+
+    raw = data_manager.get_n_last_points(data=runner.current_database_data, n=config['pipeline_runner']['batch_size'])
+    assert result['baseline'] == pytest.approx(runner.inference_pipeline.run_raw(raw.copy()))
+    assert result['scenarios'][2]['change'] == 0.0
+
+    history = runner.preprocessing_pipeline.run(df=raw.copy())
+    model = runner.inference_pipeline.get_model()
+    for scenario, scored in zip(scenarios[:2], result['scenarios']):
+        changed = history.copy()
+        for column, value in scenario.items():
+            changed.loc[changed.index[-1], config['preprocessing']['column_mapping'].get(column, column)] = value
+        expected = runner.feature_eng_pipeline.run(df=changed, lag_params=runner.inference_pipeline.lag_params)
+
+        overrides = runner.what_if_pipeline.get_overrides([scenario])
+        features = runner.feature_eng_pipeline.run(df=history.copy(), lag_params=runner.inference_pipeline.lag_params)
+        built = runner.what_if_pipeline.build_features(features, history, overrides)
+        assert np.allclose(built.iloc[-1].to_numpy(), expected.iloc[-1][built.columns].to_numpy(dtype=np.float64))
+        assert scored['prediction'] == pytest.approx(model.predict(expected[model.feature_names_].iloc[-1:])[0])
+
+    with pytest.raises(ValueError):
+        runner.run_what_if([{'bike_count': 0}])